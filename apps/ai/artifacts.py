@@ -0,0 +1,258 @@
+# apps/ai/artifacts.py
+"""
+Formatos del archivo del modelo de ventas y su manifiesto.
+
+- ``pickle``: ``joblib.dump`` del ``RandomForestRegressor`` (el formato
+  anterior).
+- ``compressed``: lo mismo con zlib: el archivo más chico, pero cada worker
+  descomprime y guarda su propia copia.
+- ``mmap``: el bosque pasado a arreglos planos (``CompactForest``) en un dump
+  sin comprimir que se abre con ``mmap_mode='r'``: los workers comparten las
+  páginas del archivo en lugar de copiarlas. (Un ``RandomForestRegressor``
+  cargado con mmap no sirve: sklearn copia los nodos a memoria propia al
+  deserializar cada árbol.)
+
+``CompactForest`` admite podar los árboles a ``max_depth``, quedarse con
+los primeros ``n_trees`` y guardar umbrales y hojas en float32
+(``quantize``); las hojas también pueden redondearse (``leaf_decimals``).
+
+``model_manifest.json`` lista formato, opciones y el sha256 de cada archivo;
+el registro lo valida antes de cargar. No usa Django (``model_training.py``
+también corre como script).
+"""
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+
+import joblib
+import numpy as np
+
+FORMATS = ('pickle', 'compressed', 'mmap')
+MANIFEST_NAME = 'model_manifest.json'
+MODEL_NAME = 'sales_model.joblib'
+COLUMNS_NAME = 'model_columns.joblib'
+COMPRESSION = ('zlib', 3)
+
+
+class ArtifactError(Exception):
+    pass
+
+
+class CompactForest:
+    """
+    Bosque de regresión en arreglos planos (todos los árboles seguidos).
+    Los hijos son índices globales; -1 marca una hoja. ``tree_predict``
+    recorre todos los árboles y filas a la vez, un nivel por iteración, y
+    deja de mover los recorridos que ya llegaron a su hoja.
+    """
+
+    def __init__(self, roots, left, right, feature, threshold, value, max_depth):
+        self.roots = roots
+        self.left = left
+        self.right = right
+        self.feature = feature
+        self.threshold = threshold
+        self.value = value
+        self.max_depth = max_depth
+
+    @classmethod
+    def from_sklearn(cls, model):
+        trees = [estimator.tree_ for estimator in model.estimators_]
+        sizes = np.array([tree.node_count for tree in trees])
+        offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+
+        def children(name):
+            parts = [np.where(getattr(tree, name) >= 0, getattr(tree, name) + offset, -1)
+                     for tree, offset in zip(trees, offsets)]
+            return np.concatenate(parts).astype(np.int32)
+
+        left = children('children_left')
+        feature = np.concatenate([tree.feature for tree in trees])
+        return cls(
+            roots=offsets.astype(np.int32),
+            left=left,
+            right=children('children_right'),
+            feature=np.where(left >= 0, feature, 0).astype(np.int32),
+            threshold=np.concatenate([tree.threshold for tree in trees]),
+            value=np.concatenate([tree.value[:, 0, 0] for tree in trees]),
+            max_depth=max(estimator.get_depth() for estimator in model.estimators_),
+        )
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def n_nodes(self):
+        return len(self.left)
+
+    def depths(self):
+        depth = np.full(self.n_nodes, -1, dtype=np.int32)
+        frontier = np.asarray(self.roots)
+        level = 0
+        while frontier.size:
+            depth[frontier] = level
+            kids = np.concatenate([self.left[frontier], self.right[frontier]])
+            frontier = kids[kids >= 0]
+            level += 1
+        return depth
+
+    def compact(self, max_depth=None, n_trees=None, quantize=False, leaf_decimals=None):
+        """
+        Copia podada: los nodos a profundidad ``max_depth`` pasan a ser hojas
+        (con el promedio que sklearn ya guarda en cada nodo) y se descartan
+        los que quedan colgando.
+        """
+        n_trees = min(n_trees or self.n_trees, self.n_trees)
+        max_depth = self.max_depth if max_depth is None else min(max_depth, self.max_depth)
+        end = self.roots[n_trees] if n_trees < self.n_trees else self.n_nodes
+
+        depth = self.depths()[:end]
+        keep = (depth >= 0) & (depth <= max_depth)
+        index = np.cumsum(keep) - 1
+        cut = depth[keep] == max_depth
+
+        def remap(children):
+            children = children[:end][keep]
+            return np.where((children >= 0) & ~cut, index[np.maximum(children, 0)], -1).astype(np.int32)
+
+        left = remap(self.left)
+        value = self.value[:end][keep]
+        if leaf_decimals is not None:
+            value = np.round(value, leaf_decimals)
+        float_type = np.float32 if quantize else np.float64
+        return CompactForest(
+            roots=index[self.roots[:n_trees]].astype(np.int32),
+            left=left,
+            right=remap(self.right),
+            feature=np.where(left >= 0, self.feature[:end][keep], 0).astype(np.int32),
+            threshold=self.threshold[:end][keep].astype(float_type),
+            value=value.astype(float_type),
+            max_depth=int(max_depth),
+        )
+
+    def tree_predict(self, X):
+        """ (árboles x filas) con la predicción de cada árbol. """
+        # sklearn compara en float32: mismo redondeo para el mismo recorrido
+        X = np.asarray(X, dtype=np.float32)
+        rows, width = X.shape
+        flat_x = X.ravel()
+        # Arreglos base (sin la subclase memmap) para indexar rápido
+        left, right = np.asarray(self.left), np.asarray(self.right)
+        feature, threshold = np.asarray(self.feature), np.asarray(self.threshold)
+
+        # Una posición por (árbol, fila); solo se avanzan las que no llegaron a una hoja
+        nodes = np.repeat(np.asarray(self.roots, dtype=np.int64), rows)
+        offsets = np.tile(np.arange(rows, dtype=np.int64) * width, self.n_trees)
+        active = np.flatnonzero(left[nodes] >= 0)
+        while active.size:
+            current = nodes[active]
+            go_right = flat_x[offsets[active] + feature[current]] > threshold[current]
+            following = np.where(go_right, right[current], left[current])
+            nodes[active] = following
+            active = active[left[following] >= 0]
+        return np.asarray(self.value)[nodes].astype(np.float64).reshape(self.n_trees, rows)
+
+    def predict(self, X):
+        return self.tree_predict(X).mean(axis=0)
+
+
+def tree_predictions(model, X):
+    """ (árboles x filas) para un ``CompactForest`` o un bosque de sklearn. """
+    if isinstance(model, CompactForest):
+        return model.tree_predict(X)
+    return np.stack([tree.predict(X) for tree in model.estimators_])
+
+
+def tree_count(model):
+    return model.n_trees if isinstance(model, CompactForest) else len(model.estimators_)
+
+
+# --- Escritura y lectura ---
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _replace(path, write):
+    """ Escribe en un temporal y reemplaza: quien lea nunca ve un archivo a medias
+    (y los workers con el archivo anterior en mmap siguen leyendo el viejo). """
+    tmp = f'{path}.tmp'
+    write(tmp)
+    os.replace(tmp, path)
+
+
+def save(model, columns, directory, fmt='mmap', max_depth=None, n_trees=None, quantize=False, leaf_decimals=None):
+    """ Escribe modelo, columnas y manifiesto (al final). Devuelve el manifiesto. """
+    if fmt not in FORMATS:
+        raise ArtifactError(f"Formato desconocido: {fmt} (opciones: {', '.join(FORMATS)})")
+    options = {'max_depth': max_depth, 'n_trees': n_trees, 'quantize': quantize, 'leaf_decimals': leaf_decimals}
+    if fmt == 'mmap' or any(value not in (None, False) for value in options.values()):
+        if CompactForest.__module__ != 'apps.ai.artifacts':
+            # Importado como "artifacts" (script): el pickle no cargaría en Django
+            raise ArtifactError(f"CompactForest importado como {CompactForest.__module__}; "
+                                "usa 'manage.py train_model' o importa apps.ai.artifacts")
+        if not isinstance(model, CompactForest):
+            model = CompactForest.from_sklearn(model)
+        model = model.compact(**options)
+
+    model_path = os.path.join(directory, MODEL_NAME)
+    columns_path = os.path.join(directory, COLUMNS_NAME)
+    compress = COMPRESSION if fmt == 'compressed' else 0
+    _replace(model_path, lambda path: joblib.dump(model, path, compress=compress))
+    _replace(columns_path, lambda path: joblib.dump(list(columns), path))
+
+    files = {name: file_sha256(os.path.join(directory, name)) for name in (MODEL_NAME, COLUMNS_NAME)}
+    manifest = {
+        'format': fmt,
+        'version': files[MODEL_NAME][:12],
+        'model_file': MODEL_NAME,
+        'columns_file': COLUMNS_NAME,
+        'files': files,
+        'trees': tree_count(model),
+        'options': options,
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+    }
+    _replace(os.path.join(directory, MANIFEST_NAME), lambda path: _write_json(path, manifest))
+    return manifest
+
+
+def _write_json(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+
+
+def read_manifest(directory):
+    """ Manifiesto del directorio, o None si el modelo es anterior a los manifiestos. """
+    try:
+        with open(os.path.join(directory, MANIFEST_NAME), encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def verify(manifest, directory):
+    for name, expected in manifest['files'].items():
+        path = os.path.join(directory, name)
+        if not os.path.exists(path):
+            raise ArtifactError(f"Falta {name} (listado en el manifiesto)")
+        if file_sha256(path) != expected:
+            raise ArtifactError(f"Checksum distinto para {name}: el archivo no coincide con el manifiesto")
+
+
+def load(directory, verify_checksums=True):
+    """ (modelo, columnas, manifiesto) según el manifiesto del directorio. """
+    manifest = read_manifest(directory)
+    if manifest is None:
+        raise ArtifactError(f"No hay {MANIFEST_NAME} en {directory}")
+    if verify_checksums:
+        verify(manifest, directory)
+    mmap_mode = 'r' if manifest['format'] == 'mmap' else None
+    model = joblib.load(os.path.join(directory, manifest['model_file']), mmap_mode=mmap_mode)
+    columns = list(joblib.load(os.path.join(directory, manifest['columns_file'])))
+    return model, columns, manifest
@@ -99,11 +99,17 @@ def create_historical_sales(count=SALE_COUNT):
 
                 # C. Crear la Venta (Sale)
                 # (Usamos un UUID falso para el ID de Stripe)
+                # item_count y line_summary se calculan igual que en el webhook
+                item_count, line_summary = Sale.summarize_lines(
+                    (item['product'].name, item['quantity']) for item in cart
+                )
                 sale = Sale.objects.create(
                     user=random_user,
                     total_amount=total_amount,
                     status=Sale.SaleStatus.COMPLETED,
-                    stripe_payment_intent_id=f"fake_sale_{uuid.uuid4()}"
+                    stripe_payment_intent_id=f"fake_sale_{uuid.uuid4()}",
+                    item_count=item_count,
+                    line_summary=line_summary,
                 )
                 
                 # --- ¡Truco para fechas! ---
@@ -111,17 +117,19 @@ def create_historical_sales(count=SALE_COUNT):
                 sale.created_at = sale_date
                 sale.save(update_fields=['created_at'])
 
-                # D. Crear los Detalles y Garantías
-                for item in cart:
-                    product = item['product']
-                    
-                    SaleDetail.objects.create(
+                # D. Crear los Detalles (un solo INSERT) y las Garantías
+                SaleDetail.objects.bulk_create([
+                    SaleDetail(
                         sale=sale,
-                        product=product,
+                        product=item['product'],
                         quantity=item['quantity'],
                         price_at_purchase=item['price']
                     )
-                    
+                    for item in cart
+                ])
+                for item in cart:
+                    product = item['product']
+
                     # Activar la garantía (si el producto tiene una)
                     if product.warranty:
                         aw = ActivatedWarranty.objects.create(
@@ -0,0 +1,205 @@
+# apps/ai/features.py
+"""
+Features mensuales para el modelo de ventas, compartidas por el generador
+del dataset de entrenamiento y por la predicción en vivo.
+
+La agregación se hace en la base (TruncMonth / TruncDay con Sum / Count):
+a pandas solo llegan unas filas por mes, por día y por (mes, categoría), así
+que la memoria no depende del número de ventas.
+
+Cada fila corresponde a un mes ``t`` y usa solo datos de meses anteriores
+(lags y ventanas móviles terminan en ``t - 1``); el target es la venta de
+``t``. La predicción arma la fila del mes siguiente al último con ventas
+con la misma función.
+"""
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+from dateutil.easter import easter
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Sum
+from django.db.models.functions import TruncDay, TruncMonth
+
+from apps.sales.models import Sale, SaleDetail
+
+TARGET = 'target_next_month_sales'
+LAGS = (1, 2, 3, 6, 12)
+WINDOWS = (3, 6)
+TOP_CATEGORIES = 5
+
+# Feriados nacionales de Bolivia de fecha fija (mes, día)
+FIXED_HOLIDAYS = ((1, 1), (1, 22), (5, 1), (6, 21), (8, 6), (11, 2), (12, 25))
+
+
+def holidays(year):
+    """ Feriados del año: fijos + móviles (Carnaval, Viernes Santo, Corpus Christi). """
+    easter_day = easter(year)
+    movable = [
+        easter_day - timedelta(days=48),  # lunes de Carnaval
+        easter_day - timedelta(days=47),  # martes de Carnaval
+        easter_day - timedelta(days=2),   # Viernes Santo
+        easter_day + timedelta(days=60),  # Corpus Christi
+    ]
+    return {date(year, month, day) for month, day in FIXED_HOLIDAYS} | set(movable)
+
+
+def completed_sales():
+    return Sale.objects.filter(status=Sale.SaleStatus.COMPLETED)
+
+
+def monthly_totals(sales=None):
+    """ [mes, total_sales, orders, items] agregados en la base. """
+    details = SaleDetail.objects.filter(sale__status=Sale.SaleStatus.COMPLETED) if sales is None \
+        else SaleDetail.objects.filter(sale__in=sales)
+    sales = completed_sales() if sales is None else sales
+    rows = (
+        sales.annotate(month=TruncMonth('created_at')).values('month')
+        .annotate(total_sales=Sum('total_amount'), orders=Count('id'))
+        .order_by('month')
+    )
+    frame = pd.DataFrame.from_records(rows, columns=['month', 'total_sales', 'orders'])
+    # Unidades desde los detalles (en otra consulta: el JOIN repetiría cada
+    # venta en Sum/Count), sin depender del item_count desnormalizado
+    items = dict(
+        details.annotate(month=TruncMonth('sale__created_at')).values('month')
+        .annotate(items=Sum('quantity')).values_list('month', 'items').order_by()
+    )
+    frame['items'] = frame['month'].map(items).fillna(0) if not frame.empty else []
+    return _monthly_index(frame)
+
+
+def daily_stats(sales=None):
+    """ Por mes: días con ventas, máximo y desviación de la venta diaria (de los totales por día). """
+    sales = completed_sales() if sales is None else sales
+    rows = (
+        sales.annotate(day=TruncDay('created_at')).values('day')
+        .annotate(total=Sum('total_amount')).order_by('day').values_list('day', 'total')
+    )
+    frame = pd.DataFrame.from_records(rows, columns=['day', 'total'])
+    if frame.empty:
+        return pd.DataFrame(columns=['active_days', 'daily_max', 'daily_std'])
+    frame['total'] = frame['total'].astype(float)
+    frame['month'] = _month_start(frame['day'])
+    stats = frame.groupby('month')['total'].agg(active_days='count', daily_max='max', daily_std='std')
+    return stats.fillna({'daily_std': 0.0})
+
+
+def category_mix(top=TOP_CATEGORIES):
+    """
+    Participación mensual de las ``top`` categorías con más ingresos (y el
+    resto en ``cat_share_other``), agregada en la base por (mes, categoría).
+    """
+    revenue = ExpressionWrapper(F('quantity') * F('price_at_purchase'), output_field=DecimalField())
+    rows = (
+        SaleDetail.objects.filter(sale__status=Sale.SaleStatus.COMPLETED)
+        .annotate(month=TruncMonth('sale__created_at')).values('month', 'product__category_id')
+        .annotate(revenue=Sum(revenue)).values_list('month', 'product__category_id', 'revenue').order_by()
+    )
+    frame = pd.DataFrame.from_records(rows, columns=['month', 'category', 'revenue'])
+    if frame.empty:
+        return pd.DataFrame()
+    frame['revenue'] = frame['revenue'].astype(float)
+    frame['month'] = _month_start(frame['month'])
+    leaders = frame.groupby('category')['revenue'].sum().nlargest(top).index
+    frame['column'] = np.where(
+        frame['category'].isin(leaders), 'cat_share_' + frame['category'].astype('Int64').astype(str), 'cat_share_other',
+    )
+    pivot = frame.pivot_table(index='month', columns='column', values='revenue', aggfunc='sum', fill_value=0.0)
+    return pivot.div(pivot.sum(axis=1), axis=0)
+
+
+def _month_start(values):
+    return pd.to_datetime(values, utc=True).dt.tz_localize(None).dt.to_period('M').dt.to_timestamp()
+
+
+def _monthly_index(frame):
+    if frame.empty:
+        return frame.set_index('month')
+    frame['month'] = _month_start(frame['month'])
+    frame[['total_sales', 'orders', 'items']] = frame[['total_sales', 'orders', 'items']].astype(float)
+    frame = frame.set_index('month')
+    # Meses sin ventas en medio de la serie cuentan como 0
+    full = pd.date_range(frame.index.min(), frame.index.max(), freq='MS')
+    return frame.reindex(full, fill_value=0.0)
+
+
+def calendar_features(months):
+    """ Año, mes, trimestre, días hábiles (lun-vie sin feriados) y feriados de cada mes. """
+    records = []
+    for month in months:
+        first = month.date()
+        days = pd.date_range(first, periods=month.days_in_month, freq='D').date
+        year_holidays = holidays(first.year)
+        holiday_count = sum(day in year_holidays for day in days)
+        business = sum(day.weekday() < 5 and day not in year_holidays for day in days)
+        records.append({
+            'year': first.year,
+            'month': first.month,
+            'quarter': (first.month - 1) // 3 + 1,
+            'days_in_month': month.days_in_month,
+            'business_days': business,
+            'holidays': holiday_count,
+        })
+    return pd.DataFrame.from_records(records, index=months)
+
+
+def _history_features(history):
+    """
+    Features de cada mes calculadas con los meses anteriores: ``history`` es
+    la serie mensual (incluye el mes a predecir con NaN al final si aplica).
+    """
+    shifted = history.shift(1)
+    features = pd.DataFrame(index=history.index)
+    for lag in LAGS:
+        features[f'sales_lag_{lag}'] = history['total_sales'].shift(lag)
+    for window in WINDOWS:
+        features[f'sales_mean_{window}'] = shifted['total_sales'].rolling(window).mean()
+        features[f'sales_std_{window}'] = shifted['total_sales'].rolling(window).std()
+    features['orders_lag_1'] = shifted['orders']
+    features['avg_ticket_lag_1'] = shifted['total_sales'] / shifted['orders'].replace(0, np.nan)
+    features['items_per_order_lag_1'] = shifted['items'] / shifted['orders'].replace(0, np.nan)
+    features['sales_growth_1'] = shifted['total_sales'].pct_change(fill_method=None)
+    for column in ('active_days', 'daily_max', 'daily_std'):
+        if column in shifted:
+            features[f'{column}_lag_1'] = shifted[column]
+    for column in [c for c in shifted.columns if c.startswith('cat_share_')]:
+        features[f'{column}_lag_1'] = shifted[column]
+    return features.join(calendar_features(history.index))
+
+
+def monthly_history():
+    """ Serie mensual agregada (ventas, órdenes, items, stats diarias y mix de categorías). """
+    history = monthly_totals()
+    if history.empty:
+        return history
+    history = history.join(daily_stats()).join(category_mix())
+    return history.fillna(0.0)
+
+
+def build_training_frame(history=None):
+    """
+    Dataset de entrenamiento: una fila por mes con todos sus lags
+    disponibles, ``total_sales`` (no es feature) y el target.
+    """
+    history = monthly_history() if history is None else history
+    if history.empty:
+        return pd.DataFrame()
+    frame = _history_features(history)
+    frame[TARGET] = history['total_sales']
+    frame.insert(0, 'total_sales', history['total_sales'])
+    frame.insert(0, 'date', history.index)
+    # Sin lags largos (primeros 12 meses) no hay fila: se exigen los lags básicos
+    frame = frame.dropna(subset=['sales_lag_1', 'sales_lag_2', 'sales_lag_3'])
+    return frame.reset_index(drop=True).fillna(0.0)
+
+
+def next_month_features(columns, history=None):
+    """
+    (features, mes) del mes siguiente al último con ventas, con las
+    ``columns`` del modelo en su orden (las que no existan van en 0).
+    """
+    history = monthly_history() if history is None else history
+    next_month = history.index.max() + pd.offsets.MonthBegin(1)
+    extended = history.reindex(history.index.append(pd.DatetimeIndex([next_month])))
+    row = _history_features(extended).iloc[[-1]].fillna(0.0)
+    return row.reindex(columns=columns, fill_value=0.0).reset_index(drop=True), next_month
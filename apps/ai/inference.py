@@ -0,0 +1,115 @@
+# apps/ai/inference.py
+"""
+Predicción por lotes de escenarios "qué pasaría si" sobre el modelo del
+registro.
+
+Cada escenario parte de los features en vivo del próximo mes y cambia
+algunas columnas: ``features`` fija valores y ``adjust`` aplica variaciones
+relativas (0.10 = +10%). Todos los escenarios forman una sola matriz y cada
+árbol del bosque la predice de una vez; la predicción puntual es el promedio
+de los árboles (lo mismo que ``RandomForestRegressor.predict``) y los
+intervalos son cuantiles entre árboles.
+
+Los lotes grandes se parten en bloques de ``CHUNK_ROWS`` filas que se
+reparten en un pool de ``MAX_WORKERS`` hilos compartido por el proceso.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+from .artifacts import tree_count, tree_predictions
+from .limits import DEFAULT_QUANTILES, MAX_SCENARIOS
+from .model_registry import get_model
+
+CHUNK_ROWS = 256
+MAX_WORKERS = 4
+
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='ai-inference')
+
+
+class ScenarioError(ValueError):
+    pass
+
+
+@dataclass
+class ScenarioBatch:
+    period: object
+    base: dict
+    names: list
+    matrix: np.ndarray
+
+
+def build_matrix(columns, base_row, scenarios):
+    """ Matriz (escenarios x columnas): la fila base con los cambios de cada escenario. """
+    index = {column: i for i, column in enumerate(columns)}
+    unknown = {
+        column for scenario in scenarios
+        for column in [*scenario.get('features', {}), *scenario.get('adjust', {})]
+        if column not in index
+    }
+    if unknown:
+        raise ScenarioError(f"Columnas desconocidas para el modelo: {', '.join(sorted(unknown))}")
+
+    matrix = np.tile(np.asarray(base_row, dtype=float), (len(scenarios), 1))
+    for row, scenario in enumerate(scenarios):
+        for column, value in scenario.get('features', {}).items():
+            matrix[row, index[column]] = value
+        for column, change in scenario.get('adjust', {}).items():
+            matrix[row, index[column]] *= 1 + change
+    return matrix
+
+
+def forest_predict(model, matrix):
+    """ Predicciones por árbol de ``matrix``, en bloques repartidos en el pool si es grande. """
+    if len(matrix) <= CHUNK_ROWS:
+        return tree_predictions(model, matrix)
+    chunks = [matrix[start:start + CHUNK_ROWS] for start in range(0, len(matrix), CHUNK_ROWS)]
+    return np.concatenate(list(_executor.map(lambda chunk: tree_predictions(model, chunk), chunks)), axis=1)
+
+
+def prepare(scenarios, bundle=None):
+    from .features import next_month_features  # pandas: solo al predecir
+
+    bundle = bundle or get_model()
+    if not scenarios:
+        raise ScenarioError("Se necesita al menos un escenario.")
+    if len(scenarios) > MAX_SCENARIOS:
+        raise ScenarioError(f"Máximo {MAX_SCENARIOS} escenarios por lote.")
+    base, period = next_month_features(bundle.columns)
+    base_row = base.iloc[0].to_numpy(dtype=float)
+    return ScenarioBatch(
+        period=period,
+        base=dict(zip(bundle.columns, base_row.tolist())),
+        names=[scenario.get('name') or f'escenario_{i + 1}' for i, scenario in enumerate(scenarios)],
+        matrix=build_matrix(bundle.columns, base_row, scenarios),
+    )
+
+
+def predict_scenarios(scenarios, quantiles=DEFAULT_QUANTILES):
+    """
+    ``scenarios``: [{'name', 'features': {col: valor}, 'adjust': {col: variación}}].
+    Devuelve el mes, la versión del modelo, los features base y por escenario
+    la predicción y sus cuantiles.
+    """
+    bundle = get_model()
+    batch = prepare(scenarios, bundle)
+    trees = forest_predict(bundle.model, batch.matrix)
+    point = trees.mean(axis=0)
+    bands = np.quantile(trees, quantiles, axis=0) if len(quantiles) else np.empty((0, len(point)))
+
+    labels = [f'p{round(q * 100):02d}' for q in quantiles]
+    return {
+        'prediction_period': batch.period.strftime('%Y-%m'),
+        'model_version': bundle.version,
+        'trees': tree_count(bundle.model),
+        'base_features': batch.base,
+        'results': [
+            {
+                'name': name,
+                'predicted_sales_bob': round(float(point[i]), 2),
+                'quantiles': {label: round(float(bands[j, i]), 2) for j, label in enumerate(labels)},
+            }
+            for i, name in enumerate(batch.names)
+        ],
+    }
@@ -0,0 +1,7 @@
+# apps/ai/limits.py
+"""
+Límites de la predicción de escenarios. Módulo liviano: el serializer los
+usa al cargar las URLs sin importar ``inference`` (numpy, joblib, modelo).
+"""
+MAX_SCENARIOS = 5_000
+DEFAULT_QUANTILES = (0.1, 0.9)
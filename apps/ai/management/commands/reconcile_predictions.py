@@ -0,0 +1,43 @@
+# apps/ai/management/commands/reconcile_predictions.py
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.ai.models import ModelMetrics
+from apps.ai.monitoring import current_version, reconcile
+
+
+class Command(BaseCommand):
+    help = (
+        "Cruza las predicciones servidas de los meses ya cerrados con la venta "
+        "real y actualiza el MAE/MAPE de cada versión del modelo (cron "
+        "mensual o diario). Si el error de la versión en uso supera el umbral "
+        "de settings.AI_MONITORING, reentrena el modelo."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--today', help="Fecha de referencia (YYYY-MM-DD); por defecto hoy.")
+        parser.add_argument('--no-retrain', action='store_true', help="Solo concilia, sin reentrenar.")
+
+    def handle(self, *args, **options):
+        today = None
+        if options['today']:
+            try:
+                today = date.fromisoformat(options['today'])
+            except ValueError:
+                raise CommandError("--today debe tener formato YYYY-MM-DD.")
+
+        report = reconcile(today=today, retrain=False if options['no_retrain'] else None)
+        self.stdout.write(f"{report.outcomes} meses conciliados ({report.versions} versiones).")
+
+        metrics = ModelMetrics.objects.filter(model_version=current_version()).first()
+        if metrics and metrics.months:
+            mape = f"{metrics.rolling_mape:.1%}" if metrics.rolling_mape is not None else "-"
+            self.stdout.write(
+                f"Modelo {metrics.model_version}: MAE {metrics.mae:.2f}, "
+                f"MAE móvil {metrics.rolling_mae:.2f}, MAPE móvil {mape} ({metrics.months} meses)."
+            )
+        if report.retraining:
+            self.stdout.write(self.style.WARNING("Error sobre el umbral: reentrenando el modelo..."))
+            report.retraining.join()
+            self.stdout.write(self.style.SUCCESS(f"Modelo en uso: {current_version()}."))
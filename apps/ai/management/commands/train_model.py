@@ -0,0 +1,21 @@
+# apps/ai/management/commands/train_model.py
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.ai.model_training import add_arguments, train_from_options
+
+
+class Command(BaseCommand):
+    help = (
+        "Entrena el modelo de ventas con el dataset de apps/ai/dataset_generator.py y "
+        "lo guarda en apps/ai/data con su manifiesto (--format mmap por defecto). "
+        "Los workers lo recargan solos al ver el archivo nuevo."
+    )
+
+    def add_arguments(self, parser):
+        add_arguments(parser)
+
+    def handle(self, *args, **options):
+        result = train_from_options(options)
+        if result is None:
+            raise CommandError("No se entrenó el modelo (falta el dataset de entrenamiento).")
+        self.stdout.write(self.style.SUCCESS(f"R^2 {result['r2']:.2f}, RMSE {result['rmse']:.2f}."))
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.8 on 2026-10-19 07:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ModelMetrics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_version', models.CharField(max_length=64, unique=True)),
+                ('months', models.PositiveIntegerField(default=0)),
+                ('mae', models.FloatField(default=0)),
+                ('mape', models.FloatField(null=True)),
+                ('mape_months', models.PositiveIntegerField(default=0)),
+                ('rolling_mae', models.FloatField(null=True)),
+                ('rolling_mape', models.FloatField(null=True)),
+                ('last_period', models.DateField(null=True)),
+                ('train_r2', models.FloatField(null=True)),
+                ('train_rmse', models.FloatField(null=True)),
+                ('retrain_requested_at', models.DateTimeField(null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PredictionOutcome',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.DateField()),
+                ('model_version', models.CharField(max_length=64)),
+                ('predictions', models.PositiveIntegerField(default=0)),
+                ('predicted', models.FloatField()),
+                ('actual', models.FloatField()),
+                ('abs_error', models.FloatField()),
+                ('pct_error', models.FloatField(null=True)),
+                ('reconciled_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('period', 'model_version'), name='predictionoutcome_period_version_uniq')],
+            },
+        ),
+        migrations.CreateModel(
+            name='PredictionRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.DateField()),
+                ('model_version', models.CharField(max_length=64)),
+                ('predicted', models.FloatField()),
+                ('served_at', models.DateTimeField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['period', 'model_version'], name='predictionrecord_period_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,121 @@
+# apps/ai/model_registry.py
+"""
+Registro del modelo de ventas: carga ``sales_model.joblib`` y sus columnas
+una sola vez por proceso y las comparte entre la predicción en vivo, los
+escenarios y el monitoreo.
+
+``get_model()`` devuelve el ``ModelBundle`` en memoria; si el archivo del
+modelo cambió en disco (reentrenamiento) lo vuelve a cargar. La versión es
+el sha256 (abreviado) del archivo del modelo.
+
+Con ``model_manifest.json`` (``apps/ai/artifacts.py``) se valida el checksum
+de cada archivo y el modelo se abre según su formato (``mmap`` lo comparten
+los workers); sin manifiesto se carga el joblib como antes.
+"""
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+
+import joblib
+from django.utils import timezone
+
+from . import artifacts
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+MODEL_PATH = os.path.join(DATA_DIR, artifacts.MODEL_NAME)
+COLUMNS_PATH = os.path.join(DATA_DIR, artifacts.COLUMNS_NAME)
+MANIFEST_PATH = os.path.join(DATA_DIR, artifacts.MANIFEST_NAME)
+
+_lock = threading.Lock()
+_bundle = None
+
+
+@dataclass(frozen=True)
+class ModelBundle:
+    model: object
+    columns: list
+    version: str
+    mtime: float
+    format: str = 'pickle'
+    loaded_at: object = field(default_factory=timezone.now)
+
+
+def file_version(path):
+    return artifacts.file_sha256(path)[:12]
+
+
+def _watched_path():
+    """ El manifiesto se escribe al final: cambia recién cuando el modelo nuevo está completo. """
+    return MANIFEST_PATH if os.path.exists(MANIFEST_PATH) else MODEL_PATH
+
+
+def artifact_version():
+    """ Versión del modelo en disco (sin cargarlo), o None si no hay modelo. """
+    manifest = artifacts.read_manifest(DATA_DIR)
+    if manifest is not None:
+        return manifest['version']
+    try:
+        return file_version(MODEL_PATH)
+    except FileNotFoundError:
+        return None
+
+
+def _train():
+    """ Sin archivos del modelo: genera el dataset y entrena (como hacía prediction_service). """
+    from .dataset_generator import create_training_dataset
+    from .model_training import train_model
+
+    logger.warning("Archivos del modelo no encontrados. Entrenando modelo...")
+    create_training_dataset()
+    train_model()
+
+
+def _load():
+    if not (os.path.exists(MODEL_PATH) and os.path.exists(COLUMNS_PATH)):
+        _train()
+    mtime = os.path.getmtime(_watched_path())
+    if os.path.exists(MANIFEST_PATH):
+        # ArtifactError si algún checksum no coincide: no se sirve un modelo corrupto
+        model, columns, manifest = artifacts.load(DATA_DIR)
+        bundle = ModelBundle(model=model, columns=columns, version=manifest['version'],
+                             mtime=mtime, format=manifest['format'])
+    else:
+        bundle = ModelBundle(
+            model=joblib.load(MODEL_PATH),
+            columns=list(joblib.load(COLUMNS_PATH)),
+            version=file_version(MODEL_PATH),
+            mtime=mtime,
+        )
+    logger.info("Servicio de predicción: modelo %s (%s) cargado (%d columnas).",
+                bundle.version, bundle.format, len(bundle.columns))
+    return bundle
+
+
+def _stale(bundle):
+    try:
+        return os.path.getmtime(_watched_path()) != bundle.mtime
+    except FileNotFoundError:
+        return False  # se sigue sirviendo el cargado
+
+
+def get_model():
+    """ ``ModelBundle`` en memoria (se carga en el primer uso o si el archivo cambió). """
+    global _bundle
+    bundle = _bundle
+    if bundle is not None and not _stale(bundle):
+        return bundle
+    with _lock:
+        if _bundle is None or _stale(_bundle):
+            _bundle = _load()
+        return _bundle
+
+
+def reload():
+    """ Fuerza la recarga desde disco (p. ej. después de reentrenar en este proceso). """
+    global _bundle
+    with _lock:
+        _bundle = _load()
+        return _bundle
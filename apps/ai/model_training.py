@@ -1,21 +1,43 @@
 # apps/ai/model_training.py
-import pandas as pd
-import joblib
+import argparse
 import os
+
+if __name__ == '__main__':
+    # Ejecución directa como script: raíz del proyecto en sys.path y Django
+    # configurado, para importar siempre ``apps.ai.artifacts`` (el bosque se
+    # guarda como apps.ai.artifacts.CompactForest, que es lo que carga Django)
+    import sys
+    import django
+
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    django.setup()
+
 from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.metrics import r2_score, mean_squared_error
 
-def train_model():
+from apps.ai import artifacts
+from apps.ai.dataset_generator import load_training_dataset
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+# Formato del archivo del modelo (ver artifacts.py): 'mmap' lo comparten los workers
+DEFAULT_FORMAT = os.getenv('AI_MODEL_FORMAT', 'mmap')
+
+def train_model(fmt=DEFAULT_FORMAT, max_depth=None, n_trees=None, quantize=False, leaf_decimals=None):
+    """
+    Entrena y guarda el modelo en ``fmt`` (``pickle``, ``compressed`` o
+    ``mmap``); ``max_depth``/``n_trees``/``quantize``/``leaf_decimals`` podan
+    o reducen el bosque guardado. Devuelve R^2 y RMSE sobre el modelo guardado.
+    """
     print("Iniciando entrenamiento del modelo...")
     
-    # 1. Cargar Dataset
-    dataset_path = os.path.join(os.path.dirname(__file__), 'data/training_dataset.csv')
+    # 1. Cargar Dataset (Parquet de dataset_generator, o el CSV anterior)
     try:
-        df = pd.read_csv(dataset_path)
+        df = load_training_dataset()
     except FileNotFoundError:
-        print(f"Error: No se encontró 'training_dataset.csv'.")
-        print("Por favor, ejecuta 'dataset_generator.py' primero.")
+        print(f"Error: No se encontró el dataset de entrenamiento.")
+        print("Por favor, ejecuta 'python apps/ai/dataset_generator.py' primero.")
         return
 
     # 2. Definir Features (X) y Target (y)
@@ -37,8 +59,14 @@ def train_model():
     model = RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=-1)
     model.fit(X_train, y_train)
 
-    # 5. Evaluar el Modelo
-    y_pred = model.predict(X_test)
+    # 5. Serializar (Guardar) el Modelo y las Columnas, con su manifiesto
+    manifest = artifacts.save(model, features, DATA_DIR, fmt=fmt, max_depth=max_depth, n_trees=n_trees,
+                              quantize=quantize, leaf_decimals=leaf_decimals) # ¡Guardamos el orden de las columnas!
+    print(f"¡Modelo {manifest['version']} ({fmt}) guardado en {DATA_DIR}!")
+
+    # 6. Evaluar el Modelo (el guardado: con poda o cuantización puede diferir del entrenado)
+    saved, _, _ = artifacts.load(DATA_DIR)
+    y_pred = saved.predict(X_test)
     r2 = r2_score(y_test, y_pred)
     mse = mean_squared_error(y_test, y_pred)
     rmse = mse ** 0.5
@@ -46,16 +74,23 @@ def train_model():
     print(f"R^2 Score (Precisión): {r2:.2f}")
     print(f"RMSE (Error Promedio): {rmse:.2f} BOB")
     print(f"-----------------------------")
+    return {'r2': r2, 'rmse': rmse}
+
+def add_arguments(parser):
+    """ Opciones compartidas por el script y el comando ``train_model``. """
+    parser.add_argument('--format', default=DEFAULT_FORMAT, choices=artifacts.FORMATS)
+    parser.add_argument('--max-depth', type=int, help="Poda los árboles a esta profundidad.")
+    parser.add_argument('--trees', type=int, help="Guarda solo los primeros N árboles.")
+    parser.add_argument('--quantize', action='store_true', help="Umbrales y hojas en float32.")
+    parser.add_argument('--leaf-decimals', type=int, help="Redondea las hojas a N decimales.")
+
+
+def train_from_options(options):
+    return train_model(fmt=options['format'], max_depth=options['max_depth'], n_trees=options['trees'],
+                       quantize=options['quantize'], leaf_decimals=options['leaf_decimals'])
 
-    # 6. Serializar (Guardar) el Modelo y las Columnas
-    model_path = os.path.join(os.path.dirname(__file__), 'data/sales_model.joblib')
-    columns_path = os.path.join(os.path.dirname(__file__), 'data/model_columns.joblib')
-    
-    joblib.dump(model, model_path)
-    joblib.dump(features, columns_path) # ¡Guardamos el orden de las columnas!
-    
-    print(f"¡Modelo guardado en {model_path}!")
-    print(f"Columnas del modelo guardadas en {columns_path}!")
 
 if __name__ == '__main__':
-    train_model()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Entrena el modelo de ventas.")
+    add_arguments(parser)
+    train_from_options(vars(parser.parse_args()))
\ No newline at end of file
@@ -0,0 +1,66 @@
+from django.db import models
+
+
+# Modelo 1: Cada predicción servida por el endpoint del próximo mes
+class PredictionRecord(models.Model):
+    """
+    Se escribe en lotes desde memoria (``apps/ai/monitoring.py``), fuera de
+    la petición que sirvió la predicción.
+    """
+    period = models.DateField()  # primer día del mes predicho
+    model_version = models.CharField(max_length=64)
+    predicted = models.FloatField()
+    served_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['period', 'model_version'], name='predictionrecord_period_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.period:%Y-%m} ({self.model_version}): {self.predicted:.2f}"
+
+
+# Modelo 2: Predicción de un mes (por versión) contra la venta real
+class PredictionOutcome(models.Model):
+    period = models.DateField()
+    model_version = models.CharField(max_length=64)
+    predictions = models.PositiveIntegerField(default=0)
+    predicted = models.FloatField()  # promedio de las predicciones servidas
+    actual = models.FloatField()
+    abs_error = models.FloatField()
+    pct_error = models.FloatField(null=True)  # None si el mes no tuvo ventas
+    reconciled_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['period', 'model_version'], name='predictionoutcome_period_version_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.period:%Y-%m} ({self.model_version}): error {self.abs_error:.2f}"
+
+
+# Modelo 3: Error acumulado de una versión del modelo
+class ModelMetrics(models.Model):
+    """
+    ``mae``/``mape`` son el promedio de todos los meses conciliados y
+    ``rolling_*`` un promedio móvil exponencial que pesa más los últimos.
+    Se actualizan de forma incremental con cada mes nuevo.
+    """
+    model_version = models.CharField(max_length=64, unique=True)
+    months = models.PositiveIntegerField(default=0)
+    mae = models.FloatField(default=0)
+    mape = models.FloatField(null=True)
+    mape_months = models.PositiveIntegerField(default=0)
+    rolling_mae = models.FloatField(null=True)
+    rolling_mape = models.FloatField(null=True)
+    last_period = models.DateField(null=True)
+    # Métricas del entrenamiento (cuando lo lanzó el monitoreo)
+    train_r2 = models.FloatField(null=True)
+    train_rmse = models.FloatField(null=True)
+    retrain_requested_at = models.DateTimeField(null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Modelo {self.model_version}: MAE {self.mae:.2f} ({self.months} meses)"
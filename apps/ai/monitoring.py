@@ -0,0 +1,334 @@
+# apps/ai/monitoring.py
+"""
+Monitoreo del modelo de ventas.
+
+- ``recorder.record()`` guarda cada predicción servida en una cola en
+  memoria (sin tocar la base); un hilo la vuelca con ``bulk_create`` cada
+  ``FLUSH_SECONDS``. Si la cola se llena, las predicciones se descartan y se
+  cuentan en ``dropped``: la petición nunca espera a la base.
+- ``reconcile()`` (comando ``reconcile_predictions``, por cron) cruza las
+  predicciones de los meses ya cerrados con la venta real del mes (un
+  ``SUM`` agrupado por mes) y actualiza de forma incremental el MAE/MAPE de
+  cada versión del modelo, todo en una transacción y con las métricas
+  bloqueadas (las corridas solapadas se serializan).
+- Si el MAPE móvil de la versión en uso supera ``MAPE_THRESHOLD``, se
+  reentrena en un hilo aparte (dataset, entrenamiento y recarga del
+  registro).
+"""
+import atexit
+import logging
+import queue
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime, time
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Avg, Count, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from . import model_registry
+from .features import completed_sales
+from .models import ModelMetrics, PredictionOutcome, PredictionRecord
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'FLUSH_SECONDS': 5.0,
+    'MAX_PENDING': 10_000,
+    'BATCH_SIZE': 1_000,
+    # Peso del último mes en el MAE/MAPE móvil
+    'EWMA_ALPHA': 0.3,
+    'MAPE_THRESHOLD': 0.25,
+    'MIN_MONTHS': 2,
+    'AUTO_RETRAIN': True,
+}
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'AI_MONITORING', {})}
+
+
+# --- Registro de predicciones ---
+
+class PredictionRecorder:
+    """ Cola acotada en memoria + hilo que la escribe por lotes. """
+
+    def __init__(self):
+        config = get_config()
+        self.flush_seconds = config['FLUSH_SECONDS']
+        self.batch_size = config['BATCH_SIZE']
+        self._queue = queue.Queue(maxsize=config['MAX_PENDING'])
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.written = 0
+        self.dropped = 0
+
+    def record(self, period, model_version, predicted):
+        try:
+            self._queue.put_nowait((period, model_version, float(predicted), timezone.now()))
+        except queue.Full:
+            self.dropped += 1
+        if self._thread is None:
+            self._start()
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='prediction-recorder', daemon=True)
+                self._thread.start()
+                atexit.register(self.stop)
+
+    def _run(self):
+        while not self._stop.wait(self.flush_seconds):
+            self.flush()
+
+    def stop(self):
+        self._stop.set()
+        self.flush()
+
+    def _drain(self):
+        items = []
+        while True:
+            try:
+                items.append(self._queue.get_nowait())
+            except queue.Empty:
+                return items
+
+    def flush(self):
+        """ Escribe lo pendiente. Devuelve cuántas predicciones se guardaron. """
+        with self._flush_lock:
+            items = self._drain()
+            if not items:
+                return 0
+            try:
+                PredictionRecord.objects.bulk_create(
+                    [PredictionRecord(period=p, model_version=v, predicted=x, served_at=at) for p, v, x, at in items],
+                    batch_size=self.batch_size,
+                )
+            except Exception:
+                logger.exception("No se pudieron guardar %d predicciones", len(items))
+                self.dropped += len(items)
+                return 0
+            finally:
+                # Conexión propia de este hilo: no se deja abierta entre lotes
+                if threading.current_thread() is not threading.main_thread():
+                    connection.close()
+            self.written += len(items)
+            return len(items)
+
+    def stats(self):
+        return {'pending': self._queue.qsize(), 'written': self.written, 'dropped': self.dropped}
+
+
+recorder = PredictionRecorder()
+
+
+# --- Conciliación con las ventas reales ---
+
+@dataclass
+class ReconcileReport:
+    outcomes: int = 0
+    versions: int = 0
+    retraining: object = None  # hilo de reentrenamiento, si se lanzó
+
+
+def month_start(day):
+    return date(day.year, day.month, 1)
+
+
+def pending_periods(before):
+    """ [(mes, versión, cantidad, promedio)] de meses cerrados aún sin conciliar. """
+    done = set(PredictionOutcome.objects.values_list('period', 'model_version'))
+    rows = (
+        PredictionRecord.objects.filter(period__lt=before)
+        .values('period', 'model_version')
+        .annotate(n=Count('id'), predicted=Avg('predicted'))
+        .order_by('period', 'model_version')
+        .values_list('period', 'model_version', 'n', 'predicted')
+    )
+    return [row for row in rows if row[:2] not in done]
+
+
+def _aware(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def monthly_actuals(first, before):
+    """ {mes: venta total} de los meses en [first, before), agregado en la base. """
+    rows = (
+        completed_sales().filter(created_at__gte=_aware(first), created_at__lt=_aware(before))
+        .annotate(month=TruncMonth('created_at')).values('month')
+        .annotate(total=Sum('total_amount')).values_list('month', 'total')
+    )
+    return {month_start(month): float(total) for month, total in rows}
+
+
+def update_metrics(metrics, abs_error, pct_error, alpha):
+    """ Suma un mes a las métricas (promedio acumulado y móvil), sin releer los anteriores. """
+    metrics.months += 1
+    metrics.mae += (abs_error - metrics.mae) / metrics.months
+    metrics.rolling_mae = abs_error if metrics.rolling_mae is None else (
+        alpha * abs_error + (1 - alpha) * metrics.rolling_mae)
+    if pct_error is not None:
+        metrics.mape_months += 1
+        metrics.mape = pct_error if metrics.mape is None else (
+            metrics.mape + (pct_error - metrics.mape) / metrics.mape_months)
+        metrics.rolling_mape = pct_error if metrics.rolling_mape is None else (
+            alpha * pct_error + (1 - alpha) * metrics.rolling_mape)
+    return metrics
+
+
+METRIC_FIELDS = ['months', 'mae', 'mape', 'mape_months', 'rolling_mae', 'rolling_mape', 'last_period', 'updated_at']
+
+
+def _lock(versions, first, before):
+    """
+    Bloquea (``select_for_update``) las métricas de ``versions`` (se crean
+    las que falten) y las predicciones de [first, before). Dos corridas que
+    se solapan se serializan aquí.
+    """
+    ModelMetrics.objects.bulk_create([ModelMetrics(model_version=v) for v in versions], ignore_conflicts=True)
+    metrics = ModelMetrics.objects.select_for_update().filter(model_version__in=versions).order_by('model_version')
+    metrics = {m.model_version: m for m in metrics}
+    list(
+        PredictionRecord.objects.select_for_update()
+        .filter(period__gte=first, period__lt=before, model_version__in=versions)
+        .order_by('id').values_list('id', flat=True)
+    )
+    return metrics
+
+
+def reconcile(today=None, retrain=None):
+    """
+    Concilia los meses cerrados (anteriores al mes de ``today``) y, si
+    corresponde, lanza el reentrenamiento (``retrain``: None = según
+    ``AUTO_RETRAIN``).
+
+    Resultados y métricas se escriben en una sola transacción: un corte a
+    mitad de camino no deja meses marcados como conciliados sin sumar a las
+    métricas.
+    """
+    config = get_config()
+    before = month_start(today or timezone.localdate())
+    report = ReconcileReport()
+    with transaction.atomic():
+        pending = pending_periods(before)
+        if pending:
+            versions = sorted({version for _, version, _, _ in pending})
+            metrics = _lock(versions, pending[0][0], before)
+            # Con los bloqueos tomados se vuelve a leer: si otra corrida concilió
+            # algún mes mientras esperábamos, ya no está pendiente
+            pending = [row for row in pending_periods(before) if row[1] in metrics]
+        if pending:
+            actuals = monthly_actuals(pending[0][0], before)
+            outcomes = []
+            for period, version, count, predicted in pending:
+                actual = actuals.get(period, 0.0)
+                abs_error = abs(predicted - actual)
+                pct_error = abs_error / actual if actual else None
+                outcomes.append(PredictionOutcome(
+                    period=period, model_version=version, predictions=count,
+                    predicted=predicted, actual=actual, abs_error=abs_error, pct_error=pct_error,
+                ))
+                update_metrics(metrics[version], abs_error, pct_error, config['EWMA_ALPHA'])
+                metrics[version].last_period = period
+
+            # Sin ignore_conflicts: todo lo pendiente se inserta; un conflicto
+            # revierte la transacción entera (métricas incluidas)
+            PredictionOutcome.objects.bulk_create(outcomes)
+            for version in {outcome.model_version for outcome in outcomes}:
+                metrics[version].save(update_fields=METRIC_FIELDS)
+            report.outcomes = len(outcomes)
+            report.versions = len({outcome.model_version for outcome in outcomes})
+
+    if config['AUTO_RETRAIN'] if retrain is None else retrain:
+        report.retraining = check_drift()
+    return report
+
+
+# --- Reentrenamiento ---
+
+_retrain_lock = threading.Lock()
+_retrain_thread = None
+
+
+def current_version():
+    return model_registry.artifact_version()
+
+
+def drifted(metrics, config=None):
+    config = config or get_config()
+    return (
+        metrics.months >= config['MIN_MONTHS']
+        and metrics.rolling_mape is not None
+        and metrics.rolling_mape > config['MAPE_THRESHOLD']
+    )
+
+
+def check_drift():
+    """
+    Lanza el reentrenamiento si la versión en uso superó el umbral (una vez
+    por versión; si falló, se reintenta en la siguiente llamada).
+    """
+    metrics = ModelMetrics.objects.filter(model_version=current_version()).first()
+    if metrics is None or metrics.retrain_requested_at or not drifted(metrics):
+        return None
+    logger.warning("Modelo %s: MAPE móvil %.1f%% > umbral, reentrenando",
+                   metrics.model_version, metrics.rolling_mape * 100)
+    return retrain_in_background(metrics.model_version)
+
+
+def retrain_in_background(version):
+    """ Reentrena en un hilo (uno a la vez). Devuelve el hilo o None si ya hay uno corriendo. """
+    global _retrain_thread
+    with _retrain_lock:
+        if _retrain_thread is not None and _retrain_thread.is_alive():
+            return None
+        ModelMetrics.objects.filter(model_version=version).update(retrain_requested_at=timezone.now())
+        _retrain_thread = threading.Thread(target=_retrain, args=(version,), name='model-retrain', daemon=True)
+        _retrain_thread.start()
+        return _retrain_thread
+
+
+def retraining():
+    return _retrain_thread is not None and _retrain_thread.is_alive()
+
+
+def _retrain(version):
+    """
+    Dataset, entrenamiento y recarga. Si algo falla se borra la marca
+    ``retrain_requested_at`` de ``version``: el próximo ``check_drift()``
+    vuelve a intentarlo.
+    """
+    from .dataset_generator import create_training_dataset
+    from .model_training import train_model
+
+    try:
+        if create_training_dataset() is None:
+            logger.warning("Reentrenamiento cancelado: no hay datos suficientes para el dataset.")
+            _clear_retrain_request(version)
+            return
+        result = train_model()
+        if result is None:
+            logger.warning("Reentrenamiento cancelado: no se pudo entrenar el modelo.")
+            _clear_retrain_request(version)
+            return
+        bundle = model_registry.reload()
+        ModelMetrics.objects.update_or_create(
+            model_version=bundle.version,
+            defaults={'train_r2': result.get('r2'), 'train_rmse': result.get('rmse')},
+        )
+        logger.info("Reentrenamiento terminado: modelo %s", bundle.version)
+    except Exception:
+        logger.exception("Falló el reentrenamiento del modelo")
+        _clear_retrain_request(version)
+    finally:
+        connection.close()
+
+
+def _clear_retrain_request(version):
+    ModelMetrics.objects.filter(model_version=version).update(retrain_requested_at=None)
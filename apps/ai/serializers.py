@@ -0,0 +1,20 @@
+# apps/ai/serializers.py
+from rest_framework import serializers
+
+from .limits import DEFAULT_QUANTILES, MAX_SCENARIOS
+
+
+class ScenarioSerializer(serializers.Serializer):
+    name = serializers.CharField(max_length=100, required=False, allow_blank=True)
+    # Valores absolutos por columna del modelo (ej. {"sales_lag_1": 1200000})
+    features = serializers.DictField(child=serializers.FloatField(), required=False, default=dict)
+    # Variaciones relativas (ej. {"sales_lag_1": 0.10} = +10%)
+    adjust = serializers.DictField(child=serializers.FloatField(min_value=-1), required=False, default=dict)
+
+
+class ScenarioBatchSerializer(serializers.Serializer):
+    scenarios = serializers.ListField(child=ScenarioSerializer(), min_length=1, max_length=MAX_SCENARIOS)
+    quantiles = serializers.ListField(
+        child=serializers.FloatField(min_value=0, max_value=1), required=False,
+        default=list(DEFAULT_QUANTILES), max_length=9,
+    )
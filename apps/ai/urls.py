@@ -8,8 +8,23 @@ urlpatterns = [
          views.HistoricalSalesView.as_view(), 
          name='historical-sales'),
          
+    # Retención mensual por cohortes de primera compra
+    path('dashboard/cohorts/',
+         views.CohortRetentionView.as_view(),
+         name='cohort-retention'),
+
     # Endpoint para la predicción del próximo mes
     path('dashboard/future-prediction/', 
          views.PredictionSalesView.as_view(), 
          name='future-prediction'),
+
+    # Predicción por lotes de escenarios (what-if)
+    path('dashboard/scenarios/',
+         views.ScenarioPredictionView.as_view(),
+         name='scenario-prediction'),
+
+    # Precisión del modelo (predicciones vs. ventas reales)
+    path('dashboard/model-metrics/',
+         views.ModelMetricsView.as_view(),
+         name='model-metrics'),
 ]
\ No newline at end of file
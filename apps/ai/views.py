@@ -4,10 +4,20 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAdminUser # Solo admins pueden ver el dashboard
 from django.db.models.functions import TruncMonth
 from django.db.models import Sum
-from .prediction_service import predict_next_month_sales
+from .serializers import ScenarioBatchSerializer
+from .models import ModelMetrics, PredictionOutcome
 from apps.sales.models import Sale
+from core.db_router import ReplicaReadMixin
+from core.lazy import lazy_module
 
-class HistoricalSalesView(APIView):
+# pandas, numpy, joblib y el modelo se cargan con la primera petición (o en
+# el warm-up del master), no al importar las URLs
+prediction_service = lazy_module('apps.ai.prediction_service')
+inference = lazy_module('apps.ai.inference')
+monitoring = lazy_module('apps.ai.monitoring')
+cohorts = lazy_module('apps.analytics.cohorts')
+
+class HistoricalSalesView(ReplicaReadMixin, APIView):
     """
     Endpoint para el dashboard de ventas históricas.
     Agrupa las ventas por mes.
@@ -33,7 +43,27 @@ class HistoricalSalesView(APIView):
         
         return Response(formatted_data)
 
-class PredictionSalesView(APIView):
+class CohortRetentionView(ReplicaReadMixin, APIView):
+    """
+    Endpoint para el dashboard de retención por cohortes.
+    Por cada mes de primera compra: clientes de la cohorte y qué fracción
+    vuelve a comprar 0, 1, 2... meses después. ``?months=12`` limita a las
+    cohortes más recientes.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        months = request.query_params.get('months', '12')
+        if not months.isdigit() or not 1 <= int(months) <= 120:
+            return Response({"error": "months debe estar entre 1 y 120."}, status=400)
+
+        matrix = cohorts.cohort_matrix()
+        return Response({
+            "last_sale_id": matrix.last_sale_id,
+            "cohorts": matrix.as_rows(last=int(months)),
+        })
+
+class PredictionSalesView(ReplicaReadMixin, APIView):
     """
     Endpoint que llama al servicio de IA para obtener
     la predicción del próximo mes.
@@ -42,9 +72,66 @@ class PredictionSalesView(APIView):
 
     def get(self, request, *args, **kwargs):
         # Llama a la función que carga el modelo y predice
-        prediction = predict_next_month_sales()
+        prediction = prediction_service.predict_next_month_sales()
         
         if "error" in prediction:
             return Response(prediction, status=500)
             
-        return Response(prediction)
\ No newline at end of file
+        return Response(prediction)
+
+class ScenarioPredictionView(APIView):
+    """
+    Predicción por lotes de escenarios "qué pasaría si" para el próximo mes.
+    Cada escenario parte de los features en vivo y cambia columnas con
+    ``features`` (valores) o ``adjust`` (variación relativa). Devuelve la
+    predicción y los cuantiles entre los árboles del bosque.
+    """
+    permission_classes = [IsAdminUser]
+
+    def post(self, request, *args, **kwargs):
+        serializer = ScenarioBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            result = inference.predict_scenarios(**serializer.validated_data)
+        except inference.ScenarioError as e:
+            return Response({"error": str(e)}, status=400)
+        return Response(result)
+
+
+class ModelMetricsView(APIView):
+    """
+    Precisión del modelo de ventas: MAE/MAPE por versión (acumulado y
+    móvil), los últimos meses conciliados y el estado del registro de
+    predicciones de este proceso.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        config = monitoring.get_config()
+        versions = [
+            {
+                'model_version': m.model_version,
+                'months': m.months,
+                'mae': m.mae,
+                'mape': m.mape,
+                'rolling_mae': m.rolling_mae,
+                'rolling_mape': m.rolling_mape,
+                'drifted': monitoring.drifted(m, config),
+                'last_period': m.last_period,
+                'train_r2': m.train_r2,
+                'train_rmse': m.train_rmse,
+                'retrain_requested_at': m.retrain_requested_at,
+            }
+            for m in ModelMetrics.objects.order_by('-updated_at')[:10]
+        ]
+        outcomes = PredictionOutcome.objects.order_by('-period', 'model_version').values(
+            'period', 'model_version', 'predictions', 'predicted', 'actual', 'abs_error', 'pct_error',
+        )[:12]
+        return Response({
+            'current_version': monitoring.current_version(),
+            'mape_threshold': config['MAPE_THRESHOLD'],
+            'retraining': monitoring.retraining(),
+            'recorder': monitoring.recorder.stats(),
+            'versions': versions,
+            'outcomes': list(outcomes),
+        })
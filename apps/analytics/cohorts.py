@@ -0,0 +1,139 @@
+# apps/analytics/cohorts.py
+"""
+Retención mensual por cohortes (mes de la primera compra frente a los meses
+en que el cliente vuelve a comprar).
+
+Las ventas completadas se leen en una sola consulta por cursor como
+(user_id, mes) —el mes lo calcula la base como ``año * 12 + mes - 1``— a
+arrays compactos (int32 / int16). La matriz sale de operaciones vectorizadas
+(``np.unique`` + ``np.bincount``), sin una consulta por cohorte.
+
+El resultado se guarda en memoria del proceso asociado al id de la última
+venta: mientras no entren ventas nuevas, la siguiente llamada
+solo hace esa consulta.
+"""
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+from django.db.models import Max
+from django.db.models.functions import ExtractMonth, ExtractYear
+
+from apps.sales.models import Sale
+
+FETCH_CHUNK = 50_000
+
+_lock = threading.Lock()
+_cache = {}
+
+
+@dataclass(frozen=True)
+class CohortMatrix:
+    first_month: int        # índice absoluto (año * 12 + mes - 1) de la primera cohorte
+    sizes: np.ndarray       # clientes por cohorte
+    active: np.ndarray      # [cohorte, meses desde la primera compra] -> clientes activos
+    last_sale_id: int
+
+    @property
+    def retention(self):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(self.sizes[:, None] > 0, self.active / self.sizes[:, None], 0.0)
+
+    def month_label(self, index):
+        year, month = divmod(self.first_month + index, 12)
+        return f"{year:04d}-{month + 1:02d}"
+
+    def as_rows(self, last=None):
+        """ [{cohort, size, active, retention}] de las ``last`` cohortes más recientes. """
+        retention = self.retention
+        total = len(self.sizes)
+        rows = []
+        for index in range(max(0, total - last) if last else 0, total):
+            # Una cohorte solo puede tener meses hasta el último con datos
+            width = total - index
+            rows.append({
+                'cohort': self.month_label(index),
+                'size': int(self.sizes[index]),
+                'active': self.active[index, :width].tolist(),
+                'retention': np.round(retention[index, :width], 4).tolist(),
+            })
+        return rows
+
+
+def completed_sales():
+    return Sale.objects.filter(status=Sale.SaleStatus.COMPLETED, user__isnull=False)
+
+
+def load_arrays(queryset=None):
+    """ (user_ids int32, meses int16) de las ventas completadas, leídas por cursor. """
+    queryset = completed_sales() if queryset is None else queryset
+    rows = (
+        queryset.annotate(month_index=ExtractYear('created_at') * 12 + ExtractMonth('created_at') - 1)
+        .values_list('user_id', 'month_index').order_by()
+        .iterator(chunk_size=FETCH_CHUNK)
+    )
+    users, months = [], []
+    while True:
+        chunk = np.fromiter(
+            (value for row in _take(rows, FETCH_CHUNK) for value in row), dtype=np.int64,
+        )
+        if not chunk.size:
+            break
+        users.append(chunk[0::2].astype(np.int32))
+        months.append(chunk[1::2].astype(np.int16))
+    if not users:
+        return np.empty(0, np.int32), np.empty(0, np.int16)
+    return np.concatenate(users), np.concatenate(months)
+
+
+def _take(iterator, n):
+    for _, row in zip(range(n), iterator):
+        yield row
+
+
+def compute(users, months, last_sale_id=0):
+    """ Matriz de cohortes a partir de los arrays de ``load_arrays``. """
+    if not users.size:
+        return CohortMatrix(0, np.zeros(0, np.int64), np.zeros((0, 0), np.int64), last_sale_id)
+    first_month = int(months.min())
+    month = (months - first_month).astype(np.int32)
+    n_months = int(month.max()) + 1
+
+    # Cliente denso 0..k y mes de su primera compra
+    _, customer = np.unique(users, return_inverse=True)
+    first = np.full(customer.max() + 1, n_months, dtype=np.int32)
+    np.minimum.at(first, customer, month)
+
+    # Un cliente cuenta una vez por mes aunque compre varias veces
+    active_pairs = np.unique(customer.astype(np.int64) * n_months + month)
+    pair_customer, pair_month = np.divmod(active_pairs, n_months)
+    cohort = first[pair_customer]
+    offset = pair_month - cohort
+
+    active = np.bincount(cohort * n_months + offset, minlength=n_months * n_months).reshape(n_months, n_months)
+    return CohortMatrix(first_month, active[:, 0].copy(), active, last_sale_id)
+
+
+def last_sale_id():
+    # Sin filtros, MAX(id) se resuelve con la clave primaria (por estado habría que recorrer un índice)
+    return Sale.objects.aggregate(last=Max('id'))['last'] or 0
+
+
+def cohort_matrix():
+    """ Matriz de cohortes, recalculada solo si entraron ventas nuevas. """
+    last_id = last_sale_id()
+    cached = _cache.get('matrix')
+    if cached is not None and cached.last_sale_id == last_id:
+        return cached
+    with _lock:
+        cached = _cache.get('matrix')
+        if cached is not None and cached.last_sale_id == last_id:
+            return cached
+        users, months = load_arrays(completed_sales().filter(id__lte=last_id))
+        matrix = compute(users, months, last_id)
+        _cache['matrix'] = matrix
+        return matrix
+
+
+def clear_cache():
+    _cache.clear()
@@ -0,0 +1,42 @@
+# apps/analytics/management/commands/mine_recommendations.py
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.analytics.recommendations import MIN_SUPPORT, SALE_CHUNK, TOP_K, mine
+
+
+class Command(BaseCommand):
+    help = (
+        "Mina 'comprados juntos' de las ventas completadas nuevas (desde la "
+        "última versión), publica una versión del modelo y la deja lista para "
+        "products/<id>/related/. --rebuild recalcula desde la primera venta."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rebuild', action='store_true', help="Ignora la matriz guardada.")
+        parser.add_argument('--top-k', type=int, default=TOP_K, help="Relacionados por producto.")
+        parser.add_argument('--min-support', type=int, default=MIN_SUPPORT,
+                            help="Canastas en común mínimas para recomendar un par.")
+        parser.add_argument('--sale-chunk', type=int, default=SALE_CHUNK, help="Ids de venta por bloque.")
+
+    def handle(self, *args, **options):
+        if not 1 <= options['top_k'] <= 100:
+            raise CommandError("--top-k debe estar entre 1 y 100.")
+        if options['min_support'] < 1:
+            raise CommandError("--min-support debe ser mayor que 0.")
+
+        def progress(result):
+            self.stdout.write(f"  {result.new_baskets} canastas, {result.new_lines} líneas procesadas")
+
+        result = mine(
+            rebuild=options['rebuild'], sale_chunk=options['sale_chunk'], k=options['top_k'],
+            min_support=options['min_support'], on_chunk=progress if options['verbosity'] > 1 else None,
+        )
+        if result.model is None:
+            self.stdout.write("Sin ventas nuevas desde la última versión; no se publicó nada.")
+            return
+        model = result.model
+        self.stdout.write(self.style.SUCCESS(
+            f"Versión {model.pk} publicada: {result.new_baskets} canastas nuevas "
+            f"({model.baskets} en total), {model.products} productos, {model.pairs} relacionados "
+            f"en {result.seconds:.2f}s."
+        ))
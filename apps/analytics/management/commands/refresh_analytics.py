@@ -0,0 +1,38 @@
+# apps/analytics/management/commands/refresh_analytics.py
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.analytics.rollups import CHUNK_SIZE, rebuild, refresh
+
+
+class Command(BaseCommand):
+    help = (
+        "Aplica las ventas nuevas (desde la última marca) a los agregados de "
+        "analítica y recalcula los segmentos RFM. Pensado para cron cada "
+        "pocos minutos; --rebuild recalcula todo desde cero."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help="Ids de venta por bloque.")
+        parser.add_argument('--rebuild', action='store_true', help="Borra los agregados y los recalcula.")
+        parser.add_argument('--score', action='store_true',
+                            help="Recalcula RFM aunque no haya ventas nuevas (la recencia cambia con los días).")
+
+    def handle(self, *args, **options):
+        if not 1 <= options['chunk_size'] <= 1_000_000:
+            raise CommandError("--chunk-size debe estar entre 1 y 1000000.")
+
+        def progress(result):
+            self.stdout.write(f"  bloque {result.chunks}: hasta la venta {result.last_sale_id} ({result.sales} ventas)")
+
+        started = time.perf_counter()
+        on_chunk = progress if options['verbosity'] > 1 else None
+        if options['rebuild']:
+            result = rebuild(options['chunk_size'], on_chunk=on_chunk)
+        else:
+            result = refresh(options['chunk_size'], on_chunk=on_chunk, score='always' if options['score'] else True)
+        self.stdout.write(self.style.SUCCESS(
+            f"{result.sales} ventas aplicadas en {result.chunks} bloques (marca: venta {result.last_sale_id}), "
+            f"{result.customers_scored} clientes puntuados en {time.perf_counter() - started:.2f}s."
+        ))
@@ -0,0 +1,75 @@
+# Generated by Django 5.2.8 on 2026-10-19 07:25
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('products', '0001_initial'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('last_sale_id', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='BasketSizeDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('items', models.PositiveSmallIntegerField()),
+                ('orders', models.PositiveIntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('day', 'items'), name='basketsizedaily_day_items_uniq')],
+            },
+        ),
+        migrations.CreateModel(
+            name='CustomerStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='purchase_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('first_purchase_at', models.DateTimeField()),
+                ('last_purchase_at', models.DateTimeField()),
+                ('orders', models.PositiveIntegerField(default=0)),
+                ('items', models.PositiveIntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('ltv', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('recency', models.PositiveSmallIntegerField(default=0)),
+                ('frequency', models.PositiveSmallIntegerField(default=0)),
+                ('monetary', models.PositiveSmallIntegerField(default=0)),
+                ('segment', models.CharField(blank=True, default='', max_length=20)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['segment'], name='customerstats_segment_idx'), models.Index(fields=['-ltv', 'user'], name='customerstats_ltv_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ProductDailySales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('category_id', models.BigIntegerField(null=True)),
+                ('brand_id', models.BigIntegerField(null=True)),
+                ('units', models.PositiveIntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('orders', models.PositiveIntegerField(default=0)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales', to='products.product')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('day', 'product'), name='productdailysales_day_product_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.8 on 2026-10-19 07:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecommendationModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('published_at', models.DateTimeField(blank=True, null=True)),
+                ('last_sale_id', models.BigIntegerField(default=0)),
+                ('baskets', models.PositiveBigIntegerField(default=0)),
+                ('line_items', models.PositiveBigIntegerField(default=0)),
+                ('products', models.PositiveIntegerField(default=0)),
+                ('pairs', models.PositiveBigIntegerField(default=0)),
+                ('matrix', models.BinaryField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-published_at'], name='recmodel_published_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ProductRecommendation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('product_id', models.BigIntegerField()),
+                ('related_ids', models.JSONField()),
+                ('scores', models.JSONField()),
+                ('model', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recommendations', to='analytics.recommendationmodel')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('model', 'product_id'), name='productrec_model_product_uniq')],
+            },
+        ),
+    ]
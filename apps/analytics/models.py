@@ -0,0 +1,132 @@
+from django.conf import settings
+from django.db import models
+
+from apps.products.models import Product
+
+
+# Modelo 1: Ventas por producto y día (solo ventas completadas)
+class ProductDailySales(models.Model):
+    """
+    Agregado diario por producto. Categoría y marca se copian al
+    agregar (las del producto en ese momento) para que los rankings por
+    categoría o marca no necesiten JOIN.
+    """
+    day = models.DateField()
+    product = models.ForeignKey(Product, related_name='daily_sales', on_delete=models.CASCADE)
+    category_id = models.BigIntegerField(null=True)
+    brand_id = models.BigIntegerField(null=True)
+    units = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    orders = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'product'], name='productdailysales_day_product_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} - producto {self.product_id}: {self.units} u."
+
+
+# Modelo 2: Acumulado de compras por cliente (RFM / LTV)
+class CustomerStats(models.Model):
+    """
+    Totales de por vida de un cliente. ``recency``/``frequency``/``monetary``
+    son puntajes 1-5 (quintiles entre todos los clientes) y ``segment`` su
+    segmento RFM; se recalculan al final de cada ``refresh_analytics``.
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL, related_name='purchase_stats', on_delete=models.CASCADE, primary_key=True
+    )
+    first_purchase_at = models.DateTimeField()
+    last_purchase_at = models.DateTimeField()
+    orders = models.PositiveIntegerField(default=0)
+    items = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    # LTV proyectado a LTV_HORIZON_MONTHS (ver apps/analytics/rollups.py)
+    ltv = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    recency = models.PositiveSmallIntegerField(default=0)
+    frequency = models.PositiveSmallIntegerField(default=0)
+    monetary = models.PositiveSmallIntegerField(default=0)
+    segment = models.CharField(max_length=20, blank=True, default='')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['segment'], name='customerstats_segment_idx'),
+            # Mejores clientes por LTV
+            models.Index(fields=['-ltv', 'user'], name='customerstats_ltv_idx'),
+        ]
+
+    def __str__(self):
+        return f"Cliente {self.user_id}: {self.orders} compras, {self.revenue}"
+
+
+# Modelo 3: Distribución del tamaño de canasta por día
+class BasketSizeDaily(models.Model):
+    """ Ventas completadas del día con ``items`` unidades (``items`` se
+    topa en MAX_BASKET_ITEMS: la última barra es "N o más"). """
+    day = models.DateField()
+    items = models.PositiveSmallIntegerField()
+    orders = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'items'], name='basketsizedaily_day_items_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} - {self.items} items: {self.orders} ventas"
+
+
+# Modelo 4: Hasta qué venta están aplicados los agregados
+class RollupWatermark(models.Model):
+    name = models.CharField(max_length=50, unique=True)
+    last_sale_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name}: venta {self.last_sale_id}"
+
+
+# Modelo 5: Versión del modelo "comprados juntos"
+class RecommendationModel(models.Model):
+    """
+    Resultado de una corrida de ``mine_recommendations``. ``matrix`` es la
+    matriz de co-ocurrencia acumulada (npz comprimido) hasta
+    ``last_sale_id``: la siguiente corrida parte de ella y solo procesa las
+    ventas nuevas. El endpoint sirve la última versión con ``published_at``.
+    """
+    created_at = models.DateTimeField(auto_now_add=True)
+    published_at = models.DateTimeField(null=True, blank=True)
+    last_sale_id = models.BigIntegerField(default=0)
+    baskets = models.PositiveBigIntegerField(default=0)
+    line_items = models.PositiveBigIntegerField(default=0)
+    products = models.PositiveIntegerField(default=0)
+    pairs = models.PositiveBigIntegerField(default=0)
+    matrix = models.BinaryField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-published_at'], name='recmodel_published_idx'),
+        ]
+
+    def __str__(self):
+        return f"Recomendaciones v{self.pk} (venta {self.last_sale_id}, {self.baskets} canastas)"
+
+
+# Modelo 6: Lista de productos relacionados de un producto en una versión
+class ProductRecommendation(models.Model):
+    model = models.ForeignKey(RecommendationModel, related_name='recommendations', on_delete=models.CASCADE)
+    product_id = models.BigIntegerField()
+    # Ordenados por confianza: ids y sus puntajes en listas paralelas
+    related_ids = models.JSONField()
+    scores = models.JSONField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['model', 'product_id'], name='productrec_model_product_uniq'),
+        ]
+
+    def __str__(self):
+        return f"v{self.model_id} producto {self.product_id}: {len(self.related_ids)} relacionados"
@@ -0,0 +1,236 @@
+# apps/analytics/recommendations.py
+"""
+"Comprados juntos": co-ocurrencia de productos en una misma venta.
+
+Minado (``mine_recommendations``):
+
+- Las líneas (sale_id, product_id) de las ventas completadas nuevas se leen
+  por rangos de ids de venta a arrays numpy y se arma la matriz de incidencia
+  dispersa X (canastas x productos, binaria). ``X.T @ X`` da, para cada par de
+  productos, en cuántas canastas aparecen juntos (la diagonal: en cuántas
+  aparece cada uno).
+- La matriz acumulada se guarda con la versión del modelo; la corrida
+  siguiente la suma con la de las ventas nuevas (incremental).
+- Por producto se guardan solo los ``TOP_K`` relacionados de mayor confianza
+  P(b | a) = juntos(a, b) / canastas(a), con al menos ``MIN_SUPPORT``
+  canastas en común.
+
+Servicio: ``related_cache`` mantiene en memoria las listas de la última
+versión publicada y comprueba cada ``RELOAD_CHECK_SECONDS`` si hay otra.
+"""
+import io
+import threading
+import time
+from dataclasses import dataclass
+
+import numpy as np
+from scipy import sparse
+from django.db import transaction
+from django.utils import timezone
+
+from apps.sales.models import Sale, SaleDetail
+from .models import ProductRecommendation, RecommendationModel
+from .rollups import upper_bound
+
+TOP_K = 10
+MIN_SUPPORT = 2
+SALE_CHUNK = 200_000
+FETCH_CHUNK = 50_000
+BATCH_SIZE = 2_000
+KEEP_VERSIONS = 2
+RELOAD_CHECK_SECONDS = 30
+
+
+# --- Minado ---
+
+def basket_matrix(sale_ids, product_ids, n_products):
+    """ Incidencia binaria (canastas x productos) de las líneas dadas. """
+    _, baskets = np.unique(sale_ids, return_inverse=True)
+    matrix = sparse.csr_matrix(
+        (np.ones(len(product_ids), dtype=np.int32), (baskets, product_ids)),
+        shape=(int(baskets.max()) + 1 if len(baskets) else 0, n_products),
+    )
+    matrix.sum_duplicates()
+    matrix.data[:] = 1  # el mismo producto dos veces en una venta cuenta una
+    return matrix
+
+
+def _resize(matrix, n):
+    if matrix.shape[0] == n:
+        return matrix
+    matrix = matrix.tocoo()
+    return sparse.csr_matrix((matrix.data, (matrix.row, matrix.col)), shape=(n, n))
+
+
+def accumulate(cooccurrence, sale_ids, product_ids):
+    """
+    Suma a ``cooccurrence`` (CSR cuadrada indexada por product_id) los pares
+    de las líneas dadas. Devuelve (matriz, canastas nuevas).
+    """
+    if not len(product_ids):
+        return cooccurrence, 0
+    n = max(cooccurrence.shape[0], int(product_ids.max()) + 1)
+    incidence = basket_matrix(sale_ids, product_ids, n)
+    pairs = (incidence.T @ incidence).astype(np.int64)
+    return _resize(cooccurrence, n) + pairs, incidence.shape[0]
+
+
+def top_k(cooccurrence, k=TOP_K, min_support=MIN_SUPPORT):
+    """
+    {product_id: (ids, confianzas)} con los ``k`` relacionados de cada
+    producto, de mayor a menor confianza (empates: más canastas juntos).
+    """
+    matrix = cooccurrence.tocsr()
+    counts = matrix.diagonal()
+    result = {}
+    for product_id in np.flatnonzero(counts):
+        start, end = matrix.indptr[product_id], matrix.indptr[product_id + 1]
+        columns, together = matrix.indices[start:end], matrix.data[start:end]
+        keep = (columns != product_id) & (together >= min_support)
+        if not keep.any():
+            continue
+        columns, together = columns[keep], together[keep]
+        if len(columns) > k:
+            candidates = np.argpartition(-together, k - 1)[:k]
+            columns, together = columns[candidates], together[candidates]
+        order = np.lexsort((columns, -together))
+        confidence = together[order] / counts[product_id]
+        result[int(product_id)] = (columns[order].tolist(), np.round(confidence, 4).tolist())
+    return result
+
+
+def load_lines(first_sale_id, last_sale_id):
+    """ (sale_ids, product_ids) int64 de las ventas completadas en (first, last]. """
+    rows = (
+        SaleDetail.objects.filter(
+            sale_id__gt=first_sale_id, sale_id__lte=last_sale_id, sale__status=Sale.SaleStatus.COMPLETED,
+        ).values_list('sale_id', 'product_id').order_by().iterator(chunk_size=FETCH_CHUNK)
+    )
+    flat = np.fromiter((value for row in rows for value in row), dtype=np.int64)
+    return flat[0::2], flat[1::2]
+
+
+def _dump(matrix):
+    buffer = io.BytesIO()
+    sparse.save_npz(buffer, matrix.tocsr(), compressed=True)
+    return buffer.getvalue()
+
+
+def _load(data):
+    return sparse.load_npz(io.BytesIO(bytes(data))).tocsr()
+
+
+@dataclass
+class MiningResult:
+    model: RecommendationModel = None
+    new_baskets: int = 0
+    new_lines: int = 0
+    seconds: float = 0.0
+
+
+def latest_model(with_matrix=False):
+    models = RecommendationModel.objects.filter(published_at__isnull=False).order_by('-published_at', '-pk')
+    if not with_matrix:
+        models = models.defer('matrix')
+    return models.first()
+
+
+def mine(rebuild=False, now=None, sale_chunk=SALE_CHUNK, k=TOP_K, min_support=MIN_SUPPORT, on_chunk=None):
+    """
+    Procesa las ventas nuevas desde la última versión (o todas con
+    ``rebuild``), publica una versión nueva y devuelve ``MiningResult``.
+    Si no hay ventas nuevas no crea nada (``result.model`` es None).
+    """
+    started = time.perf_counter()
+    result = MiningResult()
+    previous = None if rebuild else latest_model(with_matrix=True)
+    if previous is not None and previous.matrix is not None:
+        cooccurrence, baskets = _load(previous.matrix), previous.baskets
+        first_id, line_items = previous.last_sale_id, previous.line_items
+    else:
+        cooccurrence, baskets, first_id, line_items = sparse.csr_matrix((0, 0), dtype=np.int64), 0, 0, 0
+
+    upper = upper_bound(now or timezone.now())
+    if upper <= first_id:
+        return result
+
+    for chunk_start in range(first_id, upper, sale_chunk):
+        sale_ids, product_ids = load_lines(chunk_start, min(chunk_start + sale_chunk, upper))
+        cooccurrence, new_baskets = accumulate(cooccurrence, sale_ids, product_ids)
+        result.new_baskets += new_baskets
+        result.new_lines += len(product_ids)
+        if on_chunk:
+            on_chunk(result)
+
+    lists = top_k(cooccurrence, k, min_support)
+    with transaction.atomic():
+        model = RecommendationModel.objects.create(
+            last_sale_id=upper,
+            baskets=baskets + result.new_baskets,
+            line_items=line_items + result.new_lines,
+            products=int(np.count_nonzero(cooccurrence.diagonal())),
+            pairs=sum(len(ids) for ids, _ in lists.values()),
+            matrix=_dump(cooccurrence),
+        )
+        ProductRecommendation.objects.bulk_create([
+            ProductRecommendation(model=model, product_id=product_id, related_ids=ids, scores=scores)
+            for product_id, (ids, scores) in lists.items()
+        ], batch_size=BATCH_SIZE)
+        model.published_at = timezone.now()
+        model.save(update_fields=['published_at'])
+        _prune(model)
+    related_cache.invalidate()
+    result.model = model
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+def _prune(current):
+    """ Conserva las últimas ``KEEP_VERSIONS`` versiones; solo la actual guarda la matriz. """
+    stale = RecommendationModel.objects.exclude(pk=current.pk).order_by('-pk')
+    RecommendationModel.objects.filter(pk__in=list(stale.values_list('pk', flat=True)[KEEP_VERSIONS - 1:])).delete()
+    stale.filter(matrix__isnull=False).update(matrix=None)
+
+
+# --- Servicio ---
+
+class RelatedCache:
+    """ Listas de la versión publicada, en memoria del proceso. """
+
+    def __init__(self, check_seconds=RELOAD_CHECK_SECONDS):
+        self.check_seconds = check_seconds
+        self.version = None
+        self._lists = {}
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        self._checked_at = None
+
+    def _due(self):
+        return self._checked_at is None or time.monotonic() - self._checked_at >= self.check_seconds
+
+    def refresh(self):
+        with self._lock:
+            if not self._due():
+                return
+            latest = RecommendationModel.objects.filter(published_at__isnull=False) \
+                .order_by('-published_at', '-pk').values_list('pk', flat=True).first()
+            if latest != self.version:
+                lists = {
+                    product_id: (ids, scores)
+                    for product_id, ids, scores in ProductRecommendation.objects.filter(model_id=latest)
+                    .values_list('product_id', 'related_ids', 'scores').iterator(chunk_size=BATCH_SIZE)
+                }
+                # Se reemplaza de una vez: los lectores ven la versión anterior o la nueva
+                self._lists, self.version = lists, latest
+            self._checked_at = time.monotonic()
+
+    def related(self, product_id):
+        """ (ids, confianzas) de ``product_id``; listas vacías si no tiene. """
+        if self._due():
+            self.refresh()
+        return self._lists.get(product_id, ([], []))
+
+
+related_cache = RelatedCache()
@@ -0,0 +1,252 @@
+# apps/analytics/rollups.py
+"""
+Mantenimiento incremental de los agregados de analítica.
+
+``RollupWatermark('sales')`` guarda el id de la última venta aplicada. Cada
+``refresh`` toma las ventas completadas con id mayor, en bloques de
+``chunk_size`` ids: agrega el bloque con GROUP BY, suma los resultados a las
+filas existentes y avanza la marca en la misma transacción (un corte no deja
+ventas contadas dos veces ni sin contar).
+
+Las ventas de los últimos ``SAFETY_LAG`` no se toman todavía: un id menor
+puede confirmarse después que uno mayor si su transacción tarda más.
+"""
+from dataclasses import dataclass
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Max, Min, Sum, Value
+from django.db.models.functions import Least, TruncDate
+from django.utils import timezone
+
+from apps.sales.models import Sale, SaleDetail
+from core.lazy import lazy_module
+from .models import BasketSizeDaily, CustomerStats, ProductDailySales, RollupWatermark
+
+# Solo lo usa el cálculo de RFM; services importa las constantes de aquí al
+# cargar las URLs
+np = lazy_module('numpy')
+
+WATERMARK = 'sales'
+SAFETY_LAG = timedelta(minutes=2)
+CHUNK_SIZE = 20_000
+BATCH_SIZE = 2_000
+MAX_BASKET_ITEMS = 50
+LTV_HORIZON_MONTHS = 12
+CENT = Decimal('0.01')
+
+LINE_REVENUE = ExpressionWrapper(F('quantity') * F('price_at_purchase'), output_field=DecimalField())
+
+
+@dataclass
+class RefreshResult:
+    sales: int = 0
+    chunks: int = 0
+    last_sale_id: int = 0
+    customers_scored: int = 0
+
+
+def _completed(first_id, last_id):
+    return Sale.objects.filter(id__gt=first_id, id__lte=last_id, status=Sale.SaleStatus.COMPLETED)
+
+
+def _upsert(model, keys, rows, unique_fields, sum_fields, extra=None):
+    """
+    Suma ``rows`` ({clave: {campo: valor}}) a las filas existentes de
+    ``model`` y las escribe con un solo upsert por lote.
+    """
+    if not rows:
+        return
+    lookup = {f'{field}__in': {key[i] for key in rows} for i, field in enumerate(keys)}
+    existing = {
+        tuple(row[field] for field in keys): row
+        for row in model.objects.filter(**lookup).values(*keys, *sum_fields)
+    }
+    objects = []
+    for key, values in rows.items():
+        current = existing.get(key)
+        if current:
+            for name in sum_fields:
+                values[name] += current[name]
+        # SQLite suma decimales como float: se redondea a centavos antes de guardar
+        for name, value in values.items():
+            if isinstance(value, Decimal):
+                values[name] = value.quantize(CENT)
+        objects.append(model(**dict(zip(keys, key)), **values))
+    model.objects.bulk_create(
+        objects, batch_size=BATCH_SIZE, update_conflicts=True,
+        unique_fields=unique_fields, update_fields=sum_fields + list(extra or ()),
+    )
+
+
+def _apply_products(first_id, last_id):
+    grouped = (
+        SaleDetail.objects.filter(sale__in=_completed(first_id, last_id))
+        .annotate(day=TruncDate('sale__created_at'))
+        .values('day', 'product_id', 'product__category_id', 'product__brand_id')
+        .annotate(units=Sum('quantity'), revenue=Sum(LINE_REVENUE), orders=Count('sale_id', distinct=True))
+    )
+    rows = {
+        (row['day'], row['product_id']): {
+            'category_id': row['product__category_id'],
+            'brand_id': row['product__brand_id'],
+            'units': row['units'],
+            'revenue': row['revenue'],
+            'orders': row['orders'],
+        }
+        for row in grouped
+    }
+    _upsert(ProductDailySales, ('day', 'product_id'), rows, ['day', 'product'],
+            ['units', 'revenue', 'orders'], extra=['category_id', 'brand_id'])
+
+
+def _apply_baskets(first_id, last_id):
+    grouped = (
+        _completed(first_id, last_id)
+        .annotate(day=TruncDate('created_at'), items=Least('item_count', Value(MAX_BASKET_ITEMS)))
+        .values('day', 'items').annotate(orders=Count('id'), revenue=Sum('total_amount'))
+    )
+    rows = {(row['day'], row['items']): {'orders': row['orders'], 'revenue': row['revenue']} for row in grouped}
+    _upsert(BasketSizeDaily, ('day', 'items'), rows, ['day', 'items'], ['orders', 'revenue'])
+
+
+def _apply_customers(first_id, last_id):
+    grouped = (
+        _completed(first_id, last_id).filter(user__isnull=False)
+        .values('user_id').annotate(
+            orders=Count('id'), items=Sum('item_count'), revenue=Sum('total_amount'),
+            first=Min('created_at'), last=Max('created_at'),
+        )
+    )
+    batch = {row['user_id']: row for row in grouped}
+    if not batch:
+        return
+    existing = CustomerStats.objects.in_bulk(list(batch))
+    objects = []
+    for user_id, row in batch.items():
+        stats = existing.get(user_id) or CustomerStats(
+            user_id=user_id, first_purchase_at=row['first'], last_purchase_at=row['last'],
+        )
+        if stats.pk in existing:
+            stats.first_purchase_at = min(stats.first_purchase_at, row['first'])
+            stats.last_purchase_at = max(stats.last_purchase_at, row['last'])
+        stats.orders += row['orders']
+        stats.items += row['items'] or 0
+        stats.revenue = (stats.revenue + row['revenue']).quantize(CENT)
+        objects.append(stats)
+    CustomerStats.objects.bulk_create(
+        objects, batch_size=BATCH_SIZE, update_conflicts=True, unique_fields=['user'],
+        update_fields=['first_purchase_at', 'last_purchase_at', 'orders', 'items', 'revenue'],
+    )
+
+
+def upper_bound(now):
+    """ Última venta que ya se puede agregar (creada antes de ``now - SAFETY_LAG``). """
+    last = Sale.objects.filter(created_at__lt=now - SAFETY_LAG).aggregate(last=Max('id'))['last']
+    return last or 0
+
+
+def refresh(chunk_size=CHUNK_SIZE, now=None, on_chunk=None, score=True):
+    """
+    Aplica las ventas nuevas a los agregados y, si hubo cambios (o con
+    ``score='always'``), recalcula los puntajes RFM. ``on_chunk(result)``
+    se llama tras cada bloque.
+    """
+    now = now or timezone.now()
+    result = RefreshResult()
+    upper = upper_bound(now)
+    while True:
+        with transaction.atomic():
+            watermark, _ = RollupWatermark.objects.select_for_update().get_or_create(name=WATERMARK)
+            first_id = watermark.last_sale_id
+            if first_id >= upper:
+                result.last_sale_id = first_id
+                break
+            last_id = min(first_id + chunk_size, upper)
+            _apply_products(first_id, last_id)
+            _apply_baskets(first_id, last_id)
+            _apply_customers(first_id, last_id)
+            result.sales += _completed(first_id, last_id).count()
+            watermark.last_sale_id = last_id
+            watermark.save(update_fields=['last_sale_id', 'updated_at'])
+        result.chunks += 1
+        result.last_sale_id = last_id
+        if on_chunk:
+            on_chunk(result)
+
+    if score == 'always' or (score and result.chunks):
+        result.customers_scored = score_customers(now)
+    return result
+
+
+def rebuild(chunk_size=CHUNK_SIZE, now=None, on_chunk=None):
+    """ Borra los agregados y los recalcula desde la primera venta. """
+    with transaction.atomic():
+        ProductDailySales.objects.all().delete()
+        BasketSizeDaily.objects.all().delete()
+        CustomerStats.objects.all().delete()
+        RollupWatermark.objects.filter(name=WATERMARK).delete()
+    return refresh(chunk_size, now=now, on_chunk=on_chunk)
+
+
+# --- RFM / LTV ---
+
+SEGMENTS = ('champions', 'loyal', 'new', 'promising', 'at_risk', 'hibernating')
+
+
+def quintile_scores(values, higher_is_better=True):
+    """ Puntaje 1-5 por quintil de ``values`` (array numpy). """
+    edges = np.quantile(values, [0.2, 0.4, 0.6, 0.8])
+    scores = np.searchsorted(edges, values, side='right') + 1
+    return scores if higher_is_better else 6 - scores
+
+
+def segment_labels(recency, frequency):
+    conditions = [
+        (recency >= 4) & (frequency >= 4),
+        (recency >= 3) & (frequency >= 3),
+        (recency >= 4),
+        (recency == 3),
+        (frequency >= 3),
+    ]
+    return np.select(conditions, SEGMENTS[:5], default=SEGMENTS[5])
+
+
+def score_customers(now=None):
+    """
+    Recalcula recency/frequency/monetary (quintiles), segmento y LTV de
+    todos los clientes con compras. Devuelve cuántos se actualizaron.
+
+    LTV = ticket promedio x compras por mes (desde su primera compra) x
+    LTV_HORIZON_MONTHS.
+    """
+    now = now or timezone.now()
+    rows = list(CustomerStats.objects.order_by('pk').values_list(
+        'pk', 'first_purchase_at', 'last_purchase_at', 'orders', 'revenue',
+    ))
+    if not rows:
+        return 0
+    user_ids, firsts, lasts, orders, revenue = zip(*rows)
+    orders = np.asarray(orders, dtype=np.int64)
+    revenue = np.asarray([float(value) for value in revenue])
+    now_ts = now.timestamp()
+    days_since_last = np.asarray([(now_ts - last.timestamp()) / 86_400 for last in lasts])
+    months_active = np.maximum(np.asarray([(now_ts - first.timestamp()) / (86_400 * 30) for first in firsts]), 1)
+
+    recency = quintile_scores(days_since_last, higher_is_better=False)
+    frequency = quintile_scores(orders)
+    monetary = quintile_scores(revenue)
+    segments = segment_labels(recency, frequency)
+    ltv = np.round(revenue / orders * (orders / months_active) * LTV_HORIZON_MONTHS, 2)
+
+    objects = [
+        CustomerStats(user_id=user_id, recency=r, frequency=f, monetary=m, segment=s, ltv=Decimal(str(value)))
+        for user_id, r, f, m, s, value in zip(
+            user_ids, recency.tolist(), frequency.tolist(), monetary.tolist(), segments.tolist(), ltv.tolist(),
+        )
+    ]
+    CustomerStats.objects.bulk_update(
+        objects, ['recency', 'frequency', 'monetary', 'segment', 'ltv'], batch_size=BATCH_SIZE,
+    )
+    return len(objects)
@@ -0,0 +1,127 @@
+# apps/analytics/services.py
+"""
+Consultas de analítica sobre los agregados de ``rollups.py``. El costo
+depende de días x productos (o clientes), no del número de ventas.
+
+Los rankings agrupan la ventana en la base y eligen los N mayores con
+``heapq.nlargest`` mientras recorren el resultado (memoria O(N)).
+"""
+import heapq
+from decimal import Decimal
+
+from django.db.models import Count, Sum
+
+from apps.products.models import Brand, Category, Product
+from .models import BasketSizeDaily, CustomerStats, ProductDailySales, RollupWatermark
+from .rollups import MAX_BASKET_ITEMS, SEGMENTS, WATERMARK
+
+# dimensión -> (columna de agrupación en ProductDailySales, modelo para el nombre)
+DIMENSIONS = {
+    'products': ('product_id', Product),
+    'categories': ('category_id', Category),
+    'brands': ('brand_id', Brand),
+}
+METRICS = ('revenue', 'units')
+
+
+def in_window(queryset, fecha_inicio=None, fecha_fin=None):
+    if fecha_inicio:
+        queryset = queryset.filter(day__gte=fecha_inicio)
+    if fecha_fin:
+        queryset = queryset.filter(day__lte=fecha_fin)
+    return queryset
+
+
+def top_n(dimension, metric='revenue', n=10, fecha_inicio=None, fecha_fin=None):
+    """ Los ``n`` productos / categorías / marcas con más ``metric`` en la ventana. """
+    column, model = DIMENSIONS[dimension]
+    grouped = (
+        in_window(ProductDailySales.objects.all(), fecha_inicio, fecha_fin)
+        .filter(**{f'{column}__isnull': False})
+        .values(column).annotate(revenue=Sum('revenue'), units=Sum('units'), orders=Sum('orders'))
+        .values_list(column, 'revenue', 'units', 'orders')
+        .order_by()
+    )
+    index = 1 if metric == 'revenue' else 2
+    top = heapq.nlargest(n, grouped.iterator(), key=lambda row: (row[index], -row[0]))
+    names = dict(model.objects.filter(pk__in=[row[0] for row in top]).values_list('pk', 'name'))
+    return [
+        {'id': pk, 'name': names.get(pk), 'revenue': round(revenue, 2), 'units': units, 'orders': orders}
+        for pk, revenue, units, orders in top
+    ]
+
+
+def rfm_summary(top=10):
+    """ Clientes, ingresos y LTV promedio por segmento RFM, y los ``top`` de mayor LTV. """
+    by_segment = {
+        row['segment']: row
+        for row in CustomerStats.objects.exclude(segment='').values('segment').annotate(
+            customers=Count('pk'), revenue=Sum('revenue'), ltv=Sum('ltv'), orders=Sum('orders'),
+        ).order_by()
+    }
+    segments = []
+    for name in SEGMENTS:
+        row = by_segment.get(name, {'customers': 0, 'revenue': Decimal('0'), 'ltv': Decimal('0'), 'orders': 0})
+        customers = row['customers']
+        segments.append({
+            'segment': name,
+            'customers': customers,
+            'revenue': round(row['revenue'], 2),
+            'orders': row['orders'],
+            'avg_ltv': round(row['ltv'] / customers, 2) if customers else Decimal('0'),
+        })
+
+    # Por índice (customerstats_ltv_idx): ya viene ordenado, no hace falta el heap
+    best = CustomerStats.objects.order_by('-ltv', 'user_id').values_list(
+        'user_id', 'user__email', 'orders', 'revenue', 'ltv', 'segment', 'last_purchase_at',
+    )[:top]
+    keys = ('user_id', 'email', 'orders', 'revenue', 'ltv', 'segment', 'last_purchase_at')
+    return {'segments': segments, 'top_customers': [dict(zip(keys, row)) for row in best]}
+
+
+def _histogram_percentile(sizes, counts, q):
+    """ Percentil ``q`` de un histograma (tamaños ordenados). """
+    target = sum(counts) * q / 100
+    running = 0
+    for size, count in zip(sizes, counts):
+        running += count
+        if running >= target:
+            return size
+    return sizes[-1] if sizes else 0
+
+
+def basket_distribution(fecha_inicio=None, fecha_fin=None):
+    """ Ventas por número de unidades en la canasta, con percentiles y tickets. """
+    rows = list(
+        in_window(BasketSizeDaily.objects.all(), fecha_inicio, fecha_fin)
+        .values('items').annotate(orders=Sum('orders'), revenue=Sum('revenue')).order_by('items')
+    )
+    sizes = [row['items'] for row in rows]
+    counts = [row['orders'] for row in rows]
+    orders = sum(counts)
+    revenue = sum((row['revenue'] for row in rows), Decimal('0'))
+    units = sum(size * count for size, count in zip(sizes, counts))
+    return {
+        'orders': orders,
+        'avg_items': round(units / orders, 2) if orders else 0,
+        'avg_order_value': round(revenue / orders, 2) if orders else Decimal('0'),
+        'p50_items': _histogram_percentile(sizes, counts, 50),
+        'p90_items': _histogram_percentile(sizes, counts, 90),
+        'p99_items': _histogram_percentile(sizes, counts, 99),
+        'max_bucket': MAX_BASKET_ITEMS,
+        'distribution': [
+            {
+                'items': row['items'],
+                'orders': row['orders'],
+                'share': round(row['orders'] / orders, 4),
+                'avg_order_value': round(row['revenue'] / row['orders'], 2),
+            }
+            for row in rows
+        ],
+    }
+
+
+def freshness():
+    """ Última venta aplicada a los agregados y cuándo. """
+    watermark = RollupWatermark.objects.filter(name=WATERMARK).values('last_sale_id', 'updated_at').first()
+    return watermark or {'last_sale_id': 0, 'updated_at': None}
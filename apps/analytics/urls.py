@@ -0,0 +1,12 @@
+# apps/analytics/urls.py
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    # Rankings por ventana: products, categories, brands
+    path('top/<str:dimension>/', views.TopRankingView.as_view(), name='analytics-top'),
+
+    # Clientes (RFM / LTV) y canastas
+    path('customers/segments/', views.CustomerSegmentsView.as_view(), name='analytics-customer-segments'),
+    path('baskets/distribution/', views.BasketDistributionView.as_view(), name='analytics-basket-distribution'),
+]
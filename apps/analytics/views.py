@@ -0,0 +1,93 @@
+from datetime import date, timedelta
+
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.db_router import ReplicaReadMixin
+from .services import DIMENSIONS, METRICS, basket_distribution, freshness, rfm_summary, top_n
+
+MAX_TOP = 100
+
+
+def _period(request, default_days=30):
+    """ fecha_inicio / fecha_fin (YYYY-MM-DD); por defecto los últimos ``default_days`` días. """
+    params = {}
+    for name in ('fecha_inicio', 'fecha_fin'):
+        value = request.query_params.get(name)
+        if value:
+            try:
+                params[name] = date.fromisoformat(value)
+            except ValueError:
+                return None
+    if 'fecha_inicio' not in params:
+        params['fecha_inicio'] = (params.get('fecha_fin') or timezone.localdate()) - timedelta(days=default_days)
+    return params
+
+
+def _limit(request, name='n', default=10):
+    value = request.query_params.get(name, str(default))
+    if not value.isdigit() or not 1 <= int(value) <= MAX_TOP:
+        return None
+    return int(value)
+
+
+class TopRankingView(ReplicaReadMixin, APIView):
+    """
+    (Solo Admin) Top N de productos, categorías o marcas por ingresos o
+    unidades en la ventana (por defecto últimos 30 días).
+    ``?metric=revenue|units&n=10&fecha_inicio=&fecha_fin=``
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, dimension):
+        if dimension not in DIMENSIONS:
+            return Response({"error": f"Dimensión inválida. Opciones: {', '.join(DIMENSIONS)}."},
+                            status=status.HTTP_404_NOT_FOUND)
+        metric = request.query_params.get('metric', 'revenue')
+        if metric not in METRICS:
+            return Response({"error": "metric debe ser revenue o units."}, status=status.HTTP_400_BAD_REQUEST)
+        n = _limit(request)
+        if n is None:
+            return Response({"error": f"n debe estar entre 1 y {MAX_TOP}."}, status=status.HTTP_400_BAD_REQUEST)
+        period = _period(request)
+        if period is None:
+            return Response({"error": "Formato de fecha inválido (YYYY-MM-DD)."}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            'dimension': dimension,
+            'metric': metric,
+            'fecha_inicio': period['fecha_inicio'],
+            'fecha_fin': period.get('fecha_fin'),
+            'results': top_n(dimension, metric, n, **period),
+            'data_as_of': freshness(),
+        })
+
+
+class CustomerSegmentsView(ReplicaReadMixin, APIView):
+    """ (Solo Admin) Segmentos RFM con su LTV promedio y los ``?top=10`` clientes de mayor LTV. """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        top = _limit(request, 'top')
+        if top is None:
+            return Response({"error": f"top debe estar entre 1 y {MAX_TOP}."}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({**rfm_summary(top), 'data_as_of': freshness()})
+
+
+class BasketDistributionView(ReplicaReadMixin, APIView):
+    """ (Solo Admin) Distribución del tamaño de canasta en la ventana (por defecto últimos 30 días). """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        period = _period(request)
+        if period is None:
+            return Response({"error": "Formato de fecha inválido (YYYY-MM-DD)."}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            'fecha_inicio': period['fecha_inicio'],
+            'fecha_fin': period.get('fecha_fin'),
+            **basket_distribution(**period),
+            'data_as_of': freshness(),
+        })
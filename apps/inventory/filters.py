@@ -0,0 +1,27 @@
+import django_filters
+
+from apps.sales.filters import created_at_bounds
+from .models import StockMovement
+
+
+def movement_period(queryset, fecha_inicio=None, fecha_fin=None):
+    """ Filtra por created_at en [fecha_inicio, fecha_fin] (días completos). """
+    start, end, _ = created_at_bounds(fecha_inicio=fecha_inicio, fecha_fin=fecha_fin)
+    if start is not None:
+        queryset = queryset.filter(created_at__gte=start)
+    if end is not None:
+        queryset = queryset.filter(created_at__lt=end)
+    return queryset
+
+
+class StockMovementFilter(django_filters.FilterSet):
+    """ Filtros del libro de movimientos (auditoría). """
+    fecha_inicio = django_filters.DateFilter(method='filter_period')
+    fecha_fin = django_filters.DateFilter(method='filter_period')
+
+    class Meta:
+        model = StockMovement
+        fields = ['product', 'kind', 'sale', 'user', 'fecha_inicio', 'fecha_fin']
+
+    def filter_period(self, queryset, name, value):
+        return movement_period(queryset, **{name: value})
@@ -0,0 +1,160 @@
+# apps/inventory/forecasting.py
+"""
+Pronóstico de demanda por producto y punto de reorden.
+
+La demanda diaria de cada producto se suaviza con una media móvil
+exponencial (EWMA, vida media ``HALF_LIFE_DAYS``) junto con su varianza.
+Todo se calcula a la vez para todos los productos sobre una matriz
+productos x días de numpy:
+
+- ``fit``: desde cero, con los últimos ``HISTORY_DAYS`` días (una consulta
+  GROUP BY producto, día y un producto matricial con los pesos).
+- ``update``: cada día, a partir del estado guardado (tasa y desviación),
+  solo con las ventas de los días nuevos.
+
+Punto de reorden = demanda en el plazo de reposición + stock de seguridad
+(``SERVICE_LEVEL_Z`` desviaciones en ese plazo).
+"""
+import math
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+
+import numpy as np
+from django.db.models import Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from apps.products.models import Product
+from apps.sales.models import Sale, SaleDetail
+from .models import ProductDemandForecast
+from .services import available_stock
+
+HISTORY_DAYS = 182
+HALF_LIFE_DAYS = 14
+LEAD_TIME_DAYS = 7
+SERVICE_LEVEL_Z = 1.65  # ~95% de ciclos de reposición sin quiebre
+BATCH_SIZE = 2_000
+
+ALPHA = 1 - 0.5 ** (1 / HALF_LIFE_DAYS)
+
+
+@dataclass
+class ForecastResult:
+    products: int = 0
+    days: int = 0
+    through_day: object = None
+    mode: str = ''
+
+
+def demand_matrix(product_index, first_day, n_days, rows):
+    """
+    Matriz (productos x días) de unidades vendidas. ``rows``: tuplas
+    (product_id, día, unidades); ``product_index``: {product_id: fila}.
+    """
+    matrix = np.zeros((len(product_index), n_days))
+    rows = [(product_index[pid], (day - first_day).days, units) for pid, day, units in rows if pid in product_index]
+    if rows:
+        products, days, units = np.array(rows, dtype=np.int64).T
+        np.add.at(matrix, (products, days), units)
+    return matrix
+
+
+def ewma_fit(matrix, alpha=ALPHA):
+    """ (tasa, varianza) EWMA por fila, con los pesos de todos los días en un solo producto matricial. """
+    n_days = matrix.shape[1]
+    weights = (1 - alpha) ** np.arange(n_days - 1, -1, -1)
+    weights /= weights.sum()
+    rate = matrix @ weights
+    variance = ((matrix - rate[:, None]) ** 2) @ weights
+    return rate, variance
+
+
+def ewma_update(rate, variance, matrix, alpha=ALPHA):
+    """ Aplica los días (columnas) de ``matrix`` al estado (tasa, varianza). """
+    rate, variance = rate.copy(), variance.copy()
+    for day in range(matrix.shape[1]):
+        delta = matrix[:, day] - rate
+        rate += alpha * delta
+        variance = (1 - alpha) * (variance + alpha * delta ** 2)
+    return rate, variance
+
+
+def reorder_points(rate, std, lead_time=LEAD_TIME_DAYS, z=SERVICE_LEVEL_Z):
+    """ (stock de seguridad, punto de reorden) redondeados hacia arriba. """
+    safety = np.ceil(z * std * math.sqrt(lead_time))
+    return safety, np.ceil(rate * lead_time) + safety
+
+
+def daily_units(first_day, last_day):
+    """ (product_id, día, unidades) de las ventas completadas entre ambos días (inclusive). """
+    # Rango semiabierto sobre created_at (usa sale_status_created_idx)
+    start = timezone.make_aware(datetime.combine(first_day, time.min))
+    end = timezone.make_aware(datetime.combine(last_day + timedelta(days=1), time.min))
+    return (
+        SaleDetail.objects.filter(
+            sale__status=Sale.SaleStatus.COMPLETED, sale__created_at__gte=start, sale__created_at__lt=end,
+        )
+        .annotate(day=TruncDate('sale__created_at'))
+        .values('product_id', 'day').annotate(units=Sum('quantity'))
+        .values_list('product_id', 'day', 'units').order_by()
+    )
+
+
+def _save(product_ids, rate, variance, through_day):
+    std = np.sqrt(np.maximum(variance, 0))
+    safety, reorder = reorder_points(rate, std)
+    stock = available_stock()
+    forecasts = []
+    for i, product_id in enumerate(product_ids):
+        daily_rate = float(rate[i])
+        forecasts.append(ProductDemandForecast(
+            product_id=product_id,
+            daily_rate=daily_rate,
+            daily_std=float(std[i]),
+            safety_stock=int(safety[i]),
+            reorder_point=int(reorder[i]),
+            days_of_cover=stock.get(product_id, 0) / daily_rate if daily_rate > 1e-9 else None,
+            through_day=through_day,
+        ))
+    ProductDemandForecast.objects.bulk_create(
+        forecasts, batch_size=BATCH_SIZE, update_conflicts=True, unique_fields=['product'],
+        update_fields=['daily_rate', 'daily_std', 'safety_stock', 'reorder_point', 'days_of_cover',
+                       'through_day', 'updated_at'],
+    )
+
+
+def run(rebuild=False, through_day=None):
+    """
+    Actualiza los pronósticos hasta ``through_day`` (por defecto ayer, el
+    último día completo). Sin estado guardado (o con ``rebuild``) ajusta
+    desde cero con ``HISTORY_DAYS`` días; si no, aplica solo los días nuevos.
+    """
+    through_day = through_day or timezone.localdate() - timedelta(days=1)
+    product_ids = list(Product.objects.order_by('pk').values_list('pk', flat=True))
+    index = {product_id: i for i, product_id in enumerate(product_ids)}
+    state = {} if rebuild else {
+        product_id: (rate, std, day)
+        for product_id, rate, std, day in ProductDemandForecast.objects.values_list(
+            'product_id', 'daily_rate', 'daily_std', 'through_day').iterator(chunk_size=BATCH_SIZE)
+    }
+    last_day = max((day for _, _, day in state.values()), default=None)
+
+    if last_day is None or (through_day - last_day).days > HISTORY_DAYS:
+        first_day = through_day - timedelta(days=HISTORY_DAYS - 1)
+        matrix = demand_matrix(index, first_day, HISTORY_DAYS, daily_units(first_day, through_day))
+        rate, variance = ewma_fit(matrix)
+        mode, days = 'fit', HISTORY_DAYS
+    else:
+        days = (through_day - last_day).days
+        if days <= 0:
+            return ForecastResult(len(product_ids), 0, last_day, 'up_to_date')
+        # Productos nuevos (sin estado) parten de demanda 0
+        rate = np.array([state.get(pid, (0.0, 0.0, None))[0] for pid in product_ids])
+        variance = np.array([state.get(pid, (0.0, 0.0, None))[1] for pid in product_ids]) ** 2
+        first_day = last_day + timedelta(days=1)
+        matrix = demand_matrix(index, first_day, days, daily_units(first_day, through_day))
+        rate, variance = ewma_update(rate, variance, matrix)
+        mode = 'update'
+
+    _save(product_ids, rate, variance, through_day)
+    return ForecastResult(len(product_ids), days, through_day, mode)
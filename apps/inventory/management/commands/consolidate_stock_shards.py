@@ -0,0 +1,28 @@
+# apps/inventory/management/commands/consolidate_stock_shards.py
+from django.core.management.base import BaseCommand
+
+from apps.inventory.models import StockShard
+from apps.inventory.services import consolidate
+
+
+class Command(BaseCommand):
+    help = (
+        "Para cada producto con stock fraccionado, escribe la suma de sus "
+        "fracciones en Product.stock y las reparte de nuevo en partes iguales. "
+        "Pensado para ejecutarse periódicamente (cron, cada pocos minutos)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--no-rebalance', action='store_true',
+                            help="Solo actualiza Product.stock, sin redistribuir las fracciones.")
+
+    def handle(self, *args, **options):
+        product_ids = StockShard.objects.order_by('product_id').values_list('product_id', flat=True).distinct()
+        total_products = 0
+        for product_id in product_ids:
+            # Una transacción corta por producto: no bloquea el resto del catálogo
+            stock = consolidate(product_id, rebalance=not options['no_rebalance'])
+            if stock is not None:
+                total_products += 1
+                self.stdout.write(f"  producto {product_id}: {stock}")
+        self.stdout.write(self.style.SUCCESS(f"{total_products} productos consolidados."))
@@ -0,0 +1,39 @@
+# apps/inventory/management/commands/forecast_demand.py
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.inventory.forecasting import run
+
+
+class Command(BaseCommand):
+    help = (
+        "Actualiza el pronóstico de demanda, stock de seguridad y punto de "
+        "reorden de todos los productos con las ventas hasta ayer. Aplica "
+        "solo los días nuevos desde la última corrida (cron diario); "
+        "--rebuild ajusta desde cero con el historial."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rebuild', action='store_true', help="Ignora el estado guardado.")
+        parser.add_argument('--through', help="Último día a incluir (YYYY-MM-DD); por defecto ayer.")
+
+    def handle(self, *args, **options):
+        through_day = None
+        if options['through']:
+            try:
+                through_day = date.fromisoformat(options['through'])
+            except ValueError:
+                raise CommandError("--through debe tener formato YYYY-MM-DD.")
+
+        started = time.perf_counter()
+        result = run(rebuild=options['rebuild'], through_day=through_day)
+        if result.mode == 'up_to_date':
+            self.stdout.write(f"Pronósticos ya actualizados hasta {result.through_day}.")
+            return
+        label = "ajuste completo" if result.mode == 'fit' else "actualización"
+        self.stdout.write(self.style.SUCCESS(
+            f"{result.products} productos, {label} con {result.days} días hasta {result.through_day} "
+            f"en {time.perf_counter() - started:.2f}s."
+        ))
@@ -0,0 +1,34 @@
+# apps/inventory/management/commands/shard_stock.py
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.inventory.services import disable_sharding, enable_sharding
+from apps.products.models import Product
+
+
+class Command(BaseCommand):
+    help = (
+        "Reparte el stock de productos muy vendidos en N fracciones (StockShard) "
+        "para que las compras simultáneas no esperen el mismo bloqueo, o lo "
+        "vuelve a concentrar en Product.stock con --disable."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('product_ids', nargs='+', type=int)
+        parser.add_argument('--shards', type=int, default=8, help="Número de fracciones.")
+        parser.add_argument('--disable', action='store_true', help="Quita las fracciones.")
+
+    def handle(self, *args, **options):
+        if not options['disable'] and not 2 <= options['shards'] <= 256:
+            raise CommandError("--shards debe estar entre 2 y 256.")
+        products = Product.objects.in_bulk(options['product_ids'])
+        missing = set(options['product_ids']) - set(products)
+        if missing:
+            raise CommandError(f"Productos inexistentes: {', '.join(map(str, sorted(missing)))}")
+
+        for product in products.values():
+            if options['disable']:
+                disable_sharding(product)
+                self.stdout.write(f"  {product.name}: sin fracciones")
+            else:
+                product = enable_sharding(product, options['shards'])
+                self.stdout.write(f"  {product.name}: {product.stock} unidades en {options['shards']} fracciones")
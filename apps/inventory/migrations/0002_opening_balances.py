@@ -0,0 +1,34 @@
+from django.db import migrations
+
+BATCH_SIZE = 2_000
+
+
+def create_opening_balances(apps, schema_editor):
+    """ Un ajuste "Saldo inicial" por producto con stock, para que el saldo
+    del libro coincida con Product.stock desde el primer día. """
+    Product = apps.get_model('products', 'Product')
+    StockMovement = apps.get_model('inventory', 'StockMovement')
+    batch = []
+    for product_id, stock in Product.objects.filter(stock__gt=0).order_by('id').values_list('id', 'stock').iterator():
+        batch.append(StockMovement(product_id=product_id, kind='ADJUSTMENT', quantity=stock, note='Saldo inicial'))
+        if len(batch) >= BATCH_SIZE:
+            StockMovement.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        StockMovement.objects.bulk_create(batch)
+
+
+def delete_opening_balances(apps, schema_editor):
+    StockMovement = apps.get_model('inventory', 'StockMovement')
+    StockMovement.objects.filter(kind='ADJUSTMENT', note='Saldo inicial', user__isnull=True).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_opening_balances, delete_opening_balances),
+    ]
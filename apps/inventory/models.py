@@ -0,0 +1,90 @@
+from django.conf import settings
+from django.db import models
+
+from apps.products.models import Product
+
+
+# Modelo 1: Libro de movimientos de stock (solo se agregan filas)
+class StockMovement(models.Model):
+    class Kind(models.TextChoices):
+        SALE = 'SALE', 'Venta'
+        RESTOCK = 'RESTOCK', 'Reposición'
+        ADJUSTMENT = 'ADJUSTMENT', 'Ajuste'
+
+    product = models.ForeignKey(Product, related_name='stock_movements', on_delete=models.PROTECT)
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    # Con signo: negativo = salida (venta, merma), positivo = entrada
+    quantity = models.IntegerField()
+    sale = models.ForeignKey(
+        'sales.Sale', related_name='stock_movements', on_delete=models.SET_NULL, null=True, blank=True
+    )
+    # Quién registró la reposición o el ajuste (None en ventas)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, related_name='stock_movements',
+        on_delete=models.SET_NULL, null=True, blank=True
+    )
+    note = models.CharField(max_length=255, blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Historial de un producto y auditoría por producto
+            models.Index(fields=['product', '-created_at'], name='stockmove_product_created_idx'),
+            # Reporte de reposiciones / ajustes por periodo
+            models.Index(fields=['kind', 'created_at'], name='stockmove_kind_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} {self.quantity:+d} de {self.product_id}"
+
+
+# Modelo 2: Fracciones del stock de un producto muy vendido
+class StockShard(models.Model):
+    """
+    El stock de un producto "caliente" se reparte en N filas: cada compra
+    descuenta de una fracción al azar y compradores simultáneos no esperan
+    el mismo bloqueo. Si existen fracciones, su suma es el stock real y
+    ``Product.stock`` es el valor consolidado (ver consolidate_stock_shards).
+    """
+    product = models.ForeignKey(Product, related_name='stock_shards', on_delete=models.CASCADE)
+    shard = models.PositiveSmallIntegerField()
+    quantity = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['product', 'shard'], name='stockshard_product_shard_uniq'),
+        ]
+
+    def __str__(self):
+        return f"Producto {self.product_id} fracción {self.shard}: {self.quantity}"
+
+
+# Modelo 3: Pronóstico de demanda y punto de reorden de un producto
+class ProductDemandForecast(models.Model):
+    """
+    Demanda diaria suavizada (EWMA) y su desviación, calculadas por
+    ``forecast_demand`` con las ventas hasta ``through_day`` inclusive. La
+    alerta de stock bajo usa ``reorder_point`` en lugar del umbral fijo.
+    """
+    product = models.OneToOneField(
+        Product, related_name='demand_forecast', on_delete=models.CASCADE, primary_key=True
+    )
+    daily_rate = models.FloatField(default=0)
+    daily_std = models.FloatField(default=0)
+    safety_stock = models.PositiveIntegerField(default=0)
+    reorder_point = models.PositiveIntegerField(default=0)
+    # Días que alcanza el stock al momento del cálculo (None si no se vende)
+    days_of_cover = models.FloatField(null=True, blank=True)
+    through_day = models.DateField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def weekly_rate(self):
+        return self.daily_rate * 7
+
+    def cover_for(self, stock):
+        """ Días que alcanza ``stock`` al ritmo actual (None si no se vende). """
+        return stock / self.daily_rate if self.daily_rate > 0 else None
+
+    def __str__(self):
+        return f"Producto {self.product_id}: {self.daily_rate:.2f}/día, reorden en {self.reorder_point}"
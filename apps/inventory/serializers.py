@@ -0,0 +1,30 @@
+from rest_framework import serializers
+
+from .models import StockMovement
+
+
+class StockMovementSerializer(serializers.ModelSerializer):
+    """ Fila del libro de movimientos """
+    product_name = serializers.CharField(source='product.name', read_only=True)
+    user_email = serializers.EmailField(source='user.email', read_only=True, default=None)
+
+    class Meta:
+        model = StockMovement
+        fields = ['id', 'product', 'product_name', 'kind', 'quantity', 'sale', 'user_email', 'note', 'created_at']
+
+
+class RestockSerializer(serializers.Serializer):
+    """ Entrada de mercadería """
+    quantity = serializers.IntegerField(min_value=1)
+    note = serializers.CharField(max_length=255, required=False, allow_blank=True, default='')
+
+
+class AdjustmentSerializer(serializers.Serializer):
+    """ Ajuste manual: cantidad con signo (negativa = merma / faltante) """
+    quantity = serializers.IntegerField()
+    note = serializers.CharField(max_length=255)
+
+    def validate_quantity(self, value):
+        if value == 0:
+            raise serializers.ValidationError("El ajuste no puede ser 0.")
+        return value
@@ -0,0 +1,199 @@
+# apps/inventory/services.py
+"""
+Movimientos de stock. Todo cambio de stock pasa por aquí y deja su fila en
+``StockMovement``.
+
+Los descuentos son un UPDATE condicional (``stock >= cantidad``) con
+``F()``: no hay lectura previa ni se reescribe el resto de columnas de
+Product, y el bloqueo de la fila dura solo lo que resta la transacción.
+Para productos con ``StockShard`` el descuento va a una fracción al azar.
+"""
+import random
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+
+from apps.products.models import Product
+from .models import ProductDemandForecast, StockMovement, StockShard
+
+LOW_STOCK_THRESHOLD = 10
+
+
+class OutOfStock(Exception):
+    pass
+
+
+def shard_counts(product_ids):
+    """ {product_id: número de fracciones} de los productos fraccionados. """
+    return dict(
+        StockShard.objects.filter(product_id__in=product_ids)
+        .values('product_id').annotate(n=Count('id')).values_list('product_id', 'n')
+    )
+
+
+def _take_from_product(product_id, quantity):
+    return Product.objects.filter(pk=product_id, stock__gte=quantity).update(stock=F('stock') - quantity) == 1
+
+
+def _take_from_shards(product_id, quantity, shard_total):
+    # Primero una sola fracción, empezando por una al azar
+    start = random.randrange(shard_total)
+    for offset in range(shard_total):
+        updated = StockShard.objects.filter(
+            product_id=product_id, shard=(start + offset) % shard_total, quantity__gte=quantity,
+        ).update(quantity=F('quantity') - quantity)
+        if updated:
+            return True
+
+    # Ninguna fracción alcanza sola: se bloquean todas y se reparte el descuento
+    shards = list(StockShard.objects.select_for_update().filter(product_id=product_id).order_by('shard'))
+    if sum(shard.quantity for shard in shards) < quantity:
+        return False
+    remaining = quantity
+    for shard in shards:
+        take = min(shard.quantity, remaining)
+        if take:
+            StockShard.objects.filter(pk=shard.pk).update(quantity=F('quantity') - take)
+            remaining -= take
+        if not remaining:
+            break
+    return True
+
+
+def record_sale(sale, lines):
+    """
+    Descuenta el stock de una venta y registra sus movimientos. ``lines``:
+    pares (product_id, cantidad). Debe llamarse dentro de la transacción que
+    crea la venta; lanza ``OutOfStock`` si algún producto no alcanza.
+    """
+    lines = sorted(lines)  # orden fijo de bloqueo entre webhooks simultáneos
+    shards = shard_counts([product_id for product_id, _ in lines])
+    # Los movimientos van antes que los descuentos: el bloqueo de las filas de
+    # stock dura solo los UPDATE y el commit (si falta stock, todo se revierte)
+    StockMovement.objects.bulk_create([
+        StockMovement(product_id=product_id, kind=StockMovement.Kind.SALE, quantity=-quantity, sale=sale)
+        for product_id, quantity in lines
+    ])
+    for product_id, quantity in lines:
+        if product_id in shards:
+            taken = _take_from_shards(product_id, quantity, shards[product_id])
+        else:
+            taken = _take_from_product(product_id, quantity)
+        if not taken:
+            raise OutOfStock(product_id)
+
+
+def restock(product, quantity, user=None, note=''):
+    """ Entrada de mercadería. En productos fraccionados se reparte entre las fracciones. """
+    return _apply(product, quantity, StockMovement.Kind.RESTOCK, user, note)
+
+
+def adjust(product, delta, user=None, note=''):
+    """ Corrección manual (inventario físico, merma). Lanza ``OutOfStock`` si deja stock negativo. """
+    return _apply(product, delta, StockMovement.Kind.ADJUSTMENT, user, note)
+
+
+def _apply(product, delta, kind, user, note):
+    with transaction.atomic():
+        shard_total = shard_counts([product.pk]).get(product.pk)
+        if delta >= 0:
+            if shard_total:
+                _spread_over_shards(product.pk, delta, shard_total)
+            # En fraccionados Product.stock es el valor mostrado: se mantiene al día
+            Product.objects.filter(pk=product.pk).update(stock=F('stock') + delta)
+        elif shard_total:
+            if not _take_from_shards(product.pk, -delta, shard_total):
+                raise OutOfStock(product.pk)
+            Product.objects.filter(pk=product.pk, stock__gte=-delta).update(stock=F('stock') + delta)
+        elif not _take_from_product(product.pk, -delta):
+            raise OutOfStock(product.pk)
+
+        return StockMovement.objects.create(product=product, kind=kind, quantity=delta, user=user, note=note)
+
+
+def _spread_over_shards(product_id, quantity, shard_total):
+    base, extra = divmod(quantity, shard_total)
+    for shard in range(shard_total):
+        amount = base + (1 if shard < extra else 0)
+        if amount:
+            StockShard.objects.filter(product_id=product_id, shard=shard).update(quantity=F('quantity') + amount)
+
+
+def sharded_stock(product_ids=None):
+    """ {product_id: suma de las fracciones} de los productos fraccionados
+    (de todos si ``product_ids`` es None). """
+    shards = StockShard.objects.all()
+    if product_ids is not None:
+        shards = shards.filter(product_id__in=product_ids)
+    return dict(shards.values('product_id').annotate(total=Sum('quantity')).values_list('product_id', 'total'))
+
+
+def available_stock(product_ids=None):
+    """ {product_id: stock disponible}; en fraccionados, la suma de las fracciones. """
+    products = Product.objects.all()
+    if product_ids is not None:
+        products = products.filter(pk__in=product_ids)
+    stock = dict(products.values_list('pk', 'stock'))
+    stock.update(sharded_stock(product_ids))
+    return stock
+
+
+def low_stock_products(product_ids, threshold=LOW_STOCK_THRESHOLD):
+    """
+    Productos con stock disponible <= su punto de reorden
+    (``ProductDemandForecast``) o, si aún no tienen pronóstico, <=
+    ``threshold``. Vienen con ``stock`` actualizado y ``forecast`` (o None).
+    """
+    stock = available_stock(product_ids)
+    forecasts = ProductDemandForecast.objects.in_bulk(list(stock))
+    low = [
+        product_id for product_id, quantity in stock.items()
+        if quantity <= (forecasts[product_id].reorder_point if product_id in forecasts else threshold)
+    ]
+    products = list(Product.objects.filter(pk__in=low))
+    for product in products:
+        product.stock = stock[product.pk]
+        product.forecast = forecasts.get(product.pk)
+    return products
+
+
+# --- Fraccionamiento de productos calientes ---
+
+def enable_sharding(product, shard_total):
+    """ Reparte ``Product.stock`` en ``shard_total`` fracciones. """
+    with transaction.atomic():
+        product = Product.objects.select_for_update().get(pk=product.pk)
+        StockShard.objects.filter(product=product).delete()
+        base, extra = divmod(product.stock, shard_total)
+        StockShard.objects.bulk_create([
+            StockShard(product=product, shard=shard, quantity=base + (1 if shard < extra else 0))
+            for shard in range(shard_total)
+        ])
+    return product
+
+
+def disable_sharding(product):
+    """ Devuelve el stock de las fracciones a ``Product.stock``. """
+    with transaction.atomic():
+        consolidate(product.pk, rebalance=False)
+        StockShard.objects.filter(product_id=product.pk).delete()
+
+
+def consolidate(product_id, rebalance=True):
+    """
+    Escribe la suma de las fracciones en ``Product.stock`` y, con
+    ``rebalance``, las vuelve a repartir en partes iguales para que ninguna
+    quede vacía mientras otras tienen stock. Devuelve el total.
+    """
+    with transaction.atomic():
+        shards = list(StockShard.objects.select_for_update().filter(product_id=product_id).order_by('shard'))
+        if not shards:
+            return None
+        total = sum(shard.quantity for shard in shards)
+        if rebalance:
+            base, extra = divmod(total, len(shards))
+            for index, shard in enumerate(shards):
+                shard.quantity = base + (1 if index < extra else 0)
+            StockShard.objects.bulk_update(shards, ['quantity'])
+        Product.objects.filter(pk=product_id).update(stock=total)
+    return total
@@ -0,0 +1,14 @@
+# apps/inventory/urls.py
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    # Entradas y ajustes (quedan en el libro de movimientos)
+    path('products/<int:pk>/restock/', views.RestockView.as_view(), name='inventory-restock'),
+    path('products/<int:pk>/adjust/', views.AdjustmentView.as_view(), name='inventory-adjust'),
+
+    # Libro de movimientos y reportes que salen de él
+    path('movements/', views.StockMovementListView.as_view(), name='inventory-movements'),
+    path('reports/restock/', views.RestockReportView.as_view(), name='inventory-restock-report'),
+    path('reports/audit/', views.StockAuditView.as_view(), name='inventory-audit'),
+]
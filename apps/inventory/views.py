@@ -0,0 +1,160 @@
+from datetime import date, timedelta
+
+from django.db.models import Count, Max, Q, Sum
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import generics, status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.products.models import Product
+from core.db_router import ReplicaReadMixin
+from .filters import StockMovementFilter, movement_period
+from .models import StockMovement
+from .serializers import AdjustmentSerializer, RestockSerializer, StockMovementSerializer
+from .services import OutOfStock, adjust, available_stock, restock
+
+Kind = StockMovement.Kind
+
+
+def _period(request, default_days=None):
+    """ fecha_inicio / fecha_fin (YYYY-MM-DD) de la query string. """
+    params = {}
+    for name in ('fecha_inicio', 'fecha_fin'):
+        value = request.query_params.get(name)
+        if value:
+            try:
+                params[name] = date.fromisoformat(value)
+            except ValueError:
+                return None
+    if default_days and 'fecha_inicio' not in params:
+        params['fecha_inicio'] = timezone.localdate() - timedelta(days=default_days)
+    return params
+
+
+class RestockView(APIView):
+    """ (Solo Admin) Registra una entrada de mercadería de un producto. """
+    permission_classes = [IsAdminUser]
+
+    def post(self, request, pk):
+        product = get_object_or_404(Product, pk=pk)
+        serializer = RestockSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        movement = restock(product, serializer.validated_data['quantity'],
+                           user=request.user, note=serializer.validated_data['note'])
+        return Response(StockMovementSerializer(movement).data, status=status.HTTP_201_CREATED)
+
+
+class AdjustmentView(APIView):
+    """ (Solo Admin) Ajuste manual de stock (inventario físico, merma). """
+    permission_classes = [IsAdminUser]
+
+    def post(self, request, pk):
+        product = get_object_or_404(Product, pk=pk)
+        serializer = AdjustmentSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            movement = adjust(product, serializer.validated_data['quantity'],
+                              user=request.user, note=serializer.validated_data['note'])
+        except OutOfStock:
+            return Response({"error": f"El ajuste deja stock negativo para {product.name}"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        return Response(StockMovementSerializer(movement).data, status=status.HTTP_201_CREATED)
+
+
+class StockMovementListView(ReplicaReadMixin, generics.ListAPIView):
+    """ (Solo Admin) Libro de movimientos, del más reciente al más antiguo. """
+    permission_classes = [IsAdminUser]
+    serializer_class = StockMovementSerializer
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = StockMovementFilter
+    queryset = StockMovement.objects.select_related('product', 'user').order_by('-created_at', '-id')
+
+
+class RestockReportView(ReplicaReadMixin, APIView):
+    """
+    (Solo Admin) Por producto, en el periodo (por defecto últimos 30 días):
+    unidades repuestas, vendidas y ajustadas según el libro, y stock actual.
+    Ordenado por unidades vendidas.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        period = _period(request, default_days=30)
+        if period is None:
+            return Response({"error": "Formato de fecha inválido (YYYY-MM-DD)."}, status=status.HTTP_400_BAD_REQUEST)
+
+        rows = list(
+            movement_period(StockMovement.objects.all(), **period)
+            .values('product_id', 'product__name')
+            .annotate(
+                restocked=Sum('quantity', filter=Q(kind=Kind.RESTOCK), default=0),
+                restocks=Count('id', filter=Q(kind=Kind.RESTOCK)),
+                last_restock_at=Max('created_at', filter=Q(kind=Kind.RESTOCK)),
+                sold=-Sum('quantity', filter=Q(kind=Kind.SALE), default=0),
+                adjusted=Sum('quantity', filter=Q(kind=Kind.ADJUSTMENT), default=0),
+            )
+            .order_by('-sold', 'product_id')
+        )
+        stock = available_stock([row['product_id'] for row in rows])
+        for row in rows:
+            row['product_name'] = row.pop('product__name')
+            row['stock'] = stock.get(row['product_id'], 0)
+
+        return Response({
+            'fecha_inicio': period.get('fecha_inicio'),
+            'fecha_fin': period.get('fecha_fin'),
+            'products': rows,
+        })
+
+
+class StockAuditView(ReplicaReadMixin, APIView):
+    """
+    (Solo Admin) Conciliación del libro contra el stock: para cada producto
+    (o ``?product=<id>``), el saldo del libro (suma de todos sus movimientos)
+    frente al stock disponible. ``unrecorded`` distinto de 0 indica stock
+    cargado o editado sin pasar por el libro (p. ej. edición directa del
+    producto).
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        movements = StockMovement.objects.all()
+        product_id = request.query_params.get('product')
+        if product_id:
+            if not product_id.isdigit():
+                return Response({"error": "product debe ser un id."}, status=status.HTTP_400_BAD_REQUEST)
+            movements = movements.filter(product_id=product_id)
+
+        ledger = {
+            row['product_id']: row
+            for row in movements.values('product_id').annotate(
+                balance=Sum('quantity'),
+                movements=Count('id'),
+                last_movement_at=Max('created_at'),
+            )
+        }
+        products = Product.objects.order_by('id').values_list('id', 'name')
+        if product_id:
+            products = products.filter(pk=product_id)
+        products = list(products)
+        stock = available_stock([int(product_id)] if product_id else None)
+
+        rows = []
+        for pk, name in products:
+            entry = ledger.get(pk, {})
+            balance = entry.get('balance') or 0
+            rows.append({
+                'product_id': pk,
+                'product_name': name,
+                'stock': stock.get(pk, 0),
+                'ledger_balance': balance,
+                'unrecorded': stock.get(pk, 0) - balance,
+                'movements': entry.get('movements', 0),
+                'last_movement_at': entry.get('last_movement_at'),
+            })
+        if request.query_params.get('only_mismatches') in ('1', 'true', 'True'):
+            rows = [row for row in rows if row['unrecorded']]
+        return Response({'products': rows})
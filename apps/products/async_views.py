@@ -0,0 +1,57 @@
+# apps/products/async_views.py
+import logging
+
+import httpx
+from asgiref.sync import sync_to_async
+
+from apps.users.permissions import IsEmployeeOrReadOnly
+from core.async_views import AsyncAPIView, json_response
+from .models import Product
+from .serializers import ProductSerializer
+from .storage import upload_product_image_async
+
+logger = logging.getLogger(__name__)
+
+
+class ProductAsyncMixin:
+    """ Valida con ProductSerializer, sube la imagen en async y guarda. """
+    permission_classes = [IsEmployeeOrReadOnly]
+
+    async def save_product(self, serializer, success_status):
+        if not await sync_to_async(serializer.is_valid)():
+            return json_response(serializer.errors, status=400)
+
+        extra = {}
+        image_file = serializer.validated_data.pop('image_upload', None)
+        if image_file:
+            try:
+                extra['image_url'] = await upload_product_image_async(image_file)
+            except httpx.HTTPError as e:
+                logger.exception("Error al subir a Supabase")
+                return json_response([f"Error al subir imagen: {e}"], status=400)
+
+        await sync_to_async(serializer.save)(**extra)
+        data = await sync_to_async(lambda: serializer.data)()
+        return json_response(data, status=success_status)
+
+
+class ProductAsyncCreateView(ProductAsyncMixin, AsyncAPIView):
+    async def post(self, request):
+        serializer = ProductSerializer(data=request.data, context={'request': request})
+        return await self.save_product(serializer, success_status=201)
+
+
+class ProductAsyncUpdateView(ProductAsyncMixin, AsyncAPIView):
+    async def put(self, request, pk):
+        return await self._update(request, pk, partial=False)
+
+    async def patch(self, request, pk):
+        return await self._update(request, pk, partial=True)
+
+    async def _update(self, request, pk, partial):
+        try:
+            product = await Product.objects.aget(pk=pk)
+        except Product.DoesNotExist:
+            return json_response({'detail': "No encontrado."}, status=404)
+        serializer = ProductSerializer(product, data=request.data, partial=partial, context={'request': request})
+        return await self.save_product(serializer, success_status=200)
@@ -1,9 +1,12 @@
 # apps/products/serializers.py
+import logging
 from rest_framework import serializers
 from .models import Category, WarrantyProvider, Warranty, Product, Brand
-from config.supabase_client import supabase
+from config.supabase_client import get_supabase
 import uuid
 
+logger = logging.getLogger(__name__)
+
 class RecursiveCategorySerializer(serializers.Serializer):
     def to_representation(self, value):
         serializer = CategorySerializer(value, context=self.context)
@@ -102,18 +105,18 @@ class ProductSerializer(serializers.ModelSerializer):
         
         try:
             # Sube el archivo
-            supabase.storage.from_(bucket_name).upload(
+            get_supabase().storage.from_(bucket_name).upload(
                 path=file_path,
                 file=file.read(), # Lee el contenido del archivo
                 file_options={"content-type": file.content_type}
             )
             
             # Obtiene la URL pública
-            public_url = supabase.storage.from_(bucket_name).get_public_url(file_path)
+            public_url = get_supabase().storage.from_(bucket_name).get_public_url(file_path)
             return public_url
         
         except Exception as e:
-            print(f"Error al subir a Supabase: {e}")
+            logger.exception("Error al subir a Supabase")
             # Devuelve un error claro al frontend
             raise serializers.ValidationError(f"Error al subir imagen: {e}")
 
@@ -0,0 +1,47 @@
+# apps/products/storage.py
+"""
+Subida de imágenes de productos a Supabase Storage por su API REST con el
+cliente httpx compartido (versión async de
+``ProductSerializer._upload_image_to_supabase``).
+
+El archivo se envía por partes de ``CHUNK_SIZE``; cada lectura corre en un
+hilo (``sync_to_async``), así un upload grande guardado en disco no frena el
+event loop.
+"""
+import uuid
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from core.http import get_async_client
+
+CHUNK_SIZE = 256 * 1024
+
+
+async def _read_chunks(file):
+    read = sync_to_async(file.read, thread_sensitive=False)
+    while chunk := await read(CHUNK_SIZE):
+        yield chunk
+
+
+async def upload_product_image_async(file):
+    base_url = settings.SUPABASE_URL.rstrip('/')
+    bucket_name = settings.SUPABASE_PRODUCT_BUCKET
+    file_ext = file.name.split('.')[-1]
+    file_path = f"products/{uuid.uuid4()}.{file_ext}"
+
+    headers = {
+        "Authorization": f"Bearer {settings.SUPABASE_KEY}",
+        "apikey": settings.SUPABASE_KEY,
+        "Content-Type": file.content_type or "application/octet-stream",
+    }
+    if file.size is not None:
+        # Con el largo conocido no hace falta Transfer-Encoding: chunked
+        headers["Content-Length"] = str(file.size)
+    response = await get_async_client().post(
+        f"{base_url}/storage/v1/object/{bucket_name}/{file_path}",
+        content=_read_chunks(file),
+        headers=headers,
+    )
+    response.raise_for_status()
+    return f"{base_url}/storage/v1/object/public/{bucket_name}/{file_path}"
@@ -1,6 +1,6 @@
 # apps/products/urls.py
 from django.urls import path
-from . import views
+from . import views, async_views
 
 urlpatterns = [
     # --- Rutas de Productos ---
@@ -20,6 +20,9 @@ urlpatterns = [
          }), 
          name='product-detail'),
 
+    # "Comprados juntos" (apps/analytics/recommendations.py)
+    path('products/<int:pk>/related/', views.ProductRelatedView.as_view(), name='product-related'),
+
     # --- Rutas de Categorías ---
     path('categories/', 
          views.CategoryViewSet.as_view({
@@ -74,4 +77,8 @@ urlpatterns = [
 
     path('brands/', views.BrandListCreateView.as_view(), name='brand-list-create'),
     path('brands/<int:pk>/', views.BrandRetrieveUpdateDestroyView.as_view(), name='brand-detail'),
+
+    # --- Versiones async de alta/edición de productos (servir con uvicorn / ASGI) ---
+    path('async/products/', async_views.ProductAsyncCreateView.as_view(), name='product-create-async'),
+    path('async/products/<int:pk>/', async_views.ProductAsyncUpdateView.as_view(), name='product-update-async'),
 ]
\ No newline at end of file
@@ -1,6 +1,9 @@
 # apps/products/views.py
 from rest_framework import viewsets
 from rest_framework import generics
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from django.shortcuts import get_object_or_404
 from .models import Category, WarrantyProvider, Warranty, Product
 from .serializers import (
     CategorySerializer, WarrantyProviderSerializer, 
@@ -9,10 +12,15 @@ from .serializers import (
 from apps.users.permissions import IsEmployeeOrReadOnly # <-- IMPORTAMOS EL PERMISO
 from .models import Brand
 from apps.products.serializers import BrandSerializer
+from core.db_router import ReplicaReadMixin
+from core.lazy import lazy_module
+
+# numpy/scipy se importan con la primera consulta de relacionados
+recommendations = lazy_module('apps.analytics.recommendations')
 
 # --- Vistas para el Catálogo de Productos ---
 
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     """
     Endpoint para Categorías (CRUD).
     - LECTURA: Todos
@@ -42,10 +50,10 @@ class WarrantyViewSet(viewsets.ModelViewSet):
     serializer_class = WarrantySerializer
     permission_classes = [IsEmployeeOrReadOnly] # <-- APLICADO
 
-class ProductViewSet(viewsets.ModelViewSet):
+class ProductViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     """
     Endpoint para Productos (CRUD).
-    - LECTURA: Todos (con filtrado)
+    - LECTURA: Todos (con filtrado), desde la réplica si existe
     - ESCRITURA: Solo Empleados
     """
     queryset = Product.objects.all()
@@ -60,6 +68,34 @@ class ProductViewSet(viewsets.ModelViewSet):
         'price': ['gte', 'lte'], # Filtra por precio (ej. price__gte=100)
     }
 
+class ProductRelatedView(ReplicaReadMixin, APIView):
+    """
+    "Comprados juntos" de un producto (lectura: todos). Sale de la última
+    versión publicada por ``mine_recommendations``, en memoria del proceso.
+    ``?limit=`` (por defecto todos los guardados, hasta 10).
+    """
+    permission_classes = [IsEmployeeOrReadOnly]
+    fields = ('id', 'name', 'price', 'image_url', 'stock')
+
+    def get(self, request, pk):
+        get_object_or_404(Product.objects.only('id'), pk=pk)
+        limit = request.query_params.get('limit', '')
+        related_ids, scores = recommendations.related_cache.related(pk)
+        if limit.isdigit():
+            related_ids, scores = related_ids[:int(limit)], scores[:int(limit)]
+
+        products = Product.objects.filter(pk__in=related_ids).in_bulk(field_name='pk') if related_ids else {}
+        results = [
+            {**{field: getattr(products[product_id], field) for field in self.fields}, 'score': score}
+            for product_id, score in zip(related_ids, scores)
+            if product_id in products  # productos borrados desde el último minado
+        ]
+        return Response({
+            'product_id': pk,
+            'model_version': recommendations.related_cache.version,
+            'results': results,
+        })
+
 class BrandListCreateView(generics.ListCreateAPIView):
     """ Listar todas las marcas (ReadOnly para todos) o crear una nueva (solo Employee). """
     queryset = Brand.objects.all()
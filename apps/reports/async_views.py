@@ -0,0 +1,60 @@
+# apps/reports/async_views.py
+import logging
+
+from asgiref.sync import sync_to_async
+from rest_framework.permissions import IsAdminUser
+
+from apps.sales.filters import SaleFilter
+from apps.sales.models import Sale
+from core.async_views import AsyncAPIView, json_response
+from core.db_router import read_from_replica
+from core.lazy import lazy_module
+from .parser import parse_prompt_to_filters_async
+
+# reportlab/xhtml2pdf se importan con el primer reporte, no al cargar las URLs
+services = lazy_module('apps.reports.services')
+
+logger = logging.getLogger(__name__)
+
+REPORT_GENERATORS = {
+    'pdf': 'generate_sales_pdf',
+    'csv': 'generate_sales_csv',
+    'excel': 'generate_sales_excel',
+}
+
+
+def _build_report(report_type, params):
+    """ Parte síncrona: filtrar y generar el archivo (desde la réplica si existe). """
+    with read_from_replica():
+        filterset = SaleFilter(params, queryset=Sale.objects.all().order_by('-created_at'))
+        if not filterset.is_valid():
+            return json_response(filterset.errors, status=400)
+        return getattr(services, REPORT_GENERATORS[report_type])(filterset.qs)
+
+
+class DynamicReportAsyncView(AsyncAPIView):
+    """
+    Versión async de DynamicReportView: mientras se espera a Gemini el
+    worker sigue atendiendo otras peticiones.
+    """
+    permission_classes = [IsAdminUser]
+
+    async def post(self, request):
+        prompt_text = request.data.get('prompt', None)
+        if not prompt_text:
+            return json_response({"error": "No se proporcionó un 'prompt'."}, status=400)
+
+        try:
+            params = await parse_prompt_to_filters_async(prompt_text)
+        except Exception as e:
+            logger.exception("Error parseando prompt")
+            return json_response({"error": f"Error crítico al interpretar el prompt: {e}"}, status=500)
+
+        if "error" in params:
+            return json_response({"error": f"Error al interpretar el prompt (IA): {params['error']}"}, status=500)
+
+        report_type = params.pop('report_type', 'pdf')
+        if report_type not in REPORT_GENERATORS:
+            return json_response({"error": f"Formato '{report_type}' no soportado."}, status=400)
+
+        return await sync_to_async(_build_report)(report_type, params)
@@ -5,25 +5,35 @@ import re
 import json
 import logging
 from datetime import datetime
+from functools import lru_cache
 from django.conf import settings
-import google.generativeai as genai
+from core.http import get_async_client
 
 # Configura el logger
 logger = logging.getLogger(__name__)
 
-# Configura la API de Gemini
-try:
-    GOOGLE_API_KEY = os.getenv('GEMINI_API_KEY')
+# Clave de la API de Gemini (la configuración del SDK y el aviso si falta se
+# hacen en el primer uso, no al importar)
+GOOGLE_API_KEY = os.getenv('GEMINI_API_KEY') or getattr(settings, "GEMINI_API_KEY", None)
+
+
+@lru_cache(maxsize=None)
+def configure_gemini():
+    """
+    Importa y configura el SDK de Gemini una vez por proceso (o en el
+    warm-up del master); su import tarda ~1 s y no debe pagarse al cargar
+    las URLs. Devuelve el módulo ``google.generativeai``.
+    """
+    import google.generativeai as genai
+
     if not GOOGLE_API_KEY:
-        GOOGLE_API_KEY = getattr(settings, "GEMINI_API_KEY", None)
-        
-    if GOOGLE_API_KEY:
+        logger.warning("No se encontró la GEMINI_API_KEY en el entorno.")
+        return genai
+    try:
         genai.configure(api_key=GOOGLE_API_KEY)
-    else:
-        logger.error("No se encontró la GEMINI_API_KEY en el entorno.")
-        
-except Exception as e:
-    logger.error(f"Error al configurar la API de Gemini: {e}")
+    except Exception:
+        logger.exception("Error al configurar la API de Gemini")
+    return genai
 
 # --- PROMPT MAESTRO (Sin cambios) ---
 PROMPT_MAESTRO = """
@@ -92,6 +102,26 @@ Respuesta:
 }
 """
 
+def build_full_prompt(prompt_text: str) -> str:
+    prompt_con_contexto = PROMPT_MAESTRO.replace(
+        "asume el año actual",
+        f"asume el año actual ({datetime.now().year})"
+    )
+    return f"{prompt_con_contexto}\n\nPrompt: \"{prompt_text}\"\nRespuesta:\n"
+
+
+def parse_llm_response(text: str) -> dict:
+    """ Extrae el JSON de la respuesta (con o sin bloque ```json). """
+    json_text = re.search(r'```(json)?(.*)```', text, re.DOTALL)
+    if json_text:
+        cleaned_response = json_text.group(2).strip()
+    else:
+        cleaned_response = text.strip()
+
+    logger.debug("Respuesta JSON del LLM: %s", cleaned_response)
+    return json.loads(cleaned_response)
+
+
 def parse_prompt_to_filters(prompt_text: str) -> dict:
     """
     Toma un prompt de lenguaje natural y usa un LLM (Gemini)
@@ -100,35 +130,34 @@ def parse_prompt_to_filters(prompt_text: str) -> dict:
     if not GOOGLE_API_KEY:
         raise ValueError("GEMINI_API_KEY no está configurada.")
     
+    genai = configure_gemini()
     try:
-        # --- (INICIO DE LA CORRECCIÓN) ---
-        
         # 1. Usamos el modelo estándar con su RUTA COMPLETA
-        model = genai.GenerativeModel('gemini-2.5-flash')
-        
-        # --- (FIN DE LA CORRECCIÓN) ---
-        
-        prompt_con_contexto = PROMPT_MAESTRO.replace(
-            "asume el año actual",
-            f"asume el año actual ({datetime.now().year})"
-        )
-        
-        full_prompt = f"{prompt_con_contexto}\n\nPrompt: \"{prompt_text}\"\nRespuesta:\n"
-        
-        response = model.generate_content(full_prompt)
-        
-        json_text = re.search(r'```(json)?(.*)```', response.text, re.DOTALL)
-        if json_text:
-            cleaned_response = json_text.group(2).strip()
-        else:
-            cleaned_response = response.text.strip()
-            
-        logger.warning(f"Respuesta JSON del LLM: {cleaned_response}")
-        
-        params = json.loads(cleaned_response)
-        
-        return params
+        model = genai.GenerativeModel(settings.GEMINI_MODEL)
+        response = model.generate_content(build_full_prompt(prompt_text))
+        return parse_llm_response(response.text)
+
+    except Exception as e:
+        logger.exception("Error en la API de Gemini o parseando JSON")
+        return {"error": str(e)}
+
+
+async def parse_prompt_to_filters_async(prompt_text: str) -> dict:
+    """
+    Igual que ``parse_prompt_to_filters`` pero llamando a la API REST de
+    Gemini con el cliente httpx compartido (no bloquea el event loop).
+    """
+    if not GOOGLE_API_KEY:
+        raise ValueError("GEMINI_API_KEY no está configurada.")
+
+    url = f"{settings.GEMINI_API_BASE.rstrip('/')}/v1beta/models/{settings.GEMINI_MODEL}:generateContent"
+    body = {"contents": [{"parts": [{"text": build_full_prompt(prompt_text)}]}]}
+    try:
+        response = await get_async_client().post(url, json=body, headers={"x-goog-api-key": GOOGLE_API_KEY})
+        response.raise_for_status()
+        parts = response.json()["candidates"][0]["content"]["parts"]
+        return parse_llm_response("".join(part.get("text", "") for part in parts))
 
     except Exception as e:
-        logger.error(f"Error en la API de Gemini o parseando JSON: {e}")
-        return {"error": str(e)}
\ No newline at end of file
+        logger.exception("Error en la API de Gemini o parseando JSON")
+        return {"error": str(e)}
@@ -1,6 +1,7 @@
 import logging
 import csv
 import io
+from functools import lru_cache
 from django.http import HttpResponse
 from django.utils import timezone
 from .utils import format_sale_details_for_csv
@@ -18,82 +19,87 @@ logger = logging.getLogger(__name__)
 
 
 # --- ESTILOS MODERNOS PARA EL PDF ---
-styles = getSampleStyleSheet()
-
-# Estilo de título principal moderno
-try:
-    styles.add(ParagraphStyle(
-        name='ModernTitle',
-        fontName='Helvetica-Bold',
-        fontSize=28,
-        alignment=TA_CENTER,
-        textColor=colors.HexColor('#1a237e'),  # Azul índigo oscuro
-        spaceAfter=20,
-        spaceBefore=10
-    ))
-    
-    styles.add(ParagraphStyle(
-        name='Subtitle',
-        fontName='Helvetica',
-        fontSize=12,
-        alignment=TA_CENTER,
-        textColor=colors.HexColor('#666666'),
-        spaceAfter=30
-    ))
-    
-    styles.add(ParagraphStyle(
-        name='SectionHeader',
-        fontName='Helvetica-Bold',
-        fontSize=14,
-        textColor=colors.HexColor('#1a237e'),
-        spaceAfter=12,
-        spaceBefore=20,
-        borderWidth=0,
-        borderColor=colors.HexColor('#1a237e'),
-        borderPadding=5
-    ))
-    
-    styles.add(ParagraphStyle(
-        name='TableHeader',
-        fontName='Helvetica-Bold',
-        fontSize=9,
-        textColor=colors.white,
-        alignment=TA_CENTER
-    ))
-    
-    styles.add(ParagraphStyle(
-        name='TableCell',
-        fontName='Helvetica',
-        fontSize=8,
-        textColor=colors.HexColor('#333333')
-    ))
-    
-    styles.add(ParagraphStyle(
-        name='TableCellSmall',
-        fontName='Helvetica',
-        fontSize=7,
-        textColor=colors.HexColor('#555555'),
-        leftIndent=5
-    ))
-    
-    styles.add(ParagraphStyle(
-        name='InfoBox',
-        fontName='Helvetica',
-        fontSize=10,
-        textColor=colors.HexColor('#444444'),
-        spaceAfter=8
-    ))
-    
-    styles.add(ParagraphStyle(
-        name='Footer',
-        fontName='Helvetica-Oblique',
-        fontSize=8,
-        textColor=colors.HexColor('#999999'),
-        alignment=TA_CENTER
-    ))
-    
-except KeyError:
-    pass
+@lru_cache(maxsize=None)
+def get_styles():
+    """ Hoja de estilos del PDF: se arma una vez por proceso (o en el warm-up del master). """
+    styles = getSampleStyleSheet()
+
+    # Estilo de título principal moderno
+    try:
+        styles.add(ParagraphStyle(
+            name='ModernTitle',
+            fontName='Helvetica-Bold',
+            fontSize=28,
+            alignment=TA_CENTER,
+            textColor=colors.HexColor('#1a237e'),  # Azul índigo oscuro
+            spaceAfter=20,
+            spaceBefore=10
+        ))
+
+        styles.add(ParagraphStyle(
+            name='Subtitle',
+            fontName='Helvetica',
+            fontSize=12,
+            alignment=TA_CENTER,
+            textColor=colors.HexColor('#666666'),
+            spaceAfter=30
+        ))
+
+        styles.add(ParagraphStyle(
+            name='SectionHeader',
+            fontName='Helvetica-Bold',
+            fontSize=14,
+            textColor=colors.HexColor('#1a237e'),
+            spaceAfter=12,
+            spaceBefore=20,
+            borderWidth=0,
+            borderColor=colors.HexColor('#1a237e'),
+            borderPadding=5
+        ))
+
+        styles.add(ParagraphStyle(
+            name='TableHeader',
+            fontName='Helvetica-Bold',
+            fontSize=9,
+            textColor=colors.white,
+            alignment=TA_CENTER
+        ))
+
+        styles.add(ParagraphStyle(
+            name='TableCell',
+            fontName='Helvetica',
+            fontSize=8,
+            textColor=colors.HexColor('#333333')
+        ))
+
+        styles.add(ParagraphStyle(
+            name='TableCellSmall',
+            fontName='Helvetica',
+            fontSize=7,
+            textColor=colors.HexColor('#555555'),
+            leftIndent=5
+        ))
+
+        styles.add(ParagraphStyle(
+            name='InfoBox',
+            fontName='Helvetica',
+            fontSize=10,
+            textColor=colors.HexColor('#444444'),
+            spaceAfter=8
+        ))
+
+        styles.add(ParagraphStyle(
+            name='Footer',
+            fontName='Helvetica-Oblique',
+            fontSize=8,
+            textColor=colors.HexColor('#999999'),
+            alignment=TA_CENTER
+        ))
+
+    except KeyError:
+        pass
+    return styles
+
 
 # Colores modernos
 COLOR_PRIMARY = colors.HexColor('#1a237e')      # Azul índigo oscuro
@@ -150,7 +156,8 @@ def generate_sales_pdf(queryset) -> HttpResponse:
     """
     Genera un PDF con diseño moderno y profesional
     """
-    logger.warning("Iniciando generación de PDF moderno...")
+    logger.debug("Iniciando generación de PDF moderno...")
+    styles = get_styles()
     
     buffer = io.BytesIO()
     
@@ -331,9 +338,9 @@ def generate_sales_pdf(queryset) -> HttpResponse:
     # Construir PDF
     try:
         doc.build(elements, onFirstPage=modern_header_footer, onLaterPages=modern_header_footer)
-        logger.warning("PDF moderno generado exitosamente.")
+        logger.debug("PDF moderno generado exitosamente.")
     except Exception as e:
-        logger.error(f"Error al construir PDF moderno: {e}")
+        logger.exception("Error al construir PDF moderno")
         return HttpResponse(f"Error generando PDF: {e}", status=500)
 
     pdf_content = buffer.getvalue()
@@ -348,7 +355,7 @@ def generate_sales_csv(queryset) -> HttpResponse:
     """
     Genera un CSV de ventas (sin cambios)
     """
-    logger.warning("Generando CSV...")
+    logger.debug("Generando CSV...")
     
     response = HttpResponse(content_type='text/csv')
     response['Content-Disposition'] = 'attachment; filename="reporte_ventas_filtrado.csv"'
@@ -356,16 +363,11 @@ def generate_sales_csv(queryset) -> HttpResponse:
     writer = csv.writer(response)
     writer.writerow(['ID_Venta', 'Fecha', 'Cliente', 'Email', 'Monto_Total', 'Estado', 'Detalle_Productos'])
 
-    queryset = queryset.prefetch_related('details__product')
+    # Una sola tabla (más el usuario): el detalle ya viene en line_summary
+    queryset = queryset.select_related('user').prefetch_related(None)
 
-    for sale in queryset:
-        if hasattr(sale, 'details'):
-            try:
-                product_details = format_sale_details_for_csv(sale.details.all())
-            except Exception:
-                product_details = "N/A"
-        else:
-            product_details = "N/A"
+    for sale in queryset.iterator(chunk_size=2000):
+        product_details = sale.line_summary or "N/A"
 
         if hasattr(sale, 'user') and sale.user:
             user_name = f"{sale.user.first_name} {sale.user.last_name}"
@@ -387,7 +389,7 @@ def generate_sales_csv(queryset) -> HttpResponse:
             product_details
         ])
     
-    logger.warning("CSV generado exitosamente.")
+    logger.debug("CSV generado exitosamente.")
     return response
 
 
@@ -395,7 +397,7 @@ def generate_sales_excel(queryset) -> HttpResponse:
     """
     Stub para la generación de Excel
     """
-    logger.warning("Generación de Excel no implementada.")
+    logger.info("Generación de Excel no implementada.")
     return HttpResponse("Formato Excel aún no implementado.", status=501)
 
 
@@ -414,6 +416,6 @@ def render_to_pdf(template_src, context_dict=None):
     result = io.BytesIO()
     pdf = pisa.CreatePDF(src=html, dest=result)
     if pdf.err:
-        logger.error(f"Error en pisa.CreatePDF: {pdf.err}")
+        logger.error("Error en pisa.CreatePDF: %s", pdf.err)
         return None
     return result.getvalue()
\ No newline at end of file
@@ -1,6 +1,7 @@
 # apps/reports/urls.py
 from django.urls import path
 from .views import AdminReportView, SaleReportPDFView, DynamicReportView # Importa las vistas
+from .async_views import DynamicReportAsyncView
 
 urlpatterns = [
     # Endpoint principal para generar el reporte (CSV / PDF via ReportLab)
@@ -8,4 +9,6 @@ urlpatterns = [
     # Endpoint ejemplo que genera un PDF a partir de la plantilla HTML
     path('export/pdf/', SaleReportPDFView.as_view(), name='reports-export-pdf'),
     path('dynamic-report/', DynamicReportView.as_view(), name='dynamic-report'),
+    # Versión async (servir con uvicorn / ASGI)
+    path('async/dynamic-report/', DynamicReportAsyncView.as_view(), name='dynamic-report-async'),
 ]
\ No newline at end of file
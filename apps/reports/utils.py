@@ -1,11 +1,10 @@
 # apps/reports/utils.py
+from apps.sales.models import Sale
 
 def format_sale_details_for_csv(sale_details):
     """
     Toma los detalles de una venta y los concatena en una sola string
     para ser mostrada en la columna 'Detalle_Productos' del CSV.
     """
-    return "; ".join([
-        f"{detail.product.name} ({detail.quantity}x)" 
-        for detail in sale_details
-    ])
\ No newline at end of file
+    # Mismo formato que Sale.line_summary
+    return Sale.summarize_lines((detail.product.name, detail.quantity) for detail in sale_details)[1]
\ No newline at end of file
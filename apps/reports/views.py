@@ -8,34 +8,32 @@ from django.http import HttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
 from django.utils import timezone 
 from .parser import parse_prompt_to_filters
-from .services import generate_sales_pdf, generate_sales_csv, generate_sales_excel, render_to_pdf
 
 # Importaciones de otras apps
 from apps.sales.models import Sale
 from apps.sales.filters import SaleFilter
 from .utils import format_sale_details_for_csv 
+from core.db_router import ReplicaReadMixin
+from core.lazy import lazy_module
+
+# reportlab/xhtml2pdf se importan con el primer reporte, no al cargar las URLs
+services = lazy_module('apps.reports.services')
 
 # Configura el logger
 logger = logging.getLogger(__name__)
 
 
-class AdminReportView(APIView):
+class AdminReportView(ReplicaReadMixin, APIView):
     permission_classes = [IsAdminUser]
 
     def get(self, request):
-        
-        logger.warning("--- ADMIN REPORT VIEW: GET INICIADO ---")
-        
         # Usamos 'report_type' para evitar conflictos con DRF
         report_format = request.query_params.get('report_type', 'csv').lower()
-        
-        logger.warning(f"Query params RECIBIDOS: {request.query_params}")
-        logger.warning(f"Formato detectado: {report_format}")
 
         # Copiamos los params y eliminamos 'report_type'
         filtering_params = request.query_params.copy()
         filtering_params.pop('report_type', None)
-        logger.warning(f"Params para FILTRADO: {filtering_params}")
+        logger.debug("Reporte admin '%s' con filtros %s", report_format, filtering_params)
         
         # Queryset base con prefetch
         queryset = Sale.objects.all().order_by('-created_at').prefetch_related(
@@ -47,32 +45,29 @@ class AdminReportView(APIView):
         filterset = SaleFilter(filtering_params, queryset=queryset)
         
         if not filterset.is_valid():
-            logger.error(f"Filtro inválido: {filterset.errors}")
+            logger.info("Filtro inválido: %s", filterset.errors)
             return Response(filterset.errors, status=400)
 
         filtered_queryset = filterset.qs
         
         # === CAMBIO PRINCIPAL: Usar las funciones de services.py ===
         if report_format == 'csv':
-            logger.warning("Llamando a generate_sales_csv()...")
-            return generate_sales_csv(filtered_queryset)
+            return services.generate_sales_csv(filtered_queryset)
             
         elif report_format == 'pdf':
-            logger.warning("Llamando a generate_sales_pdf() [DISEÑO MODERNO]...")
-            return generate_sales_pdf(filtered_queryset)
+            return services.generate_sales_pdf(filtered_queryset)
             
         elif report_format == 'excel':
-            logger.warning("Llamando a generate_sales_excel()...")
-            return generate_sales_excel(filtered_queryset)
+            return services.generate_sales_excel(filtered_queryset)
             
         else:
-            logger.warning(f"Formato '{report_format}' no soportado.")
+            logger.info("Formato de reporte no soportado: %s", report_format)
             return Response({
                 "error": "Formato no soportado. Usa report_type=csv, report_type=pdf o report_type=excel."
             }, status=400)
 
 
-class SaleReportPDFView(APIView):
+class SaleReportPDFView(ReplicaReadMixin, APIView):
     """
     Vista legacy que usa xhtml2pdf (render_to_pdf)
     """
@@ -82,7 +77,7 @@ class SaleReportPDFView(APIView):
             'current_date': timezone.now(),
             'sales_data': [],
         }
-        pdf_bytes = render_to_pdf('reports/sale_report.html', context)
+        pdf_bytes = services.render_to_pdf('reports/sale_report.html', context)
         if not pdf_bytes:
             return Response({'detail': 'Error generando PDF'}, status=500)
         response = HttpResponse(pdf_bytes, content_type='application/pdf')
@@ -90,24 +85,26 @@ class SaleReportPDFView(APIView):
         return response
 
 
-class DynamicReportView(APIView):
+class DynamicReportView(ReplicaReadMixin, APIView):
     """
     Endpoint para generar reportes dinámicos
     basados en un prompt de texto (o voz convertida a texto).
     """
     permission_classes = [IsAdminUser]
+    # Es POST pero solo lee ventas
+    replica_methods = ('POST',)
 
     def post(self, request):
         prompt_text = request.data.get('prompt', None)
         if not prompt_text:
             return Response({"error": "No se proporcionó un 'prompt'."}, status=400)
             
-        logger.warning(f"Prompt dinámico recibido: {prompt_text}")
+        logger.debug("Prompt dinámico recibido: %s", prompt_text)
 
         # Traducir el prompt a parámetros de filtro
         try:
             params = parse_prompt_to_filters(prompt_text)
-            logger.warning(f"Prompt parseado a params: {params}")
+            logger.debug("Prompt parseado a params: %s", params)
             
             if "error" in params:
                 return Response({
@@ -115,7 +112,7 @@ class DynamicReportView(APIView):
                 }, status=500)
                 
         except Exception as e:
-            logger.error(f"Error parseando prompt: {e}")
+            logger.exception("Error parseando prompt")
             return Response({
                 "error": f"Error crítico al interpretar el prompt: {e}"
             }, status=500)
@@ -134,12 +131,11 @@ class DynamicReportView(APIView):
 
         # Generar el archivo usando las funciones de services.py
         if report_type == 'pdf':
-            logger.warning("Generando PDF dinámico con diseño moderno...")
-            return generate_sales_pdf(filtered_queryset)
+            return services.generate_sales_pdf(filtered_queryset)
         elif report_type == 'csv':
-            return generate_sales_csv(filtered_queryset)
+            return services.generate_sales_csv(filtered_queryset)
         elif report_type == 'excel':
-            return generate_sales_excel(filtered_queryset)
+            return services.generate_sales_excel(filtered_queryset)
         else:
             return Response({
                 "error": f"Formato '{report_type}' no soportado."
@@ -0,0 +1,36 @@
+# apps/sales/async_views.py
+from asgiref.sync import sync_to_async
+from rest_framework.permissions import IsAuthenticated
+
+from apps.products.models import Product
+from core.async_views import AsyncAPIView, json_response
+from .payments import get_gateway
+from .pricing import InsufficientStock, snapshot_cart
+from .serializers import CartItemSerializer
+
+
+class CreatePaymentIntentAsyncView(AsyncAPIView):
+    """
+    Versión async de CreatePaymentIntentView: la llamada a Stripe no ocupa
+    el worker mientras se espera la respuesta.
+    """
+    permission_classes = [IsAuthenticated]
+
+    async def post(self, request):
+        cart_serializer = CartItemSerializer(data=request.data.get('cart', []), many=True)
+        if not cart_serializer.is_valid():
+            return json_response(cart_serializer.errors, status=400)
+
+        try:
+            snapshot = await sync_to_async(snapshot_cart)(request.user, cart_serializer.validated_data)
+        except InsufficientStock as e:
+            return json_response({"error": f"Stock insuficiente para {e}"}, status=400)
+        except Product.DoesNotExist:
+            return json_response({"error": "Uno o más productos no fueron encontrados"}, status=404)
+
+        try:
+            intent = await get_gateway().acreate_payment_intent(snapshot)
+        except Exception as e:
+            return json_response({'error': str(e)}, status=500)
+
+        return json_response({'clientSecret': intent.client_secret})
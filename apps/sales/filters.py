@@ -1,7 +1,64 @@
 import django_filters
-from .models import Sale
-from django_filters import DateFilter
+from datetime import date, datetime, time, timedelta
+from django.conf import settings
+from django.contrib.auth import get_user_model
 from django.db.models import Q
+from django.db.models.query import QuerySet
+from django.utils import timezone
+from apps.products.models import Product
+from .models import Sale, SaleDetail
+from django_filters import DateFilter
+
+User = get_user_model()
+
+# Parámetros de fecha que se combinan en un único rango sobre created_at
+DATE_RANGE_PARAMS = ('month', 'year', 'fecha_inicio', 'fecha_fin')
+
+
+def _start_of_day(day):
+    value = datetime.combine(day, time.min)
+    return timezone.make_aware(value) if settings.USE_TZ else value
+
+
+def created_at_bounds(month=None, year=None, fecha_inicio=None, fecha_fin=None):
+    """
+    Convierte mes/año/fecha_inicio/fecha_fin en un rango semiabierto
+    [inicio, fin) en la zona horaria actual, que sí puede usar el índice de
+    created_at (``created_at__month`` se traduce a EXTRACT y no).
+
+    Devuelve (inicio, fin, mes_sin_año); cualquiera puede ser None. Un mes
+    sin año no es un rango y se filtra aparte. Si los valores no forman un
+    periodo válido (mes 13, año 0) devuelve ``False``.
+    """
+    start = end = None
+    month_only = None
+
+    if month is not None and not 1 <= month <= 12:
+        return False
+    if year is not None:
+        if not date.min.year <= year < date.max.year:
+            return False
+        if month is not None:
+            start = date(year, month, 1)
+            end = date(year + month // 12, month % 12 + 1, 1)
+        else:
+            start, end = date(year, 1, 1), date(year + 1, 1, 1)
+    elif month is not None:
+        month_only = month
+
+    # fecha_fin incluye el día completo
+    if fecha_inicio is not None:
+        start = max(start, fecha_inicio) if start else fecha_inicio
+    if fecha_fin is not None:
+        day_after = fecha_fin + timedelta(days=1)
+        end = min(end, day_after) if end else day_after
+
+    return (
+        _start_of_day(start) if start else None,
+        _start_of_day(end) if end else None,
+        month_only,
+    )
+
 
 class SaleFilter(django_filters.FilterSet):
     """
@@ -14,7 +71,7 @@ class SaleFilter(django_filters.FilterSet):
         label="Buscar por Cliente (Nombre, Apellido o Email)"
     )
 
-    # 2. Filtro por Mes y Año
+    # 2. Filtro por Mes y Año (se aplican como rango, ver filter_queryset)
     month = django_filters.NumberFilter(field_name='created_at__month')
     year = django_filters.NumberFilter(field_name='created_at__year')
 
@@ -27,7 +84,7 @@ class SaleFilter(django_filters.FilterSet):
     monto_min = django_filters.NumberFilter(field_name='total_amount', lookup_expr='gte')
     monto_max = django_filters.NumberFilter(field_name='total_amount', lookup_expr='lte')
 
-    #5. Filtro por Fecha (Rango)
+    #5. Filtro por Fecha (Rango, fecha_fin inclusive)
     fecha_inicio = DateFilter(field_name='created_at', lookup_expr='gte')
     fecha_fin = DateFilter(field_name='created_at', lookup_expr='lte')
 
@@ -36,6 +93,44 @@ class SaleFilter(django_filters.FilterSet):
         # Define los campos que se pueden filtrar exactamente (además de los personalizados)
         fields = ['status', 'client_search', 'month', 'year', 'product_search', 'monto_min', 'monto_max', 'fecha_inicio', 'fecha_fin']
 
+    def filter_queryset(self, queryset):
+        """
+        Igual que el de django-filter, salvo que mes, año y fechas se combinan
+        en un único ``created_at >= inicio AND created_at < fin``.
+        """
+        cleaned = self.form.cleaned_data
+        for name, value in cleaned.items():
+            if name in DATE_RANGE_PARAMS:
+                continue
+            queryset = self.filters[name].filter(queryset, value)
+            assert isinstance(queryset, QuerySet), \
+                "Expected '%s.%s' to return a QuerySet, but got a %s instead." \
+                % (type(self).__name__, name, type(queryset).__name__)
+        return self.filter_by_created_at(queryset, cleaned)
+
+    def filter_by_created_at(self, queryset, cleaned):
+        def as_int(value):
+            return int(value) if value is not None else None
+
+        bounds = created_at_bounds(
+            month=as_int(cleaned.get('month')),
+            year=as_int(cleaned.get('year')),
+            fecha_inicio=cleaned.get('fecha_inicio'),
+            fecha_fin=cleaned.get('fecha_fin'),
+        )
+        if bounds is False:
+            return queryset.none()
+
+        start, end, month_only = bounds
+        if start is not None:
+            queryset = queryset.filter(created_at__gte=start)
+        if end is not None:
+            queryset = queryset.filter(created_at__lt=end)
+        if month_only is not None:
+            # Sin año no hay rango posible: se mantiene el EXTRACT
+            queryset = queryset.filter(created_at__month=month_only)
+        return queryset
+
 
     def filter_by_client_name_or_email(self, queryset, name, value):
         """
@@ -46,7 +141,7 @@ class SaleFilter(django_filters.FilterSet):
             return queryset
         
         # 1. Buscar por email (coincidencia simple)
-        email_query = Q(user__email__icontains=value)
+        email_query = Q(email__icontains=value)
         
         # 2. Construir consulta de nombre (más compleja)
         # Divide la búsqueda por espacios (ej. "Ana Gomez" -> ["Ana", "Gomez"])
@@ -59,13 +154,17 @@ class SaleFilter(django_filters.FilterSet):
             # Añade una condición "AND" por cada parte
             # La parte ("Ana") debe estar en el nombre O en el apellido
             name_query &= (
-                Q(user__first_name__icontains=part) |
-                Q(user__last_name__icontains=part)
+                Q(first_name__icontains=part) |
+                Q(last_name__icontains=part)
             )
         
         # 3. Combinar las búsquedas
-        # Devuelve resultados que coincidan con el email O con la búsqueda de nombre
-        return queryset.filter(email_query | name_query).distinct()
+        # Devuelve resultados que coincidan con el email O con la búsqueda de nombre.
+        # Semi-join: ids de los usuarios que coinciden (tabla chica) y las ventas
+        # por el índice de user. Con el JOIN el planificador recorría todas las
+        # ventas en orden de fecha y buscaba el usuario de cada una.
+        user_ids = User.objects.filter(email_query | name_query).values('id')
+        return queryset.filter(user__in=user_ids)
 
     def filter_by_product_or_category(self, queryset, name, value):
         """
@@ -74,8 +173,13 @@ class SaleFilter(django_filters.FilterSet):
         """
         if not value:
             return queryset
-        
+
+        # Semi-join: ids de venta con algún detalle de esos productos (índice
+        # (product, sale) de SaleDetail). A diferencia del JOIN con details
+        # no duplica ventas, así que no hace falta distinct().
+        product_ids = Product.objects.filter(
+            Q(name__icontains=value) | Q(category__name__icontains=value)
+        ).values('id')
         return queryset.filter(
-            Q(details__product__name__icontains=value) |
-            Q(details__product__category__name__icontains=value)
-        ).distinct()
\ No newline at end of file
+            pk__in=SaleDetail.objects.filter(product__in=product_ids).values('sale_id')
+        )
\ No newline at end of file
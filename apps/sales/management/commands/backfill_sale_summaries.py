@@ -0,0 +1,54 @@
+# apps/sales/management/commands/backfill_sale_summaries.py
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.sales.models import Sale, SaleDetail
+
+
+class Command(BaseCommand):
+    help = (
+        "Calcula Sale.item_count y Sale.line_summary a partir de SaleDetail "
+        "para las ventas existentes, por lotes de ids."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5_000, help="Ventas por lote.")
+        parser.add_argument('--all', action='store_true',
+                            help="Recalcula todas las ventas (por defecto solo las que tienen item_count=0).")
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        queryset = Sale.objects.all() if options['all'] else Sale.objects.filter(item_count=0)
+
+        started = time.perf_counter()
+        updated = 0
+        last_id = 0
+        while True:
+            # Paginación por id (keyset): cada lote es una búsqueda por PK
+            sale_ids = list(
+                queryset.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:batch_size]
+            )
+            if not sale_ids:
+                break
+            last_id = sale_ids[-1]
+
+            lines = {sale_id: [] for sale_id in sale_ids}
+            details = SaleDetail.objects.filter(sale_id__in=sale_ids).order_by('sale_id', 'id') \
+                .values_list('sale_id', 'product__name', 'quantity')
+            for sale_id, name, quantity in details:
+                lines[sale_id].append((name, quantity))
+
+            sales = []
+            for sale_id, sale_lines in lines.items():
+                item_count, line_summary = Sale.summarize_lines(sale_lines)
+                sales.append(Sale(id=sale_id, item_count=item_count, line_summary=line_summary))
+            with transaction.atomic():
+                Sale.objects.bulk_update(sales, ['item_count', 'line_summary'], batch_size=1_000)
+
+            updated += len(sales)
+            self.stdout.write(f"  {updated} ventas actualizadas (hasta id {last_id})")
+
+        seconds = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"{updated} ventas actualizadas en {seconds:.1f}s."))
@@ -0,0 +1,27 @@
+# apps/sales/management/commands/refresh_warranty_buckets.py
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.sales.warranties import refresh_buckets
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula WarrantyExpirationBucket (garantías que vencen por día) "
+        "desde hoy hasta --horizon días y borra los días pasados. Pensado "
+        "para ejecutarse una vez al día (cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--horizon', type=int, default=120, help="Días hacia adelante.")
+
+    def handle(self, *args, **options):
+        if not 1 <= options['horizon'] <= 3_650:
+            raise CommandError("--horizon debe estar entre 1 y 3650.")
+        started = time.perf_counter()
+        written, deleted = refresh_buckets(options['horizon'])
+        self.stdout.write(self.style.SUCCESS(
+            f"{written} días recalculados, {deleted} días pasados borrados "
+            f"en {time.perf_counter() - started:.2f}s."
+        ))
@@ -0,0 +1,66 @@
+# apps/sales/management/commands/send_warranty_reminders.py
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.sales.reminders import send_reminders
+
+
+class Command(BaseCommand):
+    help = (
+        "Envía recordatorios por email de las garantías que vencen en los "
+        "próximos --days días. Recorre las garantías por páginas, envía con "
+        "un pool de conexiones SMTP y guarda el avance después de cada "
+        "página: si se corta, volver a ejecutarlo sigue donde quedó. Pensado "
+        "para ejecutarse una vez al día (cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=30, help="Ventana de vencimiento en días.")
+        parser.add_argument('--chunk-size', type=int, default=1_000, help="Garantías por página.")
+        parser.add_argument('--concurrency', type=int, default=4, help="Conexiones SMTP en paralelo.")
+        parser.add_argument('--limit', type=int, help="Máximo de garantías a procesar en esta ejecución.")
+        parser.add_argument('--backend', help="EMAIL_BACKEND alternativo (p. ej. console).")
+        parser.add_argument('--restart', action='store_true',
+                            help="Ignora el avance guardado de la ventana de hoy.")
+        parser.add_argument('--dry-run', action='store_true',
+                            help="Solo recorre y renderiza: no envía ni marca nada.")
+
+    def handle(self, *args, **options):
+        if not 1 <= options['days'] <= 365:
+            raise CommandError("--days debe estar entre 1 y 365.")
+        if not 1 <= options['chunk_size'] <= 10_000:
+            raise CommandError("--chunk-size debe estar entre 1 y 10000.")
+        if not 1 <= options['concurrency'] <= 32:
+            raise CommandError("--concurrency debe estar entre 1 y 32.")
+        if options['limit'] is not None and options['limit'] < 1:
+            raise CommandError("--limit debe ser mayor que 0.")
+
+        def progress(report):
+            self.stdout.write(
+                f"  página {report.pages}: {report.scanned} procesadas, {report.sent} enviadas, "
+                f"{report.failed} fallidas ({report.per_second:.0f}/s)"
+            )
+
+        report = send_reminders(
+            options['days'],
+            chunk_size=options['chunk_size'],
+            concurrency=options['concurrency'],
+            backend=options['backend'],
+            restart=options['restart'],
+            dry_run=options['dry_run'],
+            limit=options['limit'],
+            on_page=progress if options['verbosity'] > 1 else None,
+        )
+        start, end = report.window
+        if report.already_done:
+            self.stdout.write(f"Los recordatorios de {start}..{end} ya se enviaron (usa --restart para repetir).")
+            return
+        if report.resumed_from:
+            self.stdout.write(f"Retomado desde {report.resumed_from[0]} / id {report.resumed_from[1]}.")
+
+        prefix = "[dry-run] " if options['dry_run'] else ""
+        style = self.style.WARNING if report.failed else self.style.SUCCESS
+        self.stdout.write(style(
+            f"{prefix}{start}..{end}: {report.scanned} garantías en {report.pages} páginas, "
+            f"{report.sent} enviadas, {report.failed} fallidas en {report.seconds:.2f}s "
+            f"({report.per_second:.0f} garantías/s)."
+        ))
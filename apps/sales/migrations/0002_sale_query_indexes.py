@@ -0,0 +1,40 @@
+# Generated by Django 5.2.8 on 2026-10-19 06:44
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0001_initial'),
+        ('sales', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='activatedwarranty',
+            index=models.Index(fields=['user', 'expiration_date'], name='warranty_user_expiration_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sale',
+            index=models.Index(fields=['status', 'created_at'], name='sale_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sale',
+            index=models.Index(fields=['user', 'status', '-created_at'], name='sale_user_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sale',
+            index=models.Index(fields=['-created_at'], name='sale_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sale',
+            index=models.Index(condition=models.Q(('status', 'COMPLETED')), fields=['created_at'], include=('total_amount',), name='sale_completed_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='saledetail',
+            index=models.Index(fields=['product', 'sale'], include=('quantity', 'price_at_purchase'), name='saledetail_product_cover_idx'),
+        ),
+    ]
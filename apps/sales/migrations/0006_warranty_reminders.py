@@ -0,0 +1,45 @@
+# Generated by Django 5.2.8 on 2026-10-19 07:21
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0001_initial'),
+        ('sales', '0005_warranty_expiration'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReminderCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('window_start', models.DateField()),
+                ('window_end', models.DateField()),
+                ('status', models.CharField(choices=[('RUNNING', 'En curso'), ('DONE', 'Terminada')], default='RUNNING', max_length=10)),
+                ('last_expiration_date', models.DateField(blank=True, null=True)),
+                ('last_id', models.BigIntegerField(default=0)),
+                ('sent', models.PositiveIntegerField(default=0)),
+                ('failed', models.PositiveIntegerField(default=0)),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='activatedwarranty',
+            name='reminder_sent_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='activatedwarranty',
+            index=models.Index(condition=models.Q(('reminder_sent_at__isnull', True)), fields=['expiration_date', 'id'], name='warranty_reminder_pending_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='remindercheckpoint',
+            constraint=models.UniqueConstraint(fields=('window_start', 'window_end'), name='remindercheckpoint_window_uniq'),
+        ),
+    ]
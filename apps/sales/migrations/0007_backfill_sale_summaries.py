@@ -0,0 +1,50 @@
+# Rellena Sale.item_count y Sale.line_summary (0003) en las ventas existentes
+
+from django.db import migrations
+
+BATCH_SIZE = 5_000
+
+
+def backfill_sale_summaries(apps, schema_editor):
+    """
+    Mismo recorrido que el comando ``backfill_sale_summaries``: lotes de ids
+    (keyset) de ventas sin resumen y un ``bulk_update`` por lote. El formato
+    es el de ``Sale.summarize_lines`` (aquí solo hay modelos históricos).
+    """
+    Sale = apps.get_model('sales', 'Sale')
+    SaleDetail = apps.get_model('sales', 'SaleDetail')
+    pending = Sale.objects.filter(item_count=0)
+
+    last_id = 0
+    while True:
+        sale_ids = list(pending.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:BATCH_SIZE])
+        if not sale_ids:
+            break
+        last_id = sale_ids[-1]
+
+        lines = {sale_id: [] for sale_id in sale_ids}
+        details = SaleDetail.objects.filter(sale_id__in=sale_ids).order_by('sale_id', 'id') \
+            .values_list('sale_id', 'product__name', 'quantity')
+        for sale_id, name, quantity in details:
+            lines[sale_id].append((name, quantity))
+
+        sales = [
+            Sale(
+                id=sale_id,
+                item_count=sum(quantity for _, quantity in sale_lines),
+                line_summary="; ".join(f"{name} ({quantity}x)" for name, quantity in sale_lines),
+            )
+            for sale_id, sale_lines in lines.items()
+        ]
+        Sale.objects.bulk_update(sales, ['item_count', 'line_summary'], batch_size=1_000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '0006_warranty_reminders'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_sale_summaries, migrations.RunPython.noop),
+    ]
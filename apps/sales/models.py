@@ -25,10 +25,40 @@ class Sale(models.Model):
     )
     stripe_payment_intent_id = models.CharField(max_length=100, unique=True, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    
+    # Resumen desnormalizado de los detalles (se escribe al confirmar el pago)
+    # para que listados y CSV no lean SaleDetail fila por fila.
+    item_count = models.PositiveIntegerField(default=0)
+    line_summary = models.TextField(blank=True, default='')
+
+    class Meta:
+        indexes = [
+            # Dashboards, reportes y SaleFilter (estado + rango de fechas)
+            models.Index(fields=['status', 'created_at'], name='sale_status_created_idx'),
+            # "Mis compras": usuario + estado, de la más reciente a la más antigua
+            models.Index(fields=['user', 'status', '-created_at'], name='sale_user_status_created_idx'),
+            # Listado admin sin filtros y rangos de fecha sin estado
+            models.Index(fields=['-created_at'], name='sale_created_idx'),
+            # Agregados por mes de ventas completadas: index-only scan en PostgreSQL
+            models.Index(
+                fields=['created_at'], name='sale_completed_created_idx',
+                condition=models.Q(status='COMPLETED'), include=['total_amount'],
+            ),
+        ]
+
     def __str__(self):
         return f"Venta {self.id} - {self.user.email} - {self.status}"
 
+    @staticmethod
+    def summarize_lines(lines):
+        """
+        ``lines``: pares (nombre_producto, cantidad). Devuelve
+        (item_count, line_summary), p. ej. (3, "TV (2x); Radio (1x)").
+        """
+        lines = list(lines)
+        item_count = sum(quantity for _, quantity in lines)
+        line_summary = "; ".join(f"{name} ({quantity}x)" for name, quantity in lines)
+        return item_count, line_summary
+
 # Modelo 2: El Detalle (los productos de la venta)
 class SaleDetail(models.Model):
     sale = models.ForeignKey(Sale, related_name='details', on_delete=models.CASCADE)
@@ -36,9 +66,29 @@ class SaleDetail(models.Model):
     quantity = models.PositiveIntegerField()
     price_at_purchase = models.DecimalField(max_digits=10, decimal_places=2) # Guarda el precio al momento de la compra
 
+    class Meta:
+        indexes = [
+            # Agregados por producto (unidades / ingresos) sin leer la tabla
+            models.Index(
+                fields=['product', 'sale'], name='saledetail_product_cover_idx',
+                include=['quantity', 'price_at_purchase'],
+            ),
+        ]
+
     def __str__(self):
         return f"{self.quantity} x {self.product.name} en Venta {self.sale.id}"
 
+class ActivatedWarrantyQuerySet(models.QuerySet):
+    def expiring_between(self, start, end):
+        """ Vencen en [start, end] (ambos inclusive). """
+        return self.filter(expiration_date__gte=start, expiration_date__lte=end)
+
+    def expiring_within(self, days, today=None):
+        """ Vencen entre hoy y dentro de ``days`` días. """
+        today = today or timezone.localdate()
+        return self.expiring_between(today, today + timedelta(days=days))
+
+
 # Modelo 3: La Garantía Activada
 class ActivatedWarranty(models.Model):
     user = models.ForeignKey(
@@ -51,14 +101,116 @@ class ActivatedWarranty(models.Model):
     warranty_template = models.ForeignKey(Warranty, on_delete=models.PROTECT) # La plantilla de garantía
     start_date = models.DateField(auto_now_add=True)
     expiration_date = models.DateField()
+    # Último recordatorio de vencimiento enviado (send_warranty_reminders)
+    reminder_sent_at = models.DateTimeField(null=True, blank=True)
+
+    objects = ActivatedWarrantyQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # "Mis garantías" ordenadas por vencimiento
+            models.Index(fields=['user', 'expiration_date'], name='warranty_user_expiration_idx'),
+            # "Por vencer" de todos los clientes (recordatorios, buckets diarios)
+            models.Index(fields=['expiration_date'], name='warranty_expiration_idx'),
+            # Recorrido por páginas de los recordatorios pendientes
+            models.Index(
+                fields=['expiration_date', 'id'], name='warranty_reminder_pending_idx',
+                condition=models.Q(reminder_sent_at__isnull=True),
+            ),
+        ]
 
     def save(self, *args, **kwargs):
         # Lógica de activación:
         # Al guardar, calcula la fecha de expiración
-        if not self.id: # Solo al crear
+        # (en lote: apps/sales/warranties.bulk_activate)
+        if not self.id and not self.expiration_date: # Solo al crear
             duration_days = self.warranty_template.duration_days
             self.expiration_date = timezone.now().date() + timedelta(days=duration_days)
         super().save(*args, **kwargs)
 
     def __str__(self):
-        return f"Garantía de {self.product.name} para {self.user.email} (Vence: {self.expiration_date})"
\ No newline at end of file
+        return f"Garantía de {self.product.name} para {self.user.email} (Vence: {self.expiration_date})"
+
+# Modelo 4: Garantías que vencen cada día (precalculado)
+class WarrantyExpirationBucket(models.Model):
+    """
+    Cantidad de garantías que vencen en ``day``. Lo recalcula a diario
+    ``refresh_warranty_buckets`` para los próximos días; el resumen de "por
+    vencer" lee de aquí en lugar de agrupar ActivatedWarranty en cada
+    petición.
+    """
+    day = models.DateField(unique=True)
+    count = models.PositiveIntegerField(default=0)
+    refreshed_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.day}: {self.count} garantías"
+
+
+# Modelo 5: Carrito cotizado (lo que se cobra en Stripe)
+class CartSnapshot(models.Model):
+    """
+    Líneas y precios de un carrito al momento del checkout. El PaymentIntent
+    solo guarda su id en metadata; el webhook crea la venta desde aquí.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name='cart_snapshots',
+        on_delete=models.CASCADE
+    )
+    # sha256 de (producto, cantidad, precio) de cada línea
+    fingerprint = models.CharField(max_length=64)
+    # [{"id", "name", "quantity", "price"}], precios como string
+    lines = models.JSONField()
+    item_count = models.PositiveIntegerField()
+    total_amount = models.DecimalField(max_digits=10, decimal_places=2)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Se completa cuando el webhook crea la venta
+    sale = models.OneToOneField(
+        Sale, related_name='cart_snapshot', on_delete=models.SET_NULL, null=True, blank=True
+    )
+
+    class Meta:
+        indexes = [
+            # Reutilizar el snapshot de un carrito idéntico (doble clic)
+            models.Index(fields=['user', 'fingerprint', '-created_at'], name='cartsnapshot_user_fp_idx'),
+        ]
+
+    @property
+    def amount_cents(self):
+        return int(self.total_amount * 100)
+
+    def __str__(self):
+        return f"Carrito {self.id} - {self.item_count} items - {self.total_amount}"
+
+
+# Modelo 6: Avance de una corrida de recordatorios de garantía
+class ReminderCheckpoint(models.Model):
+    """
+    Punto de avance de ``send_warranty_reminders`` para una ventana
+    (``window_start`` .. ``window_end``). Se actualiza al terminar cada
+    bloque: si el proceso se corta, la siguiente ejecución del mismo día
+    sigue desde (last_expiration_date, last_id).
+    """
+    class Status(models.TextChoices):
+        RUNNING = 'RUNNING', 'En curso'
+        DONE = 'DONE', 'Terminada'
+
+    window_start = models.DateField()
+    window_end = models.DateField()
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.RUNNING)
+    last_expiration_date = models.DateField(null=True, blank=True)
+    last_id = models.BigIntegerField(default=0)
+    sent = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    started_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['window_start', 'window_end'], name='remindercheckpoint_window_uniq'),
+        ]
+
+    def __str__(self):
+        return f"Recordatorios {self.window_start}..{self.window_end} - {self.status} ({self.sent} enviados)"
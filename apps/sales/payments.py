@@ -0,0 +1,217 @@
+# apps/sales/payments.py
+"""
+Pasarela de pagos. Las vistas no llaman a ``stripe`` directamente sino a
+``get_gateway()``, que devuelve el backend configurado en
+``settings.PAYMENTS['BACKEND']``:
+
+- ``StripeGateway``: Stripe real, con cliente HTTP propio (pool de
+  conexiones httpx), timeouts cortos, reintentos acotados y claves de
+  idempotencia derivadas del carrito cotizado (``CartSnapshot``).
+- ``FakeStripeGateway``: todo en proceso. Crea PaymentIntents en memoria y
+  genera webhooks firmados igual que Stripe, para probar (o cargar) el
+  ciclo checkout → webhook → venta sin red.
+"""
+import asyncio
+import hashlib
+import hmac
+import json
+import threading
+import time
+import uuid
+import weakref
+from collections import OrderedDict
+from functools import lru_cache
+
+import httpx
+import stripe
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+DEFAULTS = {
+    'BACKEND': 'apps.sales.payments.StripeGateway',
+    'CURRENCY': 'bob',
+    'CONNECT_TIMEOUT': 2.0,
+    'TIMEOUT': 10.0,
+    'MAX_RETRIES': 2,
+    # El mismo carrito del mismo usuario dentro de la ventana reutiliza el
+    # CartSnapshot y por lo tanto el PaymentIntent (doble clic, reintentos del
+    # frontend). Ver apps/sales/pricing.py.
+    'IDEMPOTENCY_WINDOW_SECONDS': 120,
+}
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'PAYMENTS', {})}
+
+
+def idempotency_key(snapshot):
+    """ Un PaymentIntent por carrito cotizado: reintentar el checkout del
+    mismo snapshot devuelve el mismo intent en lugar de crear otro cobro. """
+    return f"cart-{snapshot.pk}-{snapshot.fingerprint[:32]}"
+
+
+class PaymentGateway:
+    """ Interfaz común de los backends. """
+
+    def __init__(self, config):
+        self.config = config
+
+    def intent_params(self, snapshot):
+        # Stripe limita metadata (50 claves, 500 caracteres por valor): solo
+        # viaja el id del snapshot, no el carrito
+        return {
+            'amount': snapshot.amount_cents,
+            'currency': self.config['CURRENCY'],
+            'metadata': {
+                'user_id': str(snapshot.user_id),
+                'cart_snapshot_id': str(snapshot.pk),
+            },
+            'payment_method_types': ['card'],
+        }
+
+    def create_payment_intent(self, snapshot):
+        raise NotImplementedError
+
+    async def acreate_payment_intent(self, snapshot):
+        raise NotImplementedError
+
+    def construct_event(self, payload, sig_header):
+        """ Verifica la firma del webhook; lanza ValueError o SignatureVerificationError. """
+        return stripe.Webhook.construct_event(payload, sig_header, self.webhook_secret)
+
+    @property
+    def webhook_secret(self):
+        return settings.STRIPE_WEBHOOK_SECRET
+
+
+class StripeGateway(PaymentGateway):
+    def __init__(self, config):
+        super().__init__(config)
+        self._lock = threading.Lock()
+        self._sync_client = None
+        # httpx.AsyncClient no puede compartirse entre event loops
+        self._async_clients = weakref.WeakKeyDictionary()
+
+    def _build_client(self, allow_sync_methods):
+        options = {}
+        if settings.STRIPE_API_BASE:
+            options['base_addresses'] = {'api': settings.STRIPE_API_BASE}
+        return stripe.StripeClient(
+            settings.STRIPE_SECRET_KEY,
+            http_client=stripe.HTTPXClient(
+                timeout=httpx.Timeout(self.config['TIMEOUT'], connect=self.config['CONNECT_TIMEOUT']),
+                allow_sync_methods=allow_sync_methods,
+            ),
+            # Stripe solo reintenta errores de red, 409 y 5xx, con backoff
+            max_network_retries=self.config['MAX_RETRIES'],
+            **options,
+        )
+
+    @property
+    def client(self):
+        if self._sync_client is None:
+            with self._lock:
+                if self._sync_client is None:
+                    self._sync_client = self._build_client(allow_sync_methods=True)
+        return self._sync_client
+
+    def async_client(self):
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = self._async_clients[loop] = self._build_client(allow_sync_methods=False)
+        return client
+
+    def create_payment_intent(self, snapshot):
+        return self.client.v1.payment_intents.create(
+            params=self.intent_params(snapshot),
+            options={'idempotency_key': idempotency_key(snapshot)},
+        )
+
+    async def acreate_payment_intent(self, snapshot):
+        return await self.async_client().v1.payment_intents.create_async(
+            params=self.intent_params(snapshot),
+            options={'idempotency_key': idempotency_key(snapshot)},
+        )
+
+
+class FakeStripeGateway(PaymentGateway):
+    """
+    Stripe en memoria. ``succeed(intent_id)`` devuelve ``(payload, firma)``
+    del evento ``payment_intent.succeeded``, listos para enviarse a
+    ``/api/v1/sales/webhook/``; la firma se verifica con el mismo código que
+    en producción (``stripe.Webhook.construct_event``).
+    """
+    MAX_INTENTS = 50_000
+    FAKE_KEY = 'sk_test_fake'
+
+    def __init__(self, config):
+        super().__init__(config)
+        self._lock = threading.Lock()
+        self._intents = OrderedDict()
+        self._by_idempotency_key = {}
+
+    @property
+    def webhook_secret(self):
+        return settings.STRIPE_WEBHOOK_SECRET or 'whsec_fake'
+
+    def create_payment_intent(self, snapshot):
+        key = idempotency_key(snapshot)
+        with self._lock:
+            existing = self._by_idempotency_key.get(key)
+            if existing is not None and existing in self._intents:
+                return stripe.PaymentIntent.construct_from(self._intents[existing], self.FAKE_KEY)
+
+            intent_id = f"pi_fake_{uuid.uuid4().hex[:24]}"
+            data = {
+                'id': intent_id,
+                'object': 'payment_intent',
+                'client_secret': f"{intent_id}_secret_{uuid.uuid4().hex[:16]}",
+                'status': 'requires_payment_method',
+                'created': int(time.time()),
+                **self.intent_params(snapshot),
+            }
+            self._intents[intent_id] = data
+            self._by_idempotency_key[key] = intent_id
+            while len(self._intents) > self.MAX_INTENTS:
+                old_id, _ = self._intents.popitem(last=False)
+                self._by_idempotency_key = {k: v for k, v in self._by_idempotency_key.items() if v != old_id}
+        return stripe.PaymentIntent.construct_from(data, self.FAKE_KEY)
+
+    async def acreate_payment_intent(self, snapshot):
+        return self.create_payment_intent(snapshot)
+
+    def sign(self, payload, timestamp=None):
+        """ Cabecera ``Stripe-Signature`` (esquema v1: HMAC-SHA256 de "t.payload"). """
+        timestamp = int(timestamp or time.time())
+        signature = hmac.new(
+            self.webhook_secret.encode(), f"{timestamp}.{payload}".encode(), hashlib.sha256,
+        ).hexdigest()
+        return f"t={timestamp},v1={signature}"
+
+    def succeed(self, intent_id):
+        with self._lock:
+            data = dict(self._intents[intent_id], status='succeeded')
+            self._intents[intent_id] = data
+        payload = json.dumps({
+            'id': f"evt_fake_{uuid.uuid4().hex[:24]}",
+            'object': 'event',
+            'type': 'payment_intent.succeeded',
+            'created': int(time.time()),
+            'data': {'object': data},
+        })
+        return payload, self.sign(payload)
+
+
+@lru_cache(maxsize=1)
+def get_gateway():
+    config = get_config()
+    return import_string(config['BACKEND'])(config)
+
+
+@receiver(setting_changed)
+def _reset_gateway(setting, **kwargs):
+    if setting in ('PAYMENTS', 'STRIPE_SECRET_KEY', 'STRIPE_API_BASE', 'STRIPE_WEBHOOK_SECRET'):
+        get_gateway.cache_clear()
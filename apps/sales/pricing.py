@@ -0,0 +1,133 @@
+# apps/sales/pricing.py
+"""
+Precio de un carrito. Todos los productos se leen en una sola consulta
+(con el mismo número de consultas para 3 o 300 líneas) y los montos se
+calculan en ``Decimal``.
+
+El resultado se guarda como ``CartSnapshot``: el PaymentIntent de Stripe solo
+lleva su id en metadata y el webhook crea la venta a partir del snapshot.
+"""
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.inventory.services import sharded_stock
+from apps.products.models import Product
+from .models import CartSnapshot
+from .payments import get_config
+
+CENTS = Decimal('100')
+
+
+class InsufficientStock(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class PricedLine:
+    product_id: int
+    name: str
+    quantity: int
+    unit_price: Decimal
+
+    @property
+    def subtotal(self):
+        return self.unit_price * self.quantity
+
+    def as_dict(self):
+        return {
+            'id': self.product_id,
+            'name': self.name,
+            'quantity': self.quantity,
+            'price': str(self.unit_price),
+        }
+
+
+@dataclass(frozen=True)
+class PricedCart:
+    lines: tuple
+    total: Decimal
+
+    @property
+    def amount_cents(self):
+        return int(self.total * CENTS)
+
+    @property
+    def item_count(self):
+        return sum(line.quantity for line in self.lines)
+
+    @property
+    def fingerprint(self):
+        """ Huella de (producto, cantidad, precio): cambia si cambia el carrito o un precio. """
+        raw = json.dumps([[line.product_id, line.quantity, str(line.unit_price)] for line in self.lines])
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def merge_items(items):
+    """ Suma cantidades de líneas repetidas, respetando el orden del carrito. """
+    quantities = {}
+    for item in items:
+        quantities[item['product_id']] = quantities.get(item['product_id'], 0) + item['quantity']
+    return quantities
+
+
+def price_cart(items):
+    """
+    ``items``: datos validados de ``CartItemSerializer``. Lanza
+    ``Product.DoesNotExist`` o ``InsufficientStock``.
+
+    Solo lee: no bloquea filas de Product. El stock se descuenta (de forma
+    condicional) en el webhook, así que esta verificación es una guía para
+    el comprador y no una reserva.
+    """
+    quantities = merge_items(items)
+    products = {
+        product.id: product
+        for product in Product.objects.filter(id__in=quantities).only('id', 'name', 'price', 'stock')
+    }
+    if len(products) != len(quantities):
+        raise Product.DoesNotExist
+    # Productos con stock fraccionado (apps/inventory): la suma de sus fracciones
+    for product_id, stock in sharded_stock(list(quantities)).items():
+        products[product_id].stock = stock
+
+    lines = []
+    total = Decimal('0')
+    for product_id, quantity in quantities.items():
+        product = products[product_id]
+        if product.stock < quantity:
+            raise InsufficientStock(product.name)
+        line = PricedLine(product.id, product.name, quantity, product.price)
+        total += line.subtotal
+        lines.append(line)
+    return PricedCart(tuple(lines), total)
+
+
+def snapshot_cart(user, items):
+    """
+    Valida y cotiza el carrito y devuelve su ``CartSnapshot``. Si el usuario
+    ya cotizó exactamente el mismo carrito hace poco y no lo pagó, se
+    reutiliza el snapshot (y con él la clave de idempotencia del pago).
+    """
+    window = timedelta(seconds=get_config()['IDEMPOTENCY_WINDOW_SECONDS'])
+    with transaction.atomic():
+        priced = price_cart(items)
+        fingerprint = priced.fingerprint
+        snapshot = CartSnapshot.objects.filter(
+            user=user, fingerprint=fingerprint, sale__isnull=True,
+            created_at__gte=timezone.now() - window,
+        ).order_by('-created_at').first()
+        if snapshot is None:
+            snapshot = CartSnapshot.objects.create(
+                user=user,
+                fingerprint=fingerprint,
+                lines=[line.as_dict() for line in priced.lines],
+                item_count=priced.item_count,
+                total_amount=priced.total,
+            )
+    return snapshot
@@ -0,0 +1,248 @@
+# apps/sales/reminders.py
+"""
+Recordatorios de vencimiento de garantía en lote.
+
+- Las garantías pendientes se recorren por páginas con keyset
+  (expiration_date, id) sobre ``warranty_reminder_pending_idx``: cada página
+  es una consulta acotada y nunca se cargan todas en memoria.
+- La plantilla se compila una sola vez por proceso.
+- Cada hilo del pool abre una conexión SMTP y la reutiliza para todos sus
+  envíos; el pool tiene ``concurrency`` hilos y como máximo una página en
+  vuelo.
+- Al terminar cada página se marcan las garantías enviadas y se guarda el
+  avance en ``ReminderCheckpoint`` (en la misma transacción). Si el proceso
+  se corta, la siguiente ejecución sigue desde la última página completa;
+  solo esa página en vuelo puede reenviarse.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import Q
+from django.template.loader import get_template
+from django.utils import timezone
+
+from .models import ActivatedWarranty, ReminderCheckpoint
+from .warranties import expiring_window
+
+logger = logging.getLogger(__name__)
+
+# Texto plano: la plantilla desactiva el autoescape (O'Brien, no O&#x27;Brien)
+TEMPLATE_NAME = 'sales/warranty_reminder.txt'
+SUBJECT = "Tu garantía de {product_name} vence pronto"
+
+FIELDS = (
+    'id', 'expiration_date', 'user__email', 'user__first_name', 'product__name',
+    'warranty_template__title', 'warranty_template__provider__name',
+    'warranty_template__provider__contact_email',
+)
+
+
+@lru_cache(maxsize=None)
+def reminder_template():
+    return get_template(TEMPLATE_NAME)
+
+
+def pending_page(start, end, after=None, size=1_000):
+    """
+    Siguiente página de garantías sin recordatorio que vencen en
+    [start, end], ordenadas por (expiration_date, id) y posteriores a
+    ``after`` = (expiration_date, id).
+    """
+    queryset = ActivatedWarranty.objects.expiring_between(start, end).filter(
+        reminder_sent_at__isnull=True, user__is_active=True,
+    )
+    if after is not None:
+        last_date, last_id = after
+        queryset = queryset.filter(
+            Q(expiration_date__gt=last_date) | Q(expiration_date=last_date, id__gt=last_id)
+        )
+    return list(queryset.order_by('expiration_date', 'id').values(*FIELDS)[:size])
+
+
+def build_message(row, today):
+    body = reminder_template().render({
+        'first_name': row['user__first_name'],
+        'product_name': row['product__name'],
+        'warranty_title': row['warranty_template__title'],
+        'provider_name': row['warranty_template__provider__name'],
+        'provider_email': row['warranty_template__provider__contact_email'],
+        'expiration_date': row['expiration_date'],
+        'days_left': (row['expiration_date'] - today).days,
+    })
+    return EmailMessage(
+        subject=SUBJECT.format(product_name=row['product__name']),
+        body=body,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[row['user__email']],
+    )
+
+
+class PooledSender:
+    """
+    Pool de ``concurrency`` hilos, cada uno con su conexión de correo abierta
+    una vez y reutilizada. ``send(pairs)`` reparte [(id, mensaje)] entre los
+    hilos, espera a que terminen y devuelve (ids enviados, ids fallidos).
+    """
+
+    def __init__(self, concurrency=4, backend=None):
+        self.concurrency = concurrency
+        self.backend = backend
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='reminders')
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = get_connection(self.backend, fail_silently=False)
+            connection.open()
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def _drop_connection(self):
+        connection = getattr(self._local, 'connection', None)
+        self._local.connection = None
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception:  # noqa: BLE001 - la conexión ya está rota
+                pass
+
+    def _send_slice(self, pairs):
+        sent, failed = [], []
+        for warranty_id, message in pairs:
+            try:
+                connection = self._connection()
+                message.connection = connection
+                if connection.send_messages([message]):
+                    sent.append(warranty_id)
+                else:
+                    failed.append(warranty_id)
+            except Exception as e:  # noqa: BLE001 - se reintenta en la próxima corrida
+                logger.warning("Recordatorio de garantía %s no enviado: %s", warranty_id, e)
+                failed.append(warranty_id)
+                # La conexión puede haber quedado inutilizable: se abre otra
+                self._drop_connection()
+        return sent, failed
+
+    def send(self, pairs):
+        slices = [pairs[i::self.concurrency] for i in range(self.concurrency)]
+        futures = [self._executor.submit(self._send_slice, part) for part in slices if part]
+        sent, failed = [], []
+        for future in futures:
+            ok, ko = future.result()
+            sent.extend(ok)
+            failed.extend(ko)
+        return sent, failed
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        for connection in self._connections:
+            try:
+                connection.close()
+            except Exception:  # noqa: BLE001
+                pass
+
+
+@dataclass
+class ReminderReport:
+    window: tuple
+    scanned: int = 0
+    sent: int = 0
+    failed: int = 0
+    pages: int = 0
+    seconds: float = 0.0
+    resumed_from: tuple = None
+    already_done: bool = False
+
+    @property
+    def per_second(self):
+        return self.scanned / self.seconds if self.seconds else 0.0
+
+
+def _checkpoint(start, end, restart):
+    checkpoint, created = ReminderCheckpoint.objects.get_or_create(window_start=start, window_end=end)
+    if restart and not created:
+        checkpoint.status = ReminderCheckpoint.Status.RUNNING
+        checkpoint.last_expiration_date = None
+        checkpoint.last_id = 0
+        checkpoint.sent = checkpoint.failed = 0
+        checkpoint.finished_at = None
+        checkpoint.save()
+    return checkpoint
+
+
+def send_reminders(days, chunk_size=1_000, concurrency=4, backend=None, restart=False,
+                   dry_run=False, limit=None, today=None, on_page=None):
+    """
+    Envía los recordatorios de las garantías que vencen en los próximos
+    ``days`` días. Con ``dry_run`` solo recorre y renderiza (no envía, no
+    marca, no guarda avance). ``on_page(report)`` se llama tras cada página.
+    """
+    start, end = expiring_window(days, today)
+    today = start
+    report = ReminderReport(window=(start, end))
+
+    checkpoint = None
+    after = None
+    if not dry_run:
+        checkpoint = _checkpoint(start, end, restart)
+        if checkpoint.status == ReminderCheckpoint.Status.DONE:
+            report.already_done = True
+            return report
+        if checkpoint.last_expiration_date is not None:
+            after = (checkpoint.last_expiration_date, checkpoint.last_id)
+            report.resumed_from = after
+
+    sender = None if dry_run else PooledSender(concurrency, backend)
+    started = time.perf_counter()
+    try:
+        while limit is None or report.scanned < limit:
+            size = chunk_size if limit is None else min(chunk_size, limit - report.scanned)
+            rows = pending_page(start, end, after, size)
+            if not rows:
+                break
+            pairs = [(row['id'], build_message(row, today)) for row in rows]
+            after = (rows[-1]['expiration_date'], rows[-1]['id'])
+
+            if dry_run:
+                sent, failed = [row['id'] for row in rows], []
+            else:
+                sent, failed = sender.send(pairs)
+                with transaction.atomic():
+                    ActivatedWarranty.objects.filter(id__in=sent).update(reminder_sent_at=timezone.now())
+                    checkpoint.last_expiration_date, checkpoint.last_id = after
+                    checkpoint.sent += len(sent)
+                    checkpoint.failed += len(failed)
+                    checkpoint.save(update_fields=['last_expiration_date', 'last_id', 'sent', 'failed', 'updated_at'])
+
+            report.scanned += len(rows)
+            report.sent += len(sent)
+            report.failed += len(failed)
+            report.pages += 1
+            report.seconds = time.perf_counter() - started
+            if on_page:
+                on_page(report)
+            if len(rows) < size:
+                break
+    finally:
+        if sender:
+            sender.close()
+    report.seconds = time.perf_counter() - started
+
+    reached_end = limit is None or report.scanned < limit
+    if checkpoint is not None and reached_end:
+        checkpoint.status = ReminderCheckpoint.Status.DONE
+        checkpoint.finished_at = timezone.now()
+        checkpoint.save(update_fields=['status', 'finished_at', 'updated_at'])
+    return report
@@ -27,17 +27,23 @@ class ActivatedWarrantySerializer(serializers.ModelSerializer):
         model = ActivatedWarranty
         fields = ['product', 'start_date', 'expiration_date']
 
+class ExpiringWarrantySerializer(serializers.ModelSerializer):
+    """ Garantías por vencer (vista de administración / recordatorios) """
+    product = ProductLiteSerializer(read_only=True)
+    user_email = serializers.EmailField(source='user.email', read_only=True)
+
+    class Meta:
+        model = ActivatedWarranty
+        fields = ['id', 'user_email', 'product', 'sale', 'start_date', 'expiration_date']
+
 class SaleSerializer(serializers.ModelSerializer):
     """ Serializer para la lista "Mis Compras" """
-    item_count = serializers.SerializerMethodField()
-    
+    # item_count (items *totales*, no distintos) y line_summary vienen
+    # desnormalizados en Sale: no se consulta SaleDetail por fila.
+
     class Meta:
         model = Sale
-        fields = ['id', 'total_amount', 'status', 'created_at', 'item_count']
-        
-    def get_item_count(self, obj):
-        # Cuenta cuántos items *totales* (no distintos) tuvo la compra
-        return sum(detail.quantity for detail in obj.details.all())
+        fields = ['id', 'total_amount', 'status', 'created_at', 'item_count', 'line_summary']
 
 class SaleDetailReceiptSerializer(serializers.ModelSerializer):
     """ Serializer para la vista de "Recibo" (Nota de Compra) """
@@ -1,5 +1,5 @@
 from django.urls import path
-from . import views
+from . import views, async_views
 
 urlpatterns = [
     # Endpoint para el frontend
@@ -13,6 +13,15 @@ urlpatterns = [
     path('receipt/<int:pk>/', views.ReceiptDetailView.as_view(), name='receipt-detail'),
 
     path('my-warranties/', views.MyWarrantiesListView.as_view(), name='my-warranties'),
+    path('my-warranties/expiring/', views.MyExpiringWarrantiesView.as_view(), name='my-warranties-expiring'),
 
     path('admin/all-sales/', views.AdminSaleListView.as_view(), name='admin-all-sales'),
+    path('admin/warranties/expiring/', views.AdminExpiringWarrantiesView.as_view(),
+         name='admin-warranties-expiring'),
+    path('admin/warranties/expiring/summary/', views.AdminExpiringSummaryView.as_view(),
+         name='admin-warranties-expiring-summary'),
+
+    # Versiones async (servir con uvicorn / ASGI)
+    path('async/create-payment-intent/', async_views.CreatePaymentIntentAsyncView.as_view(),
+         name='create-payment-intent-async'),
 ]
\ No newline at end of file
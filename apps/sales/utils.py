@@ -28,10 +28,10 @@ class EmailThread(threading.Thread):
                 self.recipient_list,
                 fail_silently=False,
             )
-            logger.info(f"Email de alerta de stock enviado a {self.recipient_list}")
+            logger.info("Email de alerta de stock enviado a %s", self.recipient_list)
         except Exception as e:
             # Registra cualquier error que ocurra en el hilo (ej. contraseña de app incorrecta)
-            logger.error(f"FALLO AL ENVIAR EMAIL (hilo): {e}")
+            logger.exception("FALLO AL ENVIAR EMAIL (hilo)")
 
 def send_low_stock_alert(product):
     """
@@ -47,10 +47,23 @@ def send_low_stock_alert(product):
     recipient_list = list(admin_emails)
     
     if not recipient_list:
-        logger.warning(f"Alerta de stock bajo para {product.name}, pero no se encontraron emails de empleados.")
+        logger.warning("Alerta de stock bajo para %s, pero no se encontraron emails de empleados.", product.name)
         return
 
-    # 2. Prepara el mensaje del correo
+    # 2. Prepara el mensaje del correo (con el pronóstico de demanda si existe)
+    forecast = getattr(product, 'forecast', None)
+    if forecast is not None:
+        cover = forecast.cover_for(product.stock)
+        cover_text = f"{cover:.1f} días" if cover is not None else "un tiempo indefinido (sin ventas recientes)"
+        demand = (
+            f"Punto de reorden: {forecast.reorder_point} unidades "
+            f"(stock de seguridad: {forecast.safety_stock}).\n"
+            f"    Demanda estimada: {forecast.daily_rate:.1f} por día / {forecast.weekly_rate:.1f} por semana.\n"
+            f"    El stock actual alcanza para {cover_text}."
+        )
+    else:
+        demand = "Sin pronóstico de demanda todavía (umbral fijo)."
+
     subject = f"¡ALERTA DE STOCK BAJO! - {product.name}"
     message = f"""
     Hola equipo de SmartSales365,
@@ -58,6 +71,7 @@ def send_low_stock_alert(product):
     El stock del producto '{product.name}' (ID: {product.id}) ha alcanzado un nivel crítico.
 
     Stock Actual: {product.stock} unidades.
+    {demand}
 
     Por favor, contactar al proveedor para reabastecer el inventario.
 
@@ -65,5 +79,5 @@ def send_low_stock_alert(product):
     """
     
     # 3. Inicia el hilo para enviar el email sin bloquear
-    logger.info(f"Disparando alerta de stock bajo para {product.name} a {len(recipient_list)} administradores.")
+    logger.info("Disparando alerta de stock bajo para %s a %d administradores.", product.name, len(recipient_list))
     EmailThread(subject, message, recipient_list).start()
\ No newline at end of file
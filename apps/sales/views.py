@@ -1,25 +1,30 @@
 import stripe
 import json
-from django.conf import settings
+import logging
 from django.db import transaction
 from rest_framework import generics
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
 from django_filters.rest_framework import DjangoFilterBackend
 from .filters import SaleFilter
 
 from apps.products.models import Product, Warranty
-from .models import Sale, SaleDetail, ActivatedWarranty, ActivatedWarranty
+from .models import Sale, SaleDetail, ActivatedWarranty, CartSnapshot
 from .serializers import (
     CartItemSerializer, SaleSerializer, SaleDetailReceiptSerializer,
-    ActivatedWarrantySerializer
+    ActivatedWarrantySerializer, ExpiringWarrantySerializer
 )
+from apps.inventory.services import OutOfStock, low_stock_products, record_sale
+from core.db_router import ReplicaReadMixin
+from .payments import get_gateway
+from .pricing import InsufficientStock, snapshot_cart
 from .utils import send_low_stock_alert
+from .warranties import activate_for_sale, expiring_summary
 
-# Configura Stripe con tu clave secreta
-stripe.api_key = settings.STRIPE_SECRET_KEY
+logger = logging.getLogger(__name__)
 
 # --- ENDPOINT 1: CREAR INTENTO DE PAGO ---
 
@@ -38,43 +43,21 @@ class CreatePaymentIntentView(APIView):
         
         cart = cart_serializer.validated_data
         
-        # 2. Calcular el total y validar stock EN EL BACKEND
-        total_amount = 0
-        products_for_stripe_metadata = [] # Guardamos info para el webhook
-        
         try:
-            with transaction.atomic(): # Bloqueamos la DB para chequear stock
-                for item in cart:
-                    product = Product.objects.select_for_update().get(id=item['product_id'])
-                    
-                    if product.stock < item['quantity']:
-                        return Response({"error": f"Stock insuficiente para {product.name}"}, status=status.HTTP_400_BAD_REQUEST)
-                    
-                    total_amount += product.price * item['quantity']
-                    products_for_stripe_metadata.append({
-                        "id": product.id,
-                        "name": product.name,
-                        "quantity": item['quantity'],
-                        "price": str(product.price) # Guardamos como string
-                    })
-
-            # 3. Crear el Intento de Pago en Stripe
-            # Stripe maneja centavos, así que multiplicamos por 100
-            intent = stripe.PaymentIntent.create(
-                amount=int(total_amount * 100),
-                currency='bob', # O 'bob', 'mxn', etc.
-                metadata={
-                    "user_id": request.user.id,
-                    "cart": json.dumps(products_for_stripe_metadata) # Guardamos el carrito
-                },
-                payment_method_types=['card']
-            )
+            # 2. Calcular el total y validar stock EN EL BACKEND (una consulta
+            # para todo el carrito) y guardar el carrito cotizado
+            snapshot = snapshot_cart(request.user, cart)
+
+            # 3. Crear el Intento de Pago (Stripe o el backend de settings.PAYMENTS)
+            intent = get_gateway().create_payment_intent(snapshot)
             
             # 4. Devolver el 'client_secret' al frontend
             return Response({
                 'clientSecret': intent.client_secret
             }, status=status.HTTP_200_OK)
             
+        except InsufficientStock as e:
+            return Response({"error": f"Stock insuficiente para {e}"}, status=status.HTTP_400_BAD_REQUEST)
         except Product.DoesNotExist:
             return Response({"error": "Uno o más productos no fueron encontrados"}, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
@@ -92,14 +75,11 @@ class StripeWebhookView(APIView):
     def post(self, request, *args, **kwargs):
         payload = request.body
         sig_header = request.META.get('HTTP_STRIPE_SIGNATURE')
-        webhook_secret = settings.STRIPE_WEBHOOK_SECRET
         event = None
 
         # 1. Verificar la firma del Webhook (¡Seguridad!)
         try:
-            event = stripe.Webhook.construct_event(
-                payload, sig_header, webhook_secret
-            )
+            event = get_gateway().construct_event(payload, sig_header)
         except ValueError:
             return Response(status=status.HTTP_400_BAD_REQUEST) # Payload inválido
         except stripe.error.SignatureVerificationError:
@@ -108,69 +88,95 @@ class StripeWebhookView(APIView):
         # 2. Manejar el evento de "Pago Exitoso"
         if event['type'] == 'payment_intent.succeeded':
             payment_intent = event['data']['object']
-            metadata = payment_intent['metadata']
-            user_id = metadata['user_id']
-            cart = json.loads(metadata['cart'])
-            total_amount = payment_intent['amount'] / 100
+            user_id = payment_intent['metadata']['user_id']
 
-            # --- ¡ARREGLO AQUÍ! ---
-            # Define la lista ANTES del bloque 'try'
-            products_to_check_stock = []
-            # --- FIN DEL ARREGLO ---
+            # Stripe reintenta los webhooks: si la venta ya existe no se repite
+            if Sale.objects.filter(stripe_payment_intent_id=payment_intent.id).exists():
+                return Response(status=status.HTTP_200_OK)
 
             try:
+                snapshot, cart, total_amount = _cart_from_intent(payment_intent)
+
                 # 3. ¡Transacción Atómica!
                 with transaction.atomic():
                     
                     # A. Crear la Venta (Sale)
+                    sale_lines = []
                     sale = Sale.objects.create(
                         user_id=user_id,
                         total_amount=total_amount,
                         status=Sale.SaleStatus.COMPLETED,
                         stripe_payment_intent_id=payment_intent.id
                     )
+
+                    # Todos los productos del carrito en una consulta (sin bloquear:
+                    # el stock se descuenta con UPDATE condicional más abajo)
+                    products = Product.objects.select_related('warranty').in_bulk(
+                        [item['id'] for item in cart]
+                    )
+                    details = []
                     
                     for item in cart:
-                        product = Product.objects.select_for_update().get(id=item['id'])
+                        product = products[item['id']]
 
-                        # B. Crear el Detalle de Venta (SaleDetail)
-                        SaleDetail.objects.create(
+                        # B. Detalle de Venta (SaleDetail), se insertan juntos
+                        details.append(SaleDetail(
                             sale=sale,
                             product=product,
                             quantity=item['quantity'],
                             price_at_purchase=item['price']
-                        )
-                        
-                        # C. Activar la Garantía
-                        if product.warranty:
-                            ActivatedWarranty.objects.create(
-                                user_id=user_id,
-                                product=product,
-                                sale=sale,
-                                warranty_template=product.warranty
-                            )
-
-                        # D. Reducir el Stock
-                        product.stock -= item['quantity']
-                        product.save()
+                        ))
                         
-                        # Añade el producto actualizado a la lista
-                        products_to_check_stock.append(product)
+                        sale_lines.append((product.name, item['quantity']))
+
+                    SaleDetail.objects.bulk_create(details)
+
+                    # C. Activar las Garantías (una inserción para todo el carrito)
+                    activate_for_sale(sale, [products[item['id']] for item in cart])
+
+                    # D. Resumen desnormalizado para listados y reportes
+                    sale.item_count, sale.line_summary = Sale.summarize_lines(sale_lines)
+                    sale.save(update_fields=['item_count', 'line_summary'])
+
+                    if snapshot is not None:
+                        snapshot.sale = sale
+                        snapshot.save(update_fields=['sale'])
+
+                    # E. Reducir el Stock (UPDATE condicional + movimiento en el
+                    # libro). Va al final: el bloqueo de la fila de stock dura
+                    # solo hasta el commit
+                    record_sale(sale, [(item['id'], item['quantity']) for item in cart])
 
                 # --- ¡FIN DE LA TRANSACCIÓN ATÓMICA! ---
                 
                 # --- 4. VERIFICAR STOCK Y ENVIAR ALERTA (FUERA DE LA TRANSACCIÓN) ---
-                # Ahora 'products_to_check_stock' SÍ está definida
-                for product in products_to_check_stock:
-                    if product.stock <= 10:
-                        send_low_stock_alert(product)
+                for product in low_stock_products(list(products)):
+                    send_low_stock_alert(product)
 
-            except Exception as e:
-                print(f"Error procesando webhook: {e}")
+            except OutOfStock as e:
+                # Pago cobrado sin stock: 500 para que Stripe reintente (p. ej. tras reponer)
+                logger.error("Sin stock del producto %s para el pago %s", e, payment_intent.id)
+                return Response(status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            except Exception:
+                logger.exception("Error procesando webhook para %s", payment_intent.id)
                 return Response(status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
         # 5. Confirmar a Stripe que recibimos el evento
         return Response(status=status.HTTP_200_OK)
+
+
+def _cart_from_intent(payment_intent):
+    """
+    (snapshot, líneas, total) de un PaymentIntent pagado. Los intents creados
+    antes de ``CartSnapshot`` traen el carrito serializado en metadata.
+    """
+    metadata = payment_intent['metadata']
+    snapshot_id = metadata.get('cart_snapshot_id')
+    if snapshot_id:
+        snapshot = CartSnapshot.objects.get(pk=snapshot_id)
+        return snapshot, snapshot.lines, snapshot.total_amount
+    return None, json.loads(metadata['cart']), payment_intent['amount'] / 100
+
 # --- ENDPOINTS 3 y 4: VER COMPRAS Y RECIBOS ---
 
 class MyPurchasesListView(generics.ListAPIView):
@@ -207,12 +213,67 @@ class MyWarrantiesListView(generics.ListAPIView):
     serializer_class = ActivatedWarrantySerializer
 
     def get_queryset(self):
+        # Índice (user, expiration_date): el orden sale del índice, sin sort
         return ActivatedWarranty.objects.filter(
             user=self.request.user
         ).select_related(
-            'product', 'sale'
+            'product'
         ).order_by('expiration_date') # Ordena por las que expiran pronto
 
+
+def _expiring_days(request, default=30, maximum=365):
+    """ ?days= de los endpoints de "por vencer" (1..maximum). """
+    value = request.query_params.get('days', default)
+    try:
+        days = int(value)
+    except (TypeError, ValueError):
+        raise ValidationError({'days': "Debe ser un número entero."})
+    if not 1 <= days <= maximum:
+        raise ValidationError({'days': f"Debe estar entre 1 y {maximum}."})
+    return days
+
+
+class MyExpiringWarrantiesView(generics.ListAPIView):
+    """ Garantías del usuario logueado que vencen en los próximos ?days= días (30 por defecto). """
+    permission_classes = [IsAuthenticated]
+    serializer_class = ActivatedWarrantySerializer
+
+    def get_queryset(self):
+        return ActivatedWarranty.objects.filter(user=self.request.user) \
+            .expiring_within(_expiring_days(self.request)) \
+            .select_related('product').order_by('expiration_date')
+
+
+class AdminExpiringWarrantiesView(ReplicaReadMixin, generics.ListAPIView):
+    """
+    (Solo Admin) Todas las garantías que vencen en los próximos ?days= días,
+    por fecha de vencimiento (índice sobre expiration_date). Base de los
+    correos de recordatorio.
+    """
+    permission_classes = [IsAdminUser]
+    serializer_class = ExpiringWarrantySerializer
+
+    def get_queryset(self):
+        return ActivatedWarranty.objects.expiring_within(_expiring_days(self.request)) \
+            .select_related('product', 'user').order_by('expiration_date', 'id')
+
+
+class AdminExpiringSummaryView(ReplicaReadMixin, APIView):
+    """
+    (Solo Admin) Cantidad de garantías que vencen por día en los próximos
+    ?days= días (90 por defecto), desde los buckets diarios precalculados.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        days = _expiring_days(request, default=90)
+        by_day = expiring_summary(days)
+        return Response({
+            'days': days,
+            'total': sum(count for _, count in by_day),
+            'by_day': [{'day': day, 'count': count} for day, count in by_day],
+        })
+
 class AdminSaleListView(generics.ListAPIView):
     """
     (Solo Admin) Devuelve una lista de TODAS las ventas
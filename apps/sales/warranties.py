@@ -0,0 +1,142 @@
+# apps/sales/warranties.py
+"""
+Activación de garantías en bloque y consultas de "por vencer".
+
+``ActivatedWarranty.save()`` calcula el vencimiento fila por fila (una
+lectura de la plantilla por garantía). Aquí las duraciones salen de un solo
+mapa {plantilla: días}, los vencimientos se calculan con numpy para todo el
+lote y las filas se insertan con ``bulk_create``.
+"""
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.db.models import Count
+from django.utils import timezone
+
+from apps.products.models import Warranty
+from core.lazy import lazy_module
+from .models import ActivatedWarranty, WarrantyExpirationBucket
+
+BATCH_SIZE = 2_000
+
+# Se importa en la primera activación, no al cargar las URLs (views -> warranties)
+np = lazy_module('numpy')
+
+
+@dataclass(frozen=True)
+class WarrantyActivation:
+    user_id: int
+    product_id: int
+    sale_id: int
+    warranty_template_id: int
+
+
+def duration_map(template_ids):
+    """ {plantilla: duration_days} en una consulta. """
+    return dict(Warranty.objects.filter(id__in=set(template_ids)).values_list('id', 'duration_days'))
+
+
+def expiration_dates(start_date, durations_days):
+    """ Vencimientos (``date``) de ``start_date + días`` para todo el lote. """
+    days = np.asarray(durations_days, dtype='timedelta64[D]')
+    return (np.datetime64(start_date, 'D') + days).astype(object).tolist()
+
+
+def bulk_activate(activations, durations=None):
+    """
+    Crea las ``ActivatedWarranty`` de ``activations`` (iterable de
+    ``WarrantyActivation``) con inserciones por lotes, con inicio hoy.
+    ``durations`` permite pasar el mapa ya cargado (p. ej. desde
+    ``product.warranty``).
+    """
+    activations = list(activations)
+    if not activations:
+        return []
+    # start_date es auto_now_add (bulk_create lo pone en hoy): el vencimiento
+    # se calcula desde el mismo día, como en ActivatedWarranty.save()
+    start_date = timezone.now().date()
+    if durations is None:
+        durations = duration_map(a.warranty_template_id for a in activations)
+
+    expirations = expiration_dates(start_date, [durations[a.warranty_template_id] for a in activations])
+    warranties = [
+        ActivatedWarranty(
+            user_id=a.user_id,
+            product_id=a.product_id,
+            sale_id=a.sale_id,
+            warranty_template_id=a.warranty_template_id,
+            expiration_date=expiration,
+        )
+        for a, expiration in zip(activations, expirations)
+    ]
+    return ActivatedWarranty.objects.bulk_create(warranties, batch_size=BATCH_SIZE)
+
+
+def activate_for_sale(sale, products):
+    """
+    Una garantía por producto con plantilla (mismo criterio que el webhook).
+    ``products`` debe venir con ``select_related('warranty')``: las
+    duraciones se toman de ahí, sin más consultas.
+    """
+    with_warranty = [product for product in products if product.warranty_id]
+    return bulk_activate(
+        (WarrantyActivation(sale.user_id, product.id, sale.id, product.warranty_id) for product in with_warranty),
+        durations={product.warranty_id: product.warranty.duration_days for product in with_warranty},
+    )
+
+
+# --- Por vencer ---
+
+def expiring_window(days, today=None):
+    today = today or timezone.localdate()
+    return today, today + timedelta(days=days)
+
+
+def _days(start, end):
+    return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+def _count_by_day(start, end):
+    return dict(
+        ActivatedWarranty.objects.filter(expiration_date__gte=start, expiration_date__lte=end)
+        .values('expiration_date').annotate(n=Count('id')).values_list('expiration_date', 'n')
+    )
+
+
+def expiring_summary(days, today=None):
+    """
+    [(fecha, cantidad)] de garantías que vencen en los próximos ``days``
+    días, desde los buckets diarios. Si falta algún día (bucket aún no
+    calculado) se cuenta en vivo ese tramo.
+    """
+    start, end = expiring_window(days, today)
+    counts = dict(
+        WarrantyExpirationBucket.objects.filter(day__gte=start, day__lte=end).values_list('day', 'count')
+    )
+    missing = [day for day in _days(start, end) if day not in counts]
+    if missing:
+        live = _count_by_day(missing[0], missing[-1])
+        for day in missing:
+            counts[day] = live.get(day, 0)
+    return [(day, counts[day]) for day in _days(start, end)]
+
+
+def refresh_buckets(horizon_days, today=None):
+    """
+    Recalcula los buckets de ``today`` a ``today + horizon_days`` con un
+    GROUP BY sobre el índice de expiration_date y borra los pasados.
+    Devuelve (buckets escritos, buckets borrados).
+    """
+    start, end = expiring_window(horizon_days, today)
+    counts = _count_by_day(start, end)
+    now = timezone.now()
+    buckets = [
+        WarrantyExpirationBucket(day=day, count=counts.get(day, 0), refreshed_at=now)
+        for day in _days(start, end)
+    ]
+    WarrantyExpirationBucket.objects.bulk_create(
+        buckets, update_conflicts=True, unique_fields=['day'], update_fields=['count', 'refreshed_at'],
+    )
+    deleted, _ = WarrantyExpirationBucket.objects.filter(day__lt=start).delete()
+    return len(buckets), deleted
+
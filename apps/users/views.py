@@ -7,6 +7,7 @@ from rest_framework_simplejwt.views import (
     TokenRefreshView,
 )
 from rest_framework.permissions import IsAdminUser
+from core.db_router import ReplicaReadMixin
 
 class RegisterView(generics.CreateAPIView):
     queryset = User.objects.all()
@@ -27,7 +28,7 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
 class CustomTokenObtainPairView(BaseTokenObtainPairView):
     pass
 
-class CustomerListView(generics.ListAPIView):
+class CustomerListView(ReplicaReadMixin, generics.ListAPIView):
     """
     Endpoint (Solo Admin) para listar todos los usuarios
     que tienen el rol de 'CUSTOMER'.
@@ -3,6 +3,7 @@ import os
 from dotenv import load_dotenv
 import dj_database_url
 from datetime import timedelta
+from core.structured_logging import parse_sample_rates
 
 # Cargar .env
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -49,9 +50,15 @@ INSTALLED_APPS = [
     'apps.sales',
     'apps.reports',
     'apps.ai',
+    'apps.inventory',
+    'apps.analytics',
+
+    'core',
 ]
 
 MIDDLEWARE = [
+    'core.structured_logging.RequestIdMiddleware',
+    'core.instrumentation.RequestMetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -84,10 +91,33 @@ WSGI_APPLICATION = 'config.wsgi.application'
 ASGI_APPLICATION = 'config.asgi.application'
 
 # Base de datos usando dj-database-url (espera una URL en DATABASE_URL)
+# DB_POOL=True usa el pool de psycopg 3 (una conexión TLS se reutiliza entre
+# peticiones); en ese caso Django exige conn_max_age=0.
+DB_POOL = os.getenv('DB_POOL', 'False') == 'True'
+DB_POOL_OPTIONS = {
+    'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '2')),
+    'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+    'timeout': float(os.getenv('DB_POOL_TIMEOUT', '10')),
+}
+
+
+def database_from_url(url):
+    is_postgres = url.startswith(('postgres://', 'postgresql://'))
+    config = dj_database_url.parse(
+        url,
+        conn_max_age=0 if DB_POOL else int(os.getenv('DB_CONN_MAX_AGE', '600')),
+        conn_health_checks=not DB_POOL,
+        ssl_require=is_postgres and os.getenv('DB_SSL_REQUIRE', 'True') == 'True',
+    )
+    if DB_POOL and is_postgres:
+        config.setdefault('OPTIONS', {})['pool'] = dict(DB_POOL_OPTIONS)
+    return config
+
+
 DATABASE_URL = os.getenv('DATABASE_URL')
 if DATABASE_URL:
     DATABASES = {
-        'default': dj_database_url.parse(DATABASE_URL, conn_max_age=600, ssl_require=True)
+        'default': database_from_url(DATABASE_URL)
     }
 else:
     # Fallback (solo para desarrollo rápido)
@@ -98,6 +128,20 @@ else:
         }
     }
 
+# Réplica de solo lectura (opcional). Las vistas tolerantes a retraso leen de
+# aquí mediante core.db_router; las escrituras siempre van a 'default'.
+DATABASE_REPLICA_URL = os.getenv('DATABASE_REPLICA_URL')
+if DATABASE_REPLICA_URL:
+    DATABASES['replica'] = database_from_url(DATABASE_REPLICA_URL)
+    # En los tests la réplica apunta a la misma base de datos de prueba
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+
+DATABASE_ROUTERS = ['core.db_router.ReplicaRouter']
+
+# Los índices con INCLUDE (apps/sales/models.py) solo cubren en PostgreSQL;
+# en SQLite se crean sin las columnas extra, que es lo esperado.
+SILENCED_SYSTEM_CHECKS = ['models.W040']
+
 # Contraseñas y validaciones (por defecto)
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -143,6 +187,51 @@ SIMPLE_JWT = {
 STRIPE_PUBLIC_KEY = os.getenv('STRIPE_PUBLIC_KEY')
 STRIPE_SECRET_KEY = os.getenv('STRIPE_SECRET_KEY')
 STRIPE_WEBHOOK_SECRET = os.getenv('STRIPE_WEBHOOK_SECRET')
+# URL base de la API de Stripe (None = api.stripe.com); permite apuntar a un stub
+STRIPE_API_BASE = os.getenv('STRIPE_API_BASE')
+
+# Pasarela de pagos (apps/sales/payments.py). Con
+# PAYMENTS_BACKEND=apps.sales.payments.FakeStripeGateway todo el ciclo
+# checkout -> webhook corre en proceso, sin Stripe.
+PAYMENTS = {
+    'BACKEND': os.getenv('PAYMENTS_BACKEND', 'apps.sales.payments.StripeGateway'),
+    'CURRENCY': os.getenv('PAYMENTS_CURRENCY', 'bob'),
+    'CONNECT_TIMEOUT': float(os.getenv('STRIPE_CONNECT_TIMEOUT', '2')),
+    'TIMEOUT': float(os.getenv('STRIPE_TIMEOUT', '10')),
+    'MAX_RETRIES': int(os.getenv('STRIPE_MAX_RETRIES', '2')),
+    'IDEMPOTENCY_WINDOW_SECONDS': int(os.getenv('PAYMENTS_IDEMPOTENCY_WINDOW', '120')),
+}
+
+# Gemini (las vistas async lo llaman por REST con httpx)
+GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
+GEMINI_API_BASE = os.getenv('GEMINI_API_BASE', 'https://generativelanguage.googleapis.com')
+GEMINI_MODEL = os.getenv('GEMINI_MODEL', 'gemini-2.5-flash')
+
+# Supabase Storage (imágenes de productos)
+SUPABASE_URL = os.getenv('SUPABASE_URL')
+SUPABASE_KEY = os.getenv('SUPABASE_KEY')
+SUPABASE_PRODUCT_BUCKET = os.getenv('SUPABASE_PRODUCT_BUCKET', 'products_image')
+
+# Cliente HTTP async compartido para servicios externos (core/http.py)
+UPSTREAM_HTTP = {
+    'TIMEOUT': float(os.getenv('UPSTREAM_TIMEOUT', '15')),
+    'CONNECT_TIMEOUT': float(os.getenv('UPSTREAM_CONNECT_TIMEOUT', '3')),
+    'MAX_CONNECTIONS': int(os.getenv('UPSTREAM_MAX_CONNECTIONS', '100')),
+    'MAX_KEEPALIVE_CONNECTIONS': int(os.getenv('UPSTREAM_MAX_KEEPALIVE', '20')),
+}
+
+# Monitoreo del modelo de ventas (apps/ai/monitoring.py)
+AI_MONITORING = {
+    'FLUSH_SECONDS': float(os.getenv('AI_PREDICTION_FLUSH_SECONDS', '5')),
+    'MAPE_THRESHOLD': float(os.getenv('AI_MAPE_THRESHOLD', '0.25')),
+    'MIN_MONTHS': int(os.getenv('AI_MIN_MONTHS', '2')),
+    'AUTO_RETRAIN': os.getenv('AI_AUTO_RETRAIN', 'True') == 'True',
+}
+
+# Recursos que el master de gunicorn carga antes del fork (core/warmup.py)
+WARMUP = {
+    'ENABLED': os.getenv('WARMUP_ENABLED', 'True') == 'True',
+}
 
 
 # Permite que cualquier dominio acceda a tu API
@@ -153,5 +242,47 @@ CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_HEADERS = ["*"]
 
 
+# Instrumentación de peticiones (ver core/instrumentation.py)
+INSTRUMENTATION = {
+    'ENABLED': os.getenv('INSTRUMENTATION_ENABLED', 'True') == 'True',
+    'SLOW_REQUEST_MS': int(os.getenv('SLOW_REQUEST_MS', '1000')),
+    'DUPLICATE_QUERY_THRESHOLD': int(os.getenv('DUPLICATE_QUERY_THRESHOLD', '5')),
+    # Fracción de peticiones perfiladas con cProfile (solo se guardan las lentas)
+    'PROFILE_SAMPLE_RATE': float(os.getenv('PROFILE_SAMPLE_RATE', '0')),
+    'PROFILE_DIR': os.getenv('PROFILE_DIR', str(BASE_DIR / 'profiles')),
+    'SERVER_TIMING': DEBUG,
+}
+
+
+# Logging estructurado: el formato final y la escritura ocurren fuera del hilo
+# de la petición (ver core/structured_logging.py)
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'filters': {
+        'request_id': {'()': 'core.structured_logging.RequestIdFilter'},
+        # Ej.: LOG_SAMPLE_RATES="apps.reports=0.1,core.instrumentation=0.5"
+        'sampling': {
+            '()': 'core.structured_logging.SamplingFilter',
+            'rates': parse_sample_rates(os.getenv('LOG_SAMPLE_RATES')),
+        },
+    },
+    'handlers': {
+        'console': {
+            'class': 'core.structured_logging.AsyncQueueHandler',
+            'json': os.getenv('LOG_FORMAT', 'text') == 'json',
+            'filters': ['request_id', 'sampling'],
+        },
+    },
+    'root': {'handlers': ['console'], 'level': 'WARNING'},
+    'loggers': {
+        'apps': {'level': LOG_LEVEL},
+        'core': {'level': LOG_LEVEL},
+        'django': {'level': 'INFO'},
+    },
+}
+
+
 # Usuario personalizado
 AUTH_USER_MODEL = 'users.User'
\ No newline at end of file
@@ -1,12 +1,20 @@
 # config/supabase_client.py
+"""
+Cliente de supabase-py. Se crea en el primer uso (o en el warm-up del
+master de gunicorn, ver core/warmup.py), no al importar el módulo.
+"""
 import os
-from supabase import create_client, Client
-from django.conf import settings
+from functools import lru_cache
 
-SUPABASE_URL = os.getenv('SUPABASE_URL')
-SUPABASE_KEY = os.getenv('SUPABASE_KEY')
 
-if not SUPABASE_URL or not SUPABASE_KEY:
-    raise ValueError("SUPABASE_URL y SUPABASE_KEY deben estar en el .env")
 
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
\ No newline at end of file
+@lru_cache(maxsize=None)
+def get_supabase():
+    url = os.getenv('SUPABASE_URL')
+    key = os.getenv('SUPABASE_KEY')
+    if not url or not key:
+        raise ValueError("SUPABASE_URL y SUPABASE_KEY deben estar en el .env")
+    # supabase-py (y sus dependencias) se importa recién aquí: ~0.4 s de arranque
+    from supabase import create_client
+
+    return create_client(url, key)
@@ -1,5 +1,6 @@
 from django.contrib import admin
 from django.urls import path, include
+from core.views import MetricsView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -9,10 +10,17 @@ urlpatterns = [
     path('api/sales/', include('apps.sales.urls')),
     path('api/reports/', include('apps.reports.urls')),
     path('api/ai/', include('apps.ai.urls')),
+    path('api/inventory/', include('apps.inventory.urls')),
+    path('api/analytics/', include('apps.analytics.urls')),
 
     path('api/v1/users/', include('apps.users.urls')),
     path('api/v1/catalog/', include('apps.products.urls')),
     path('api/v1/sales/', include('apps.sales.urls')),
     path('api/v1/ai/', include('apps.ai.urls')),
     path('api/v1/reports/', include('apps.reports.urls')),
+    path('api/v1/inventory/', include('apps.inventory.urls')),
+    path('api/v1/analytics/', include('apps.analytics.urls')),
+
+    # Métricas de rendimiento (Prometheus)
+    path('api/metrics/', MetricsView.as_view(), name='metrics'),
 ]
@@ -0,0 +1,65 @@
+# core/async_views.py
+"""
+Base para vistas async. DRF (3.16) no soporta vistas ``async def``, así que
+estas vistas son ``View`` de Django con handlers async que reutilizan la
+autenticación y los permisos de DRF (que tocan la BD) vía ``sync_to_async``.
+
+Solo tiene sentido para endpoints que pasan la mayor parte del tiempo
+esperando a un servicio externo; bajo ASGI (uvicorn) el worker atiende
+otras peticiones mientras tanto.
+"""
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.utils.decorators import classonlymethod
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+
+def json_response(data, status=200):
+    return JsonResponse(data, status=status, encoder=JSONEncoder, safe=False)
+
+
+class AsyncAPIView(View):
+    authentication_classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES
+    permission_classes = api_settings.DEFAULT_PERMISSION_CLASSES
+    parser_classes = api_settings.DEFAULT_PARSER_CLASSES
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        # Autenticación por JWT, como las vistas de DRF (que también son csrf_exempt)
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    def get_request(self, request):
+        return Request(
+            request,
+            parsers=[parser() for parser in self.parser_classes],
+            authenticators=[auth() for auth in self.authentication_classes],
+        )
+
+    def check_permissions(self, request):
+        """ Igual que APIView.check_permissions (fuerza la autenticación). """
+        for permission in [permission() for permission in self.permission_classes]:
+            if not permission.has_permission(request, self):
+                if request.authenticators and not request.successful_authenticator:
+                    raise exceptions.NotAuthenticated()
+                raise exceptions.PermissionDenied(getattr(permission, 'message', None))
+
+    async def dispatch(self, request, *args, **kwargs):
+        method = request.method.lower()
+        handler = getattr(self, method, None) if method in self.http_method_names else None
+        if handler is None:
+            return await self.http_method_not_allowed(request, *args, **kwargs)
+
+        request = self.get_request(request)
+        self.request = request
+        try:
+            await sync_to_async(self.check_permissions)(request)
+            # request.data se parsea aquí (multipart puede tocar disco)
+            await sync_to_async(lambda: request.data)()
+        except exceptions.APIException as exc:
+            return json_response({'detail': exc.detail}, status=exc.status_code)
+        return await handler(request, *args, **kwargs)
@@ -0,0 +1,35 @@
+# core/benchmarks
+"""
+Benchmarks reproducibles. Cada suite se registra con ``@register('nombre')``
+y recibe un ``BenchmarkContext`` (ver ``harness.py``).
+"""
+import importlib
+
+SUITES = {}
+
+# Módulos que definen suites (se importan bajo demanda)
+SUITE_MODULES = [
+    'core.benchmarks.api',
+    'core.benchmarks.filters',
+    'core.benchmarks.async_load',
+    'core.benchmarks.checkout',
+    'core.benchmarks.reminders',
+    'core.benchmarks.inventory',
+    'core.benchmarks.analytics',
+    'core.benchmarks.recommendations',
+    'core.benchmarks.ai_dataset',
+    'core.benchmarks.ai_model',
+]
+
+
+def register(name):
+    def decorator(func):
+        SUITES[name] = func
+        return func
+    return decorator
+
+
+def load_suites():
+    for module in SUITE_MODULES:
+        importlib.import_module(module)
+    return SUITES
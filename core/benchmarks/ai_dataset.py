@@ -0,0 +1,44 @@
+# core/benchmarks/ai_dataset.py
+"""
+Suite 'ai_dataset': dataset de entrenamiento del modelo de ventas.
+
+- ``legacy``: lo que hacía ``create_training_dataset`` antes: todas las
+  ventas completadas a un DataFrame y ``resample`` mensual en pandas.
+- ``sql``: ``apps/ai/features.build_training_frame`` (agregados en la base).
+
+La memoria pico de ``legacy`` crece con las ventas; la de ``sql`` depende
+solo de meses, días y categorías. Pensada para ``--scale 5000000``.
+"""
+import pandas as pd
+
+from apps.ai.features import build_training_frame, monthly_totals
+from apps.sales.models import Sale
+from . import register
+from .fixtures import seed_dataset
+
+ITERATIONS = 3
+
+
+def _legacy_monthly():
+    sales = Sale.objects.filter(status=Sale.SaleStatus.COMPLETED)
+    df = pd.DataFrame(list(sales.values('created_at', 'total_amount')))
+    df['created_at'] = pd.to_datetime(df['created_at'])
+    monthly = df.set_index('created_at')['total_amount'].resample('MS').sum().reset_index()
+    monthly.columns = ['date', 'total_sales']
+    for lag in (1, 2, 3):
+        monthly[f'sales_lag_{lag}'] = monthly['total_sales'].shift(lag)
+    return monthly.dropna()
+
+
+@register('ai_dataset')
+def run_ai_dataset_suite(context):
+    seed_dataset(context)
+    iterations = min(context.iterations, ITERATIONS)
+    context.measure('ai_dataset.monthly.legacy', lambda i: _legacy_monthly(), iterations=iterations)
+    context.measure('ai_dataset.monthly.sql', lambda i: monthly_totals(), iterations=iterations)
+    context.measure('ai_dataset.training_frame.sql', lambda i: build_training_frame(), iterations=iterations)
+
+    legacy = _legacy_monthly().set_index('date')['total_sales'].astype(float).round(2)
+    current = monthly_totals()['total_sales'].round(2)
+    context.record('ai_dataset.consistency', months=len(current),
+                   ok=legacy.values.tolist() == current.values.tolist()[-len(legacy):])
@@ -0,0 +1,129 @@
+# core/benchmarks/ai_model.py
+"""
+Suite 'ai_model': formatos del archivo del modelo de ventas
+(``apps/ai/artifacts.py``).
+
+Se entrena un ``RandomForestRegressor`` sintético del tamaño del de
+producción (100 árboles) y se guarda en cada formato. Para cada uno se
+levantan ``WORKERS`` procesos con fork (como los workers de gunicorn) que
+cargan el modelo a la vez y reportan:
+
+- ``load_ms``: carga con validación del manifiesto.
+- ``rss_mb``: crecimiento del RSS del worker al cargar y predecir.
+- ``pss_mb``: lo mismo en PSS con todos los workers vivos: las páginas
+  compartidas (mmap) se dividen entre ellos, así que es lo que cuesta de
+  verdad cada worker adicional.
+- ``predict_ms`` (una fila) y ``batch_ms`` (``BATCH_ROWS`` filas).
+- ``max_diff``: diferencia máxima contra el modelo original.
+"""
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from apps.ai import artifacts
+from core.warmup import memory_kb
+from . import register
+from .harness import percentile
+
+WORKERS = 4
+TRAIN_ROWS = 5_000
+FEATURES = 8
+TREES = 100
+BATCH_ROWS = 1_000
+PREDICT_REPEATS = 50
+
+VARIANTS = [
+    ('pickle', {'fmt': 'pickle'}),
+    ('compressed', {'fmt': 'compressed'}),
+    ('mmap', {'fmt': 'mmap'}),
+    ('mmap_quantized', {'fmt': 'mmap', 'quantize': True, 'leaf_decimals': 2}),
+    ('mmap_pruned', {'fmt': 'mmap', 'max_depth': 12, 'quantize': True, 'leaf_decimals': 2}),
+]
+
+
+def _worker(directory, X, barrier, results):
+    barrier.wait()  # base medida con todos los workers ya creados
+    rss_before = memory_kb('VmRSS', 'status')
+    pss_before = memory_kb('Pss', 'smaps_rollup')
+    started = time.perf_counter()
+    model, _, _ = artifacts.load(directory)
+    load_ms = (time.perf_counter() - started) * 1000
+
+    single = []
+    for i in range(PREDICT_REPEATS):
+        started = time.perf_counter()
+        model.predict(X[i:i + 1])
+        single.append((time.perf_counter() - started) * 1000)
+    started = time.perf_counter()
+    predictions = model.predict(X)
+    batch_ms = (time.perf_counter() - started) * 1000
+
+    barrier.wait()  # todos los workers con el modelo cargado
+    rss_after = memory_kb('VmRSS', 'status')
+    pss_after = memory_kb('Pss', 'smaps_rollup')
+    barrier.wait()  # nadie termina antes de que todos midan
+    single.sort()
+    results.put({
+        'load_ms': load_ms,
+        'predict_ms': percentile(single, 50),
+        'batch_ms': batch_ms,
+        'rss_kb': rss_after - rss_before if rss_before is not None else None,
+        'pss_kb': pss_after - pss_before if pss_before is not None else None,
+        'predictions': predictions,
+    })
+
+
+def _run_workers(directory, X):
+    context = multiprocessing.get_context('fork')
+    barrier = context.Barrier(WORKERS)
+    results = context.Queue()
+    processes = [context.Process(target=_worker, args=(directory, X, barrier, results)) for _ in range(WORKERS)]
+    for process in processes:
+        process.start()
+    rows = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return rows
+
+
+def _mb(values):
+    values = [value for value in values if value is not None]
+    return round(sum(values) / len(values) / 1024, 1) if values else None
+
+
+@register('ai_model')
+def run_ai_model_suite(context):
+    from sklearn.ensemble import RandomForestRegressor
+
+    rng = np.random.default_rng(context.seed)
+    X_train = rng.normal(size=(TRAIN_ROWS, FEATURES))
+    y_train = X_train @ rng.normal(size=FEATURES) * 10_000 + rng.normal(scale=5_000, size=TRAIN_ROWS)
+    model = RandomForestRegressor(n_estimators=TREES, random_state=context.seed, n_jobs=-1).fit(X_train, y_train)
+    X = rng.normal(size=(BATCH_ROWS, FEATURES))
+    expected = model.predict(X)
+    columns = [f'f{i}' for i in range(FEATURES)]
+    context.log(f"Bosque sintético: {TREES} árboles, {sum(e.tree_.node_count for e in model.estimators_)} nodos, "
+                f"{WORKERS} workers por formato")
+
+    for name, options in VARIANTS:
+        directory = tempfile.mkdtemp(prefix='ai-model-')
+        try:
+            artifacts.save(model, columns, directory, **options)
+            size = os.path.getsize(os.path.join(directory, artifacts.MODEL_NAME))
+            rows = _run_workers(directory, X)
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+        context.record(
+            f'ai_model.{name}',
+            file_mb=round(size / 1024 / 1024, 1),
+            load_ms=round(percentile(sorted(row['load_ms'] for row in rows), 50), 1),
+            rss_mb=_mb(row['rss_kb'] for row in rows),
+            pss_mb=_mb(row['pss_kb'] for row in rows),
+            predict_ms=round(percentile(sorted(row['predict_ms'] for row in rows), 50), 3),
+            batch_ms=round(percentile(sorted(row['batch_ms'] for row in rows), 50), 2),
+            max_diff=round(float(np.abs(rows[0]['predictions'] - expected).max()), 4),
+        )
@@ -0,0 +1,80 @@
+# core/benchmarks/analytics.py
+"""
+Suite 'analytics': rankings y distribuciones desde los agregados de
+``apps/analytics`` (y la matriz de cohortes) frente al GROUP BY sobre SaleDetail / Sale que hacían
+los exports. Con ``--scale`` alto la consulta directa crece con las ventas;
+la de los agregados solo con días x productos.
+"""
+import time
+from datetime import timedelta
+
+from django.db.models import Count, Sum
+from rest_framework.test import APIClient
+
+from apps.analytics import cohorts
+from apps.analytics.rollups import LINE_REVENUE, rebuild, refresh
+from apps.sales.models import Sale, SaleDetail
+from . import register
+from .fixtures import seed_dataset
+
+API = '/api/v1/analytics'
+WINDOWS = (30, 365)
+
+
+def _direct_top_products(start, end, n=10):
+    return list(
+        SaleDetail.objects.filter(
+            sale__status=Sale.SaleStatus.COMPLETED,
+            sale__created_at__date__gte=start, sale__created_at__date__lte=end,
+        ).values('product_id').annotate(revenue=Sum(LINE_REVENUE)).order_by('-revenue')[:n]
+    )
+
+
+def _direct_baskets(start, end):
+    return list(
+        Sale.objects.filter(status=Sale.SaleStatus.COMPLETED, created_at__date__gte=start,
+                            created_at__date__lte=end)
+        .values('item_count').annotate(orders=Count('id')).order_by('item_count')
+    )
+
+
+@register('analytics')
+def run_analytics_suite(context):
+    dataset = seed_dataset(context)
+    client = APIClient()
+    client.force_authenticate(user=dataset.admin)
+    end = dataset.end_date
+
+    # now después del dataset: todas las ventas quedan fuera del margen de seguridad
+    now = Sale.objects.order_by('-created_at').values_list('created_at', flat=True).first() + timedelta(days=1)
+    started = time.perf_counter()
+    result = rebuild(now=now)
+    seconds = time.perf_counter() - started
+    context.record('analytics.rebuild', seconds=round(seconds, 3), sales=result.sales,
+                   sales_per_s=round(result.sales / seconds, 0), customers=result.customers_scored)
+    context.measure('analytics.refresh_noop', lambda i: refresh(now=now, score=False))
+
+    for days in WINDOWS:
+        start = end - timedelta(days=days)
+        params = {'fecha_inicio': start.isoformat(), 'fecha_fin': end.isoformat()}
+        context.measure(f'analytics.top_products_{days}d.direct', lambda i, s=start: _direct_top_products(s, end))
+        context.measure(f'analytics.top_products_{days}d.rollup',
+                        lambda i, p=params: client.get(f'{API}/top/products/', p))
+        context.measure(f'analytics.top_categories_{days}d.rollup',
+                        lambda i, p=params: client.get(f'{API}/top/categories/', {**p, 'metric': 'units'}))
+        context.measure(f'analytics.baskets_{days}d.direct', lambda i, s=start: _direct_baskets(s, end))
+        context.measure(f'analytics.baskets_{days}d.rollup',
+                        lambda i, p=params: client.get(f'{API}/baskets/distribution/', p))
+
+    context.measure('analytics.customer_segments', lambda i: client.get(f'{API}/customers/segments/'))
+
+    # Cohortes: cálculo completo (sin caché) y respuesta con la matriz en caché
+    context.measure('analytics.cohorts.compute', lambda i: (cohorts.clear_cache(), cohorts.cohort_matrix()))
+    context.measure('analytics.cohorts.cached', lambda i: client.get('/api/v1/ai/dashboard/cohorts/'))
+
+    # Los agregados deben dar lo mismo que la consulta directa
+    start = end - timedelta(days=365)
+    direct = [(row['product_id'], round(row['revenue'], 2)) for row in _direct_top_products(start, end)]
+    response = client.get(f'{API}/top/products/', {'fecha_inicio': start.isoformat(), 'fecha_fin': end.isoformat()})
+    rollup = [(row['id'], row['revenue']) for row in response.data['results']]
+    context.record('analytics.consistency', ok=direct == rollup, compared=len(direct))
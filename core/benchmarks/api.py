@@ -0,0 +1,118 @@
+# core/benchmarks/api.py
+"""
+Suite 'api': recorre las rutas reales de ``config/urls.py`` con el cliente
+de pruebas de DRF. Stripe se reemplaza por ``FakeStripeGateway`` y Gemini
+por una respuesta fija.
+"""
+import json
+import time
+from unittest import mock
+
+from django.test.utils import override_settings
+from rest_framework.test import APIClient
+
+from apps.products.models import Product
+from apps.sales.payments import get_gateway
+from . import register
+from .fixtures import seed_dataset
+
+API = '/api/v1'
+FAKE_PAYMENTS = {'BACKEND': 'apps.sales.payments.FakeStripeGateway'}
+
+
+def _client(user=None):
+    client = APIClient()
+    if user is not None:
+        client.force_authenticate(user=user)
+    return client
+
+
+def _webhook_payload(run_token, i, user_id, products):
+    # Carrito en metadata (formato anterior a CartSnapshot, que el webhook sigue aceptando)
+    cart = [
+        {'id': p.id, 'name': p.name, 'quantity': 1, 'price': str(p.price)}
+        for p in products
+    ]
+    amount = int(sum(p.price for p in products) * 100)
+    return json.dumps({
+        'id': f'evt_bench_{run_token}_{i}',
+        'type': 'payment_intent.succeeded',
+        'data': {'object': {
+            'id': f'pi_bench_{run_token}_{i}',
+            'object': 'payment_intent',
+            'amount': amount,
+            'metadata': {'user_id': str(user_id), 'cart': json.dumps(cart)},
+        }},
+    })
+
+
+@register('api')
+def run_api_suite(context):
+    dataset = seed_dataset(context)
+    admin = _client(dataset.admin)
+    customer = _client(dataset.customer)
+    anonymous = _client()
+    year, month = dataset.end_date.year, dataset.end_date.month
+    product_id = dataset.product_ids[0]
+    cart_products = list(Product.objects.filter(id__in=dataset.product_ids[:3]))
+    cart = [{'product_id': p.id, 'quantity': 1} for p in cart_products]
+
+    context.log("Catálogo")
+    context.measure('catalog.list', lambda i: anonymous.get(f'{API}/catalog/products/'))
+    context.measure('catalog.detail', lambda i: anonymous.get(f'{API}/catalog/products/{product_id}/'))
+    context.measure('catalog.categories', lambda i: anonymous.get(f'{API}/catalog/categories/'))
+
+    context.log("Checkout")
+    with override_settings(PAYMENTS=FAKE_PAYMENTS):
+        gateway = get_gateway()
+        context.measure('checkout.create_intent', lambda i: customer.post(
+            f'{API}/sales/create-payment-intent/', {'cart': cart}, format='json',
+        ))
+
+        run_token = int(time.time())
+
+        def webhook(i):
+            payload = _webhook_payload(run_token, i, dataset.customer.id, cart_products)
+            return anonymous.post(
+                f'{API}/sales/webhook/', data=payload, content_type='application/json',
+                HTTP_STRIPE_SIGNATURE=gateway.sign(payload),
+            )
+        context.measure('checkout.webhook_fulfilment', webhook)
+
+    context.log("Compras del cliente")
+    context.measure('sales.my_purchases', lambda i: customer.get(f'{API}/sales/my-purchases/'))
+    context.measure('sales.my_warranties', lambda i: customer.get(f'{API}/sales/my-warranties/'))
+
+    context.log("Listado admin de ventas (SaleFilter)")
+    sale_filters = {
+        'none': {},
+        'status': {'status': 'COMPLETED'},
+        'client_search': {'client_search': 'Cliente1 Carga'},
+        'month_year': {'month': month, 'year': year},
+        'year': {'year': year},
+        'product_search': {'product_search': 'Televisores'},
+        'monto_range': {'monto_min': 1000, 'monto_max': 5000},
+        'fecha_range': {'fecha_inicio': f'{year}-{month:02d}-01', 'fecha_fin': f'{year}-{month:02d}-15'},
+    }
+    for label, params in sale_filters.items():
+        context.measure(f'admin_sales.{label}', lambda i, p=params: admin.get(f'{API}/sales/admin/all-sales/', p))
+
+    context.log("Reportes")
+    report_filters = {'month': month, 'year': year}
+    for report_type in ('csv', 'pdf', 'excel'):
+        context.measure(f'reports.admin.{report_type}', lambda i, t=report_type: admin.get(
+            f'{API}/reports/admin/report/', {'report_type': t, **report_filters},
+        ))
+    context.measure('reports.admin.csv_full', lambda i: admin.get(f'{API}/reports/admin/report/', {'report_type': 'csv'}))
+
+    for report_type in ('csv', 'pdf'):
+        params = {'report_type': report_type, **report_filters}
+        # El LLM se sustituye por una respuesta fija (copiamos: la vista hace pop)
+        with mock.patch('apps.reports.views.parse_prompt_to_filters', side_effect=lambda prompt, p=params: dict(p)):
+            context.measure(f'reports.dynamic.{report_type}', lambda i: admin.post(
+                f'{API}/reports/dynamic-report/', {'prompt': 'bench'}, format='json',
+            ))
+
+    context.log("Dashboards IA")
+    context.measure('ai.historical_sales', lambda i: admin.get(f'{API}/ai/dashboard/historical-sales/'))
+    context.measure('ai.future_prediction', lambda i: admin.get(f'{API}/ai/dashboard/future-prediction/'))
@@ -0,0 +1,173 @@
+# core/benchmarks/async_load.py
+"""
+Suite 'async': peticiones concurrentes contra UN worker ASGI (la
+aplicación de ``config/asgi.py`` en proceso) con Stripe, Gemini y Supabase
+simulados por un stub local con 300 ms de latencia.
+
+Cada endpoint se mide en tres modos:
+
+- ``sync_wsgi``: vista DRF de a una petición por vez, como un worker sync de
+  gunicorn (el despliegue actual). Throughput ~1 / latencia del upstream.
+- ``sync_asgi``: la misma vista bajo ASGI; Django la corre en un hilo por
+  petición, así que la concurrencia queda limitada por el pool de hilos.
+- ``async``: la vista async; solo la limita la CPU del worker.
+
+El cliente de carga corre en el mismo proceso y comparte la CPU, así que
+las cifras absolutas son conservadoras.
+"""
+import asyncio
+import io
+import time
+from collections import Counter
+from unittest import mock
+
+import httpx
+from django.core.asgi import get_asgi_application
+from django.test.utils import override_settings
+from PIL import Image
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.products.models import Category
+from apps.reports.parser import parse_llm_response
+from . import register
+from .fixtures import seed_dataset
+from .harness import percentile
+from .stubs import StubServer
+
+API = '/api/v1'
+UPSTREAM_LATENCY = 0.3
+CONCURRENCY = 30
+REQUESTS = 60
+STUB_KEY = 'sk_test_stub'
+
+
+def _png_bytes():
+    buffer = io.BytesIO()
+    Image.new('RGB', (8, 8), (200, 30, 30)).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+class _BlockingSupabase:
+    """ Reemplaza al cliente de supabase-py de ProductSerializer: subida
+    bloqueante (como la real) contra el stub. """
+
+    def __init__(self, url):
+        self.url = url
+        self.storage = self
+
+    def from_(self, bucket):
+        self.bucket = bucket
+        return self
+
+    def upload(self, path, file, file_options=None):
+        httpx.post(f"{self.url}/storage/v1/object/{self.bucket}/{path}", content=file).raise_for_status()
+
+    def get_public_url(self, path):
+        return f"{self.url}/storage/v1/object/public/{self.bucket}/{path}"
+
+
+def _blocking_parser(url):
+    """ parse_prompt_to_filters síncrono contra el stub de Gemini. """
+    def parse(prompt_text):
+        response = httpx.post(f"{url}/v1beta/models/stub:generateContent", json={'prompt': prompt_text})
+        return parse_llm_response(response.json()['candidates'][0]['content']['parts'][0]['text'])
+    return parse
+
+
+async def _run_load(client, make_request, requests, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    statuses = Counter()
+
+    async def one(i):
+        async with semaphore:
+            started = time.perf_counter()
+            response = await make_request(client, i)
+            latencies.append((time.perf_counter() - started) * 1000)
+            statuses[response.status_code] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    seconds = time.perf_counter() - started
+    latencies.sort()
+    throughput = requests / seconds
+    return {
+        'requests': requests,
+        'concurrency': concurrency,
+        'seconds': round(seconds, 2),
+        'rps': round(throughput, 1),
+        # Peticiones en vuelo promedio (ley de Little con la latencia del upstream)
+        'in_flight': round(throughput * UPSTREAM_LATENCY, 1),
+        'p50_ms': round(percentile(latencies, 50), 1),
+        'p99_ms': round(percentile(latencies, 99), 1),
+        'statuses': dict(statuses),
+    }
+
+
+@register('async')
+def run_async_suite(context):
+    dataset = seed_dataset(context)
+    customer_auth = {'Authorization': f'Bearer {AccessToken.for_user(dataset.customer)}'}
+    admin_auth = {'Authorization': f'Bearer {AccessToken.for_user(dataset.admin)}'}
+    cart = {'cart': [{'product_id': pid, 'quantity': 1} for pid in dataset.product_ids[:3]]}
+    category_id = Category.objects.filter(parent__isnull=False).values_list('id', flat=True).first()
+    png = _png_bytes()
+
+    def checkout(path):
+        async def request(client, i):
+            return await client.post(f'{API}/sales/{path}', json=cart, headers=customer_auth)
+        return request
+
+    def dynamic_report(path):
+        async def request(client, i):
+            return await client.post(f'{API}/reports/{path}', json={'prompt': 'bench'}, headers=admin_auth)
+        return request
+
+    def product_create(path):
+        async def request(client, i):
+            return await client.post(
+                f'{API}/catalog/{path}',
+                data={'name': f'Async bench {path} {i}', 'description': 'bench', 'price': '100.00',
+                      'stock': '10', 'category_id': str(category_id)},
+                files={'image_upload': (f'bench{i}.png', png, 'image/png')},
+                headers=admin_auth,
+            )
+        return request
+
+    scenarios = [
+        ('checkout', checkout('create-payment-intent/'), checkout('async/create-payment-intent/')),
+        ('dynamic_report', dynamic_report('dynamic-report/'), dynamic_report('async/dynamic-report/')),
+        ('product_create', product_create('products/'), product_create('async/products/')),
+    ]
+
+    # Lo que "responde Gemini": un mes de ventas completadas en CSV
+    report_filters = {
+        'report_type': 'csv', 'status': 'COMPLETED',
+        'month': dataset.end_date.month, 'year': dataset.end_date.year,
+    }
+
+    context.log(f"Upstream simulado: {UPSTREAM_LATENCY * 1000:.0f} ms, "
+                f"{REQUESTS} peticiones, concurrencia {CONCURRENCY}, 1 worker ASGI")
+    with StubServer(UPSTREAM_LATENCY, report_filters) as stub_url, override_settings(
+        STRIPE_API_BASE=stub_url, STRIPE_SECRET_KEY=STUB_KEY,
+        GEMINI_API_BASE=stub_url, SUPABASE_URL=stub_url, SUPABASE_KEY='stub',
+        # Bajo carga la versión sync supera el umbral de "lenta" en cada petición
+        INSTRUMENTATION={'SLOW_REQUEST_MS': 600_000},
+    ), mock.patch('apps.reports.parser.GOOGLE_API_KEY', 'stub'), \
+            mock.patch('apps.reports.views.parse_prompt_to_filters', _blocking_parser(stub_url)), \
+            mock.patch('apps.products.serializers.get_supabase', lambda: _BlockingSupabase(stub_url)):
+        application = get_asgi_application()
+
+        async def main():
+            transport = httpx.ASGITransport(app=application)
+            async with httpx.AsyncClient(transport=transport, base_url='http://testserver', timeout=120) as client:
+                for name, sync_request, async_request in scenarios:
+                    for variant, make_request, concurrency, requests in (
+                        ('sync_wsgi', sync_request, 1, max(5, REQUESTS // 6)),
+                        ('sync_asgi', sync_request, CONCURRENCY, REQUESTS),
+                        ('async', async_request, CONCURRENCY, REQUESTS),
+                    ):
+                        result = await _run_load(client, make_request, requests, concurrency)
+                        context.record(f'async.{name}.{variant}', **result)
+
+        asyncio.run(main())
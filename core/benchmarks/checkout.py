@@ -0,0 +1,105 @@
+# core/benchmarks/checkout.py
+"""
+Suite 'checkout': el ciclo completo de una compra sin red, con
+``FakeStripeGateway``:
+
+1. ``POST /sales/create-payment-intent/`` (valida stock, crea el intent)
+2. el "cliente paga": el fake genera el evento ``payment_intent.succeeded``
+   firmado como Stripe
+3. ``POST /sales/webhook/`` (verifica la firma, crea la venta, descuenta
+   stock, activa garantías)
+
+Cada iteración usa un carrito distinto para que no se reutilice el
+``CartSnapshot`` (ni el intent) de la anterior. Además se mide la
+cotización de carritos chicos y grandes: las consultas no deben crecer con
+el número de líneas.
+"""
+import time
+
+from django.test.utils import override_settings
+from rest_framework.test import APIClient
+
+from apps.products.models import Product
+from apps.sales.models import Sale
+from apps.sales.payments import get_gateway
+from . import register
+from .fixtures import seed_dataset
+
+API = '/api/v1'
+FAKE_PAYMENTS = {'BACKEND': 'apps.sales.payments.FakeStripeGateway'}
+CART_SIZES = (5, 150)
+
+
+@register('checkout')
+def run_checkout_suite(context):
+    dataset = seed_dataset(context)
+    customer = APIClient()
+    customer.force_authenticate(user=dataset.customer)
+    webhook_client = APIClient()
+    product_ids = dataset.product_ids
+    n = len(product_ids)
+
+    def cart_for(i):
+        # Par de productos rotando por el catálogo; la cantidad cambia en cada
+        # vuelta (measure llama con i = -1, 0, 1, ...)
+        i += 1
+        quantity = 1 + i // n
+        return [
+            {'product_id': product_ids[i % n], 'quantity': quantity},
+            {'product_id': product_ids[(i + 1) % n], 'quantity': quantity},
+        ]
+
+    with override_settings(PAYMENTS=FAKE_PAYMENTS):
+        gateway = get_gateway()
+        steps = {'create_intent': [], 'webhook': []}
+
+        def loop(i):
+            started = time.perf_counter()
+            response = customer.post(f'{API}/sales/create-payment-intent/', {'cart': cart_for(i)}, format='json')
+            assert response.status_code == 200, response.content
+            intent_id = response.data['clientSecret'].split('_secret_')[0]
+            created = time.perf_counter()
+
+            payload, signature = gateway.succeed(intent_id)
+            response = webhook_client.post(
+                f'{API}/sales/webhook/', data=payload, content_type='application/json',
+                HTTP_STRIPE_SIGNATURE=signature,
+            )
+            assert response.status_code == 200, response.status_code
+            steps['create_intent'].append((created - started) * 1000)
+            steps['webhook'].append((time.perf_counter() - created) * 1000)
+            return response
+
+        sales_before = Sale.objects.count()
+        context.log("Checkout -> webhook -> venta (FakeStripeGateway)")
+        context.measure('checkout.full_loop', loop)
+        fulfilled = Sale.objects.count() - sales_before
+
+        for step, values in steps.items():
+            values.sort()
+            context.record(f'checkout.step.{step}',
+                           mean_ms=round(sum(values) / len(values), 2), calls=len(values))
+
+        # Cada intent pagado debe producir exactamente una venta
+        payments = len(steps['webhook'])
+        context.record('checkout.fulfilment', payments=payments, sales=fulfilled, ok=fulfilled == payments)
+
+        # Un webhook reenviado (Stripe reintenta) no duplica la venta
+        response = customer.post(f'{API}/sales/create-payment-intent/',
+                                 {'cart': cart_for(payments + 1)}, format='json')
+        payload, signature = gateway.succeed(response.data['clientSecret'].split('_secret_')[0])
+        statuses = [
+            webhook_client.post(f'{API}/sales/webhook/', data=payload, content_type='application/json',
+                                HTTP_STRIPE_SIGNATURE=signature).status_code
+            for _ in range(2)
+        ]
+        context.record('checkout.duplicate_webhook', statuses=statuses,
+                       sales=Sale.objects.count() - sales_before - fulfilled)
+
+        context.log("Cotización por tamaño de carrito")
+        catalog_ids = list(Product.objects.order_by('id').values_list('id', flat=True)[:max(CART_SIZES)])
+        for size in CART_SIZES:
+            items = [{'product_id': product_id, 'quantity': 1} for product_id in catalog_ids[:size]]
+            context.measure(f'checkout.create_intent.{size}_lines', lambda i, items=items: customer.post(
+                f'{API}/sales/create-payment-intent/', {'cart': items}, format='json',
+            ), lines=len(items))
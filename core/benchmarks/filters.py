@@ -0,0 +1,52 @@
+# core/benchmarks/filters.py
+"""
+Suite 'filters': filtros de fecha de SaleFilter con EXTRACT (como eran
+antes) frente al rango semiabierto sobre created_at. Conviene correrla con
+``--scale`` de millones de ventas para que la diferencia sea visible.
+"""
+from apps.sales.filters import SaleFilter
+from apps.sales.models import Sale
+from . import register
+from .fixtures import seed_dataset
+
+PAGE_SIZE = 25
+
+
+def _legacy_queryset(params):
+    """ Lo que generaba SaleFilter con created_at__month / created_at__year. """
+    queryset = Sale.objects.order_by('-created_at')
+    if 'month' in params:
+        queryset = queryset.filter(created_at__month=params['month'])
+    if 'year' in params:
+        queryset = queryset.filter(created_at__year=params['year'])
+    if 'status' in params:
+        queryset = queryset.filter(status=params['status'])
+    return queryset
+
+
+def _range_queryset(params):
+    return SaleFilter(params, queryset=Sale.objects.order_by('-created_at')).qs
+
+
+@register('filters')
+def run_filters_suite(context):
+    dataset = seed_dataset(context)
+    year, month = dataset.end_date.year, dataset.end_date.month
+
+    cases = {
+        'month_year': {'month': month, 'year': year},
+        'year': {'year': year},
+        'month_year_completed': {'month': month, 'year': year, 'status': 'COMPLETED'},
+    }
+    for label, params in cases.items():
+        for variant, build in (('extract', _legacy_queryset), ('range', _range_queryset)):
+            # Lo que hace la vista paginada: COUNT + primera página
+            context.measure(f'filters.{label}.{variant}', lambda i, b=build, p=params: (
+                b(p).count(), list(b(p)[:PAGE_SIZE].values_list('id', flat=True)),
+            ))
+
+    # Reporte completo (sin paginar): solo suma de montos
+    for variant, build in (('extract', _legacy_queryset), ('range', _range_queryset)):
+        context.measure(f'filters.report_year.{variant}', lambda i, b=build: (
+            sum(b({'year': year, 'status': 'COMPLETED'}).values_list('total_amount', flat=True)),
+        ))
@@ -0,0 +1,50 @@
+# core/benchmarks/fixtures.py
+"""
+Dataset determinista para los benchmarks. Se siembra una sola vez por
+corrida (aunque se ejecuten varias suites).
+"""
+from dataclasses import dataclass
+from datetime import date
+
+from django.contrib.auth import get_user_model
+
+from apps.products.models import Product
+from core import seeding
+
+# Fecha fija: el dataset es idéntico entre corridas y commits
+DATASET_END_DATE = date(2025, 6, 30)
+ADMIN_EMAIL = 'bench-admin@loadtest.smartsales365.local'
+
+User = get_user_model()
+
+
+@dataclass
+class Dataset:
+    admin: object
+    customer: object
+    product_ids: list
+    end_date: date
+
+
+def seed_dataset(context):
+    if getattr(context, 'dataset', None) is not None:
+        return context.dataset
+
+    config = seeding.SeedConfig(
+        sales=context.scale,
+        users=max(50, context.scale // 20),
+        products=max(50, min(5_000, context.scale // 100)),
+        days=730,
+        end_date=DATASET_END_DATE,
+        seed=context.seed,
+    )
+    context.log(f"Sembrando dataset ({context.scale} ventas)...")
+    seeding.run(config, log=context.log)
+
+    admin = User.objects.filter(email=ADMIN_EMAIL).first() or User.objects.create_superuser(ADMIN_EMAIL, 'bench')
+    customer = User.objects.filter(email__endswith=f"@{seeding.SEED_EMAIL_DOMAIN}", role=User.Role.CUSTOMER) \
+        .order_by('id').first()
+    product_ids = list(Product.objects.order_by('id').values_list('id', flat=True)[:100])
+
+    context.dataset = Dataset(admin, customer, product_ids, DATASET_END_DATE)
+    return context.dataset
@@ -0,0 +1,171 @@
+# core/benchmarks/harness.py
+"""
+Utilidades de medición: latencia (percentiles), número de consultas SQL,
+bytes de respuesta y memoria pico. Los resultados se guardan en JSON para
+poder compararlos entre commits.
+"""
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+from contextlib import ExitStack, contextmanager
+from datetime import datetime, timezone as dt_timezone
+
+import django
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+
+def percentile(sorted_values, q):
+    """ Percentil por interpolación lineal sobre una lista ya ordenada. """
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+class QueryCounter:
+    """
+    Resultado de ``capture_queries``. Las consultas se copian al salir del
+    bloque: el log de la conexión se vacía en cada ``request_started``.
+    """
+
+    def __init__(self):
+        self.queries = []
+
+    def __len__(self):
+        return len(self.queries)
+
+
+@contextmanager
+def capture_queries():
+    """ Como ``CaptureQueriesContext`` pero sobre todas las conexiones. """
+    counter = QueryCounter()
+    with ExitStack() as stack:
+        contexts = [stack.enter_context(CaptureQueriesContext(connections[alias])) for alias in connections]
+        yield counter
+    counter.queries = [q for ctx in contexts for q in ctx.captured_queries]
+
+
+def _response_size(response):
+    if response is None:
+        return 0
+    if getattr(response, 'streaming', False):
+        return sum(len(chunk) for chunk in response.streaming_content)
+    return len(getattr(response, 'content', b''))
+
+
+class BenchmarkContext:
+    """
+    Estado compartido por las suites: parámetros de la corrida y resultados.
+    """
+
+    def __init__(self, scale, iterations, seed, stdout=None):
+        self.scale = scale
+        self.iterations = iterations
+        self.seed = seed
+        self.stdout = stdout
+        self.results = {}
+
+    def log(self, message):
+        if self.stdout is not None:
+            self.stdout.write(message)
+
+    def measure(self, name, func, iterations=None, **extra):
+        """
+        Ejecuta ``func(i)`` una vez de calentamiento, una vez instrumentada
+        (consultas + memoria pico) y luego ``iterations`` veces cronometradas
+        sin instrumentación. ``func`` puede devolver una respuesta HTTP (se
+        miden sus bytes).
+        """
+        iterations = iterations or self.iterations
+
+        func(-1)
+        tracemalloc.start()
+        with capture_queries() as queries:
+            response = func(0)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        latencies = []
+        for i in range(1, iterations + 1):
+            started = time.perf_counter()
+            func(i)
+            latencies.append((time.perf_counter() - started) * 1000)
+        latencies.sort()
+
+        result = {
+            'iterations': iterations,
+            'p50_ms': round(percentile(latencies, 50), 3),
+            'p90_ms': round(percentile(latencies, 90), 3),
+            'p99_ms': round(percentile(latencies, 99), 3),
+            'mean_ms': round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+            'max_ms': round(latencies[-1], 3) if latencies else 0.0,
+            'queries': len(queries),
+            'bytes': _response_size(response),
+            'peak_kb': round(peak / 1024, 1),
+            'status': getattr(response, 'status_code', None),
+            **extra,
+        }
+        self.results[name] = result
+        self.log(
+            f"  {name:<45} p50={result['p50_ms']:>9.2f}ms p99={result['p99_ms']:>9.2f}ms "
+            f"q={result['queries']:<4} bytes={result['bytes']:<9} peak={result['peak_kb']}KB"
+        )
+        return result
+
+    def record(self, name, **values):
+        """ Para suites que miden por su cuenta (throughput, carga, etc.). """
+        self.results[name] = values
+        self.log(f"  {name:<45} " + ' '.join(f"{k}={v}" for k, v in values.items()))
+        return values
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, timeout=5,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def build_report(context, suites):
+    return {
+        'meta': {
+            'created_at': datetime.now(dt_timezone.utc).isoformat(),
+            'git_revision': _git_revision(),
+            'suites': suites,
+            'scale': context.scale,
+            'iterations': context.iterations,
+            'seed': context.seed,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connections['default'].vendor,
+        },
+        'results': context.results,
+    }
+
+
+def save_report(report, path):
+    with open(path, 'w', encoding='utf-8') as fh:
+        json.dump(report, fh, indent=2, ensure_ascii=False)
+
+
+def compare_reports(baseline, current, metrics=('p50_ms', 'p99_ms', 'queries', 'bytes', 'peak_kb')):
+    """ Devuelve filas (escenario, métrica, antes, después, delta %). """
+    rows = []
+    for name, result in current['results'].items():
+        previous = baseline.get('results', {}).get(name)
+        if not previous:
+            continue
+        for metric in metrics:
+            if metric not in result or metric not in previous:
+                continue
+            before, after = previous[metric], result[metric]
+            delta = ((after - before) / before * 100) if before else 0.0
+            rows.append((name, metric, before, after, delta))
+    return rows
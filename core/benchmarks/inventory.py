@@ -0,0 +1,186 @@
+# core/benchmarks/inventory.py
+"""
+Suite 'inventory': cumplimiento de ventas de UN producto muy vendido.
+
+Cada operación es lo que hace el webhook dentro de su transacción (venta,
+detalle, descuento de stock) en tres variantes:
+
+- ``read_modify_write``: la versión anterior. ``select_for_update`` del
+  producto al inicio, ``product.stock -= n; product.save()``. La fila queda
+  bloqueada durante toda la transacción.
+- ``conditional``: ``record_sale`` (UPDATE condicional con F() al final). La
+  fila se bloquea solo desde el UPDATE hasta el commit.
+- ``sharded``: igual, pero el stock está repartido en ``SHARDS`` fracciones.
+
+``lock_ms`` es el tiempo que la fila caliente queda bloqueada por operación;
+``hot_row_rps_bound`` = filas / lock_ms es el máximo de compras por segundo
+que admite ese producto, con cualquier número de workers. En PostgreSQL
+además se corre la carga con ``THREADS`` hilos y se mide el throughput real;
+SQLite bloquea toda la base en cada escritura y no permite medirlo.
+
+Al final, el pronóstico de demanda (``apps/inventory/forecasting.py``):
+ajuste con numpy para ``FORECAST_PRODUCTS`` productos sintéticos y la
+corrida real (ajuste completo y actualización de un día) sobre el dataset.
+"""
+import threading
+import time
+from datetime import timedelta
+
+import numpy as np
+from django.db import connection, connections, transaction
+
+from apps.inventory import forecasting
+from apps.inventory.models import StockShard
+from apps.inventory.services import consolidate, enable_sharding, record_sale
+from apps.products.models import Product
+from apps.sales.models import Sale, SaleDetail
+from . import register
+from .fixtures import seed_dataset
+from .harness import percentile
+
+SHARDS = 8
+THREADS = 16
+OPERATIONS = 400
+HOT_STOCK = 10_000_000
+FORECAST_PRODUCTS = 100_000
+
+
+STOCK_WRITES = ('UPDATE "products_product"', 'UPDATE "inventory_stockshard"')
+
+
+class _FirstStockWrite:
+    """ execute_wrapper: momento del primer UPDATE de stock (cuando se toma el bloqueo). """
+
+    def __init__(self):
+        self.at = None
+
+    def __call__(self, execute, sql, params, many, context):
+        if self.at is None and sql.startswith(STOCK_WRITES):
+            self.at = time.perf_counter()
+        return execute(sql, params, many, context)
+
+
+def _read_modify_write(user_id, product_id):
+    with transaction.atomic():
+        locked_at = time.perf_counter()
+        product = Product.objects.select_for_update().get(id=product_id)
+        sale = Sale.objects.create(user_id=user_id, total_amount=product.price,
+                                   status=Sale.SaleStatus.COMPLETED)
+        SaleDetail.objects.create(sale=sale, product=product, quantity=1, price_at_purchase=product.price)
+        product.stock -= 1
+        product.save()
+    return locked_at
+
+
+def _conditional(user_id, product_id):
+    marker = _FirstStockWrite()
+    with connection.execute_wrapper(marker), transaction.atomic():
+        product = Product.objects.only('id', 'price').get(id=product_id)
+        sale = Sale.objects.create(user_id=user_id, total_amount=product.price,
+                                   status=Sale.SaleStatus.COMPLETED)
+        SaleDetail.objects.create(sale=sale, product=product, quantity=1, price_at_purchase=product.price)
+        record_sale(sale, [(product_id, 1)])
+    return marker.at
+
+
+def _timed(operation, user_id, product_id):
+    """ (ms totales, ms con la fila bloqueada) """
+    started = time.perf_counter()
+    locked_at = operation(user_id, product_id)
+    finished = time.perf_counter()
+    return (finished - started) * 1000, (finished - locked_at) * 1000
+
+
+def _run_threads(operation, user_id, product_id, operations, threads):
+    per_thread = operations // threads
+    errors = []
+
+    def worker():
+        try:
+            for _ in range(per_thread):
+                operation(user_id, product_id)
+        except Exception as e:  # noqa: BLE001 - se reporta en el resultado
+            errors.append(repr(e))
+        finally:
+            connections.close_all()
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    seconds = time.perf_counter() - started
+    return {'rps': round(per_thread * threads / seconds, 1), 'threads': threads, 'errors': len(errors)}
+
+
+@register('inventory')
+def run_inventory_suite(context):
+    dataset = seed_dataset(context)
+    user_id = dataset.customer.id
+    product_id = dataset.product_ids[0]
+    Product.objects.filter(pk=product_id).update(stock=HOT_STOCK)
+    iterations = max(context.iterations, 50)
+    details_before = SaleDetail.objects.filter(product_id=product_id).count()
+
+    variants = [
+        ('read_modify_write', _read_modify_write, 1),
+        ('conditional', _conditional, 1),
+        ('sharded', _conditional, SHARDS),
+    ]
+    context.log(f"Producto caliente {product_id}, {iterations} ventas por variante")
+    for name, operation, rows in variants:
+        if rows > 1:
+            enable_sharding(Product(pk=product_id), rows)
+        operation(user_id, product_id)  # calentamiento
+
+        totals, locks = [], []
+        for _ in range(iterations):
+            total_ms, lock_ms = _timed(operation, user_id, product_id)
+            totals.append(total_ms)
+            locks.append(lock_ms)
+        totals.sort()
+        locks.sort()
+        lock_p50 = percentile(locks, 50)
+        result = {
+            'p50_ms': round(percentile(totals, 50), 3),
+            'lock_ms': round(lock_p50, 3),
+            'lock_share': round(lock_p50 / percentile(totals, 50), 2),
+            'rows': rows,
+            'hot_row_rps_bound': round(rows * 1000 / lock_p50, 0),
+        }
+        if connection.vendor == 'postgresql':
+            result.update(_run_threads(operation, user_id, product_id, OPERATIONS, THREADS))
+        context.record(f'inventory.hot_product.{name}', **result)
+
+    # Consolidar: el stock final debe reflejar exactamente las ventas hechas
+    stock = consolidate(product_id)
+    sold = SaleDetail.objects.filter(product_id=product_id).count() - details_before
+    context.record('inventory.consolidate', stock=stock, sold=sold, ok=stock == HOT_STOCK - sold,
+                   shards=StockShard.objects.filter(product_id=product_id).count())
+    if connection.vendor != 'postgresql':
+        context.log("  (throughput con hilos solo en PostgreSQL; en SQLite se reporta el límite por bloqueo)")
+
+    _forecast_suite(context, dataset)
+
+
+def _forecast_suite(context, dataset):
+    """ Pronóstico de demanda: numpy con FORECAST_PRODUCTS productos y la corrida real. """
+    rng = np.random.default_rng(context.seed)
+    rates = rng.gamma(0.5, 2.0, size=FORECAST_PRODUCTS)
+    matrix = rng.poisson(rates[:, None], size=(FORECAST_PRODUCTS, forecasting.HISTORY_DAYS)).astype(float)
+    started = time.perf_counter()
+    rate, variance = forecasting.ewma_fit(matrix)
+    forecasting.reorder_points(rate, np.sqrt(variance))
+    fit_s = time.perf_counter() - started
+    started = time.perf_counter()
+    forecasting.ewma_update(rate, variance, matrix[:, -1:])
+    context.record('inventory.forecast.synthetic', products=FORECAST_PRODUCTS, days=forecasting.HISTORY_DAYS,
+                   fit_s=round(fit_s, 3), update_s=round(time.perf_counter() - started, 3))
+
+    last_day = dataset.end_date
+    for mode, through_day, rebuild in (('fit', last_day - timedelta(days=1), True), ('update', last_day, False)):
+        started = time.perf_counter()
+        result = forecasting.run(rebuild=rebuild, through_day=through_day)
+        context.record(f'inventory.forecast.db_{mode}', products=result.products, days=result.days,
+                       seconds=round(time.perf_counter() - started, 3))
@@ -0,0 +1,95 @@
+# core/benchmarks/recommendations.py
+"""
+Suite 'recommendations': minado de "comprados juntos".
+
+- ``synthetic``: ``LINE_ITEMS`` líneas generadas con numpy (popularidad de
+  productos con cola larga, canastas de 1 a 8 productos) y procesadas por
+  bloques como en ``mine``: tiempo, líneas/s, memoria pico y tamaño de la
+  matriz. Además, la actualización incremental con el último 10% frente a
+  recalcular todo, y que ambas den la misma matriz.
+- ``db``: ``mine`` sobre el dataset sembrado y latencia del endpoint
+  ``products/<id>/related/`` servido desde la caché.
+"""
+import time
+import tracemalloc
+from datetime import timedelta
+
+import numpy as np
+from rest_framework.test import APIClient
+from scipy import sparse
+
+from apps.analytics.recommendations import accumulate, mine, related_cache, top_k
+from apps.sales.models import Sale
+from . import register
+from .fixtures import seed_dataset
+
+LINE_ITEMS = 10_000_000
+PRODUCTS = 5_000
+BASKETS_PER_CHUNK = 200_000
+INCREMENT_SHARE = 0.1
+
+
+def _synthetic_chunks(seed, line_items):
+    """ Bloques (sale_ids, product_ids) hasta sumar ``line_items`` líneas. """
+    rng = np.random.default_rng(seed)
+    weights = 1 / np.arange(1, PRODUCTS + 1) ** 0.8
+    weights /= weights.sum()
+    produced, next_sale = 0, 0
+    while produced < line_items:
+        sizes = rng.integers(1, 9, size=BASKETS_PER_CHUNK)
+        sale_ids = np.repeat(np.arange(next_sale, next_sale + sizes.size), sizes)[:line_items - produced]
+        product_ids = rng.choice(PRODUCTS, size=sale_ids.size, p=weights)
+        next_sale += sizes.size
+        produced += sale_ids.size
+        yield sale_ids, product_ids
+
+
+def _mine_synthetic(chunks, cooccurrence=None):
+    cooccurrence = sparse.csr_matrix((0, 0), dtype=np.int64) if cooccurrence is None else cooccurrence
+    lines = baskets = 0
+    for sale_ids, product_ids in chunks:
+        cooccurrence, new = accumulate(cooccurrence, sale_ids, product_ids)
+        lines += len(product_ids)
+        baskets += new
+    return cooccurrence, lines, baskets
+
+
+@register('recommendations')
+def run_recommendations_suite(context):
+    context.log(f"Minando {LINE_ITEMS:,} líneas sintéticas...")
+    tracemalloc.start()
+    started = time.perf_counter()
+    full, lines, baskets = _mine_synthetic(_synthetic_chunks(context.seed, LINE_ITEMS))
+    mined = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    started = time.perf_counter()
+    lists = top_k(full)
+    ranked = time.perf_counter() - started
+    context.record('recommendations.synthetic.full', lines=lines, baskets=baskets, seconds=round(mined, 2),
+                   lines_per_s=round(lines / mined, 0), peak_mb=round(peak / 2 ** 20, 1), nnz=full.nnz,
+                   top_k_s=round(ranked, 2), products=len(lists))
+
+    # Incremental: la base (90%) ya minada, se suman solo los bloques nuevos
+    chunks = list(_synthetic_chunks(context.seed, LINE_ITEMS))
+    split = int(len(chunks) * (1 - INCREMENT_SHARE))
+    base, _, _ = _mine_synthetic(chunks[:split])
+    started = time.perf_counter()
+    incremental, new_lines, _ = _mine_synthetic(chunks[split:], base)
+    seconds = time.perf_counter() - started
+    context.record('recommendations.synthetic.incremental', lines=new_lines, seconds=round(seconds, 2),
+                   lines_per_s=round(new_lines / seconds, 0), matches_full=(incremental != full).nnz == 0)
+    del chunks, base, incremental, full
+
+    # Contra la base: minado real y endpoint
+    dataset = seed_dataset(context)
+    now = Sale.objects.order_by('-created_at').values_list('created_at', flat=True).first()
+    result = mine(rebuild=True, now=now + timedelta(days=1))
+    context.record('recommendations.db.mine', baskets=result.new_baskets, lines=result.new_lines,
+                   seconds=round(result.seconds, 2), pairs=result.model.pairs)
+
+    client = APIClient()
+    product_id = dataset.product_ids[0]
+    related_cache.invalidate()
+    context.measure('recommendations.db.related', lambda i: client.get(
+        f'/api/v1/catalog/products/{product_id}/related/'))
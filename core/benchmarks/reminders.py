@@ -0,0 +1,58 @@
+# core/benchmarks/reminders.py
+"""
+Suite 'reminders': recordatorios de vencimiento de garantía
+(``apps/sales/reminders.py``) con el backend de correo en memoria.
+
+- ``reminders.plain_text``: el cuerpo es texto plano, así que nombre,
+  garantía y producto con ``'``, ``"`` y ``&`` deben llegar tal cual (sin
+  entidades HTML).
+- ``reminders.send``: una corrida completa sobre la ventana de 30 días
+  del dataset (páginas, pool de conexiones y checkpoints).
+"""
+from django.core import mail
+
+from apps.sales.reminders import build_message, send_reminders
+from . import register
+from .fixtures import seed_dataset
+
+LOCMEM_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+SPECIAL = 'O\'Brien "Bob" & Co'
+WINDOW_DAYS = 30
+
+
+def _special_row(today):
+    return {
+        'id': 0,
+        'expiration_date': today,
+        'user__email': 'obrien@example.com',
+        'user__first_name': SPECIAL,
+        'product__name': f'TV {SPECIAL}',
+        'warranty_template__title': f'Garantía {SPECIAL}',
+        'warranty_template__provider__name': SPECIAL,
+        'warranty_template__provider__contact_email': 'soporte@example.com',
+    }
+
+
+@register('reminders')
+def run_reminders_suite(context):
+    dataset = seed_dataset(context)
+    today = dataset.end_date
+
+    row = _special_row(today)
+    mail.outbox = []
+    message = build_message(row, today)
+    message.connection = mail.get_connection(LOCMEM_BACKEND)
+    message.send()
+    body = mail.outbox[0].body
+    expected = [row['user__first_name'], row['product__name'], row['warranty_template__title']]
+    missing = [value for value in expected if value not in body]
+    assert not missing, f"Recordatorio con texto escapado: {missing!r}\n{body}"
+    context.record('reminders.plain_text', ok=True, values=len(expected))
+
+    mail.outbox = []
+    report = send_reminders(WINDOW_DAYS, backend=LOCMEM_BACKEND, restart=True, today=today)
+    assert report.failed == 0 and len(mail.outbox) == report.sent, (report, len(mail.outbox))
+    context.record(
+        'reminders.send', days=WINDOW_DAYS, scanned=report.scanned, sent=report.sent, pages=report.pages,
+        seconds=round(report.seconds, 3), per_second=round(report.per_second, 0),
+    )
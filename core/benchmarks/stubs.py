@@ -0,0 +1,82 @@
+# core/benchmarks/stubs.py
+"""
+Servidor HTTP local que imita a Stripe, Gemini y Supabase Storage con una
+latencia fija. Corre con uvicorn en un hilo aparte.
+"""
+import asyncio
+import json
+import socket
+import threading
+import time
+
+import uvicorn
+
+# Filtros que "devuelve el LLM" en el stub de Gemini
+DEFAULT_REPORT_FILTERS = {'report_type': 'csv', 'status': 'COMPLETED'}
+
+
+def make_stub_app(latency, report_filters=None):
+    report_filters = report_filters or DEFAULT_REPORT_FILTERS
+    counter = {'n': 0}
+
+    def respond(path):
+        counter['n'] += 1
+        if path.startswith('/v1/payment_intents'):
+            intent_id = f"pi_stub_{counter['n']}"
+            return 200, {
+                'id': intent_id,
+                'object': 'payment_intent',
+                'client_secret': f'{intent_id}_secret_stub',
+                'status': 'requires_payment_method',
+            }
+        if ':generateContent' in path:
+            return 200, {'candidates': [{'content': {'parts': [{'text': json.dumps(report_filters)}]}}]}
+        if path.startswith('/storage/v1/object/'):
+            return 200, {'Key': path.split('/storage/v1/object/', 1)[1]}
+        return 404, {'error': 'not found'}
+
+    async def app(scope, receive, send):
+        if scope['type'] != 'http':
+            return
+        more_body = True
+        while more_body:
+            message = await receive()
+            more_body = message.get('more_body', False)
+        await asyncio.sleep(latency)
+        status, body = respond(scope['path'])
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(b'content-type', b'application/json')],
+        })
+        await send({'type': 'http.response.body', 'body': json.dumps(body).encode()})
+
+    return app
+
+
+class StubServer:
+    """ ``with StubServer(0.3) as url: ...`` """
+
+    def __init__(self, latency, report_filters=None):
+        self.app = make_stub_app(latency, report_filters)
+        self.server = None
+        self.thread = None
+        self.url = None
+
+    def __enter__(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind(('127.0.0.1', 0))
+        self.url = f"http://127.0.0.1:{sock.getsockname()[1]}"
+        config = uvicorn.Config(self.app, lifespan='off', log_level='warning', access_log=False,
+                                backlog=4096, limit_concurrency=10_000)
+        self.server = uvicorn.Server(config)
+        self.thread = threading.Thread(target=self.server.run, kwargs={'sockets': [sock]}, daemon=True)
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        return self.url
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self.thread.join(timeout=10)
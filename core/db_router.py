@@ -0,0 +1,66 @@
+# core/db_router.py
+"""
+Enrutado a la réplica de lectura.
+
+Por defecto todo va a 'default'. Solo las lecturas hechas dentro de
+``read_from_replica()`` (o de una vista con ``ReplicaReadMixin``) van al
+alias 'replica', y únicamente si está configurado (DATABASE_REPLICA_URL).
+Así el checkout, el webhook y cualquier lectura que deba ver sus propias
+escrituras siguen en el primario sin tocar su código.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS
+
+REPLICA_ALIAS = 'replica'
+
+_use_replica = ContextVar('use_replica', default=False)
+
+
+def replica_available():
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+@contextmanager
+def read_from_replica():
+    token = _use_replica.set(True)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if _use_replica.get() and replica_available():
+            return REPLICA_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        # Aunque la instancia se haya leído de la réplica, se guarda en el primario
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Réplica y primario contienen los mismos datos
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # La réplica recibe el esquema por replicación, no por migraciones
+        return db != REPLICA_ALIAS
+
+
+class ReplicaReadMixin:
+    """
+    Para vistas de DRF cuyas lecturas toleran el retraso de la réplica.
+    Solo aplica a ``replica_methods`` (por defecto los métodos seguros); el
+    resto de métodos de la misma vista siguen en el primario.
+    """
+    replica_methods = SAFE_METHODS
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method in self.replica_methods:
+            with read_from_replica():
+                return super().dispatch(request, *args, **kwargs)
+        return super().dispatch(request, *args, **kwargs)
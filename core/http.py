@@ -0,0 +1,33 @@
+# core/http.py
+"""
+Cliente ``httpx.AsyncClient`` compartido para llamar a servicios externos
+(Stripe, Gemini, Supabase) desde las vistas async. Se crea uno por event
+loop: las conexiones (y el handshake TLS) se reutilizan entre peticiones.
+"""
+import asyncio
+import weakref
+
+import httpx
+from django.conf import settings
+
+_clients = weakref.WeakKeyDictionary()
+
+
+def build_async_client(**kwargs):
+    config = settings.UPSTREAM_HTTP
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(config['TIMEOUT'], connect=config['CONNECT_TIMEOUT']),
+        limits=httpx.Limits(
+            max_connections=config['MAX_CONNECTIONS'],
+            max_keepalive_connections=config['MAX_KEEPALIVE_CONNECTIONS'],
+        ),
+        **kwargs,
+    )
+
+
+def get_async_client():
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = _clients[loop] = build_async_client()
+    return client
@@ -0,0 +1,121 @@
+# core/importtime.py
+"""
+Perfil del arranque: árbol de imports de ``python -X importtime`` y tiempo
+de pared de un comando de ``manage.py``.
+
+``-X importtime`` escribe en stderr una línea por módulo importado, en
+post-orden (los hijos antes que el padre) y con la profundidad como
+sangría::
+
+    import time: self [us] | cumulative | imported package
+    import time:       512 |    1039106 |   apps.reports.parser
+
+``parse()`` arma el árbol y ``render()`` lo imprime podado a los nodos que
+superan un umbral.
+"""
+import os
+import re
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+
+LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)')
+PROJECT_PACKAGES = ('apps', 'core', 'config')
+
+
+@dataclass
+class ImportNode:
+    name: str
+    self_us: int
+    cumulative_us: int
+    children: list = field(default_factory=list)
+
+    @property
+    def cumulative_ms(self):
+        return self.cumulative_us / 1000
+
+    @property
+    def self_ms(self):
+        return self.self_us / 1000
+
+    @property
+    def is_project(self):
+        return self.name.split('.')[0] in PROJECT_PACKAGES
+
+    def walk(self):
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+
+def parse(stderr):
+    """ Raíces (imports de primer nivel) en orden de importación. """
+    pending = {}
+    for line in stderr.splitlines():
+        match = LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        depth = len(indent) // 2
+        node = ImportNode(name, int(self_us), int(cumulative_us), pending.pop(depth + 1, []))
+        pending.setdefault(depth, []).append(node)
+    return pending.get(0, [])
+
+
+def render(roots, min_ms=10.0, max_depth=None, only=None):
+    """ Líneas del árbol con los nodos de al menos ``min_ms`` acumulados. """
+    lines = []
+
+    def visit(node, depth):
+        if node.cumulative_ms < min_ms or (max_depth is not None and depth > max_depth):
+            return
+        marker = '*' if node.is_project else ' '
+        lines.append(f"{node.cumulative_ms:9.1f} {node.self_ms:8.1f} {marker} {'  ' * depth}{node.name}")
+        for child in sorted(node.children, key=lambda c: c.cumulative_us, reverse=True):
+            visit(child, depth + 1)
+
+    for root in roots:
+        if only:
+            for node in root.walk():
+                if node.name == only or node.name.startswith(only + '.'):
+                    visit(node, 0)
+                    break
+        else:
+            visit(root, 0)
+    return lines
+
+
+def find(roots, name):
+    """ Primer nodo ``name`` y la cadena de imports que lo trajo. """
+    def search(node, path):
+        path = path + [node.name]
+        if node.name == name:
+            return path
+        for child in node.children:
+            found = search(child, path)
+            if found:
+                return found
+        return None
+
+    for root in roots:
+        found = search(root, [])
+        if found:
+            return found
+    return None
+
+
+def manage_py():
+    return os.path.join(os.getcwd(), 'manage.py')
+
+
+def run_manage(args, importtime=False, env=None):
+    """ (segundos de pared, stderr) de ``python manage.py <args>`` en un proceso nuevo. """
+    command = [sys.executable] + (['-X', 'importtime'] if importtime else []) + [manage_py(), *args]
+    started = time.perf_counter()
+    result = subprocess.run(command, capture_output=True, text=True, env={**os.environ, **(env or {})})
+    seconds = time.perf_counter() - started
+    if result.returncode != 0:
+        tail = '\n'.join(line for line in result.stderr.splitlines() if not LINE.match(line))[-2000:]
+        raise RuntimeError(f"manage.py {' '.join(args)} terminó con código {result.returncode}:\n{tail}")
+    return seconds, result.stderr
@@ -0,0 +1,351 @@
+# core/instrumentation.py
+"""
+Métricas por vista (tiempo total, tiempo en BD, consultas, N+1, bytes)
+mantenidas en memoria del proceso y expuestas en formato Prometheus.
+
+Cada worker de gunicorn tiene su propio registro; las métricas llevan la
+etiqueta ``pid`` para poder agregarlas en Prometheus.
+"""
+import bisect
+import cProfile
+import logging
+import os
+import random
+import re
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'ENABLED': True,
+    'SLOW_REQUEST_MS': 1000,
+    'DUPLICATE_QUERY_THRESHOLD': 5,
+    'RESERVOIR_SIZE': 1024,
+    'PROFILE_SAMPLE_RATE': 0.0,
+    'PROFILE_DIR': None,
+    'SERVER_TIMING': False,
+}
+
+# Límites (en segundos) de los buckets de latencia
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'INSTRUMENTATION', {})}
+
+
+class Histogram:
+    """ Histograma acumulativo con buckets fijos (estilo Prometheus). """
+    __slots__ = ('bounds', 'counts', 'total', 'count')
+
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def cumulative(self):
+        running = 0
+        for bound, count in zip((*self.bounds, float('inf')), self.counts):
+            running += count
+            yield bound, running
+
+
+class RouteStats:
+    __slots__ = ('requests', 'errors', 'wall', 'db', 'queries', 'duplicate_queries',
+                 'response_bytes', 'recent', 'slow')
+
+    def __init__(self, reservoir_size):
+        self.requests = 0
+        self.errors = 0
+        self.wall = Histogram()
+        self.db = Histogram()
+        self.queries = 0
+        self.duplicate_queries = 0
+        self.response_bytes = 0
+        # Últimas N latencias: percentiles "rodantes" sin crecer en memoria
+        self.recent = deque(maxlen=reservoir_size)
+        self.slow = 0
+
+    def recent_quantiles(self):
+        values = sorted(self.recent)
+        if not values:
+            return {}
+        return {q: values[min(len(values) - 1, int(q * len(values)))] for q in QUANTILES}
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def record(self, key, wall, db, queries, duplicates, response_bytes, is_error, is_slow, reservoir_size):
+        with self._lock:
+            stats = self._routes.get(key)
+            if stats is None:
+                stats = self._routes[key] = RouteStats(reservoir_size)
+            stats.requests += 1
+            stats.errors += is_error
+            stats.slow += is_slow
+            stats.wall.observe(wall)
+            stats.db.observe(db)
+            stats.queries += queries
+            stats.duplicate_queries += duplicates
+            stats.response_bytes += response_bytes
+            stats.recent.append(wall)
+
+    def snapshot(self):
+        with self._lock:
+            return list(self._routes.items())
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+
+registry = MetricsRegistry()
+
+
+class QueryTracker:
+    """ ``execute_wrapper`` que acumula tiempo de BD y SQL repetido. """
+    __slots__ = ('db_time', 'count', 'by_sql')
+
+    def __init__(self):
+        self.db_time = 0.0
+        self.count = 0
+        self.by_sql = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.count += 1
+            # El SQL llega parametrizado (%s): mismo texto = misma consulta
+            self.by_sql[sql] = self.by_sql.get(sql, 0) + 1
+
+    def duplicates(self, threshold):
+        return {sql: n for sql, n in self.by_sql.items() if n >= threshold}
+
+
+# Tracker de la petición en curso. Un ContextVar (y no execute_wrapper por
+# petición) para que también cuente las consultas de vistas async, que
+# corren en hilos de sync_to_async con conexiones propias.
+_current_tracker = ContextVar('query_tracker', default=None)
+
+
+def _tracking_wrapper(execute, sql, params, many, context):
+    tracker = _current_tracker.get()
+    if tracker is None:
+        return execute(sql, params, many, context)
+    return tracker(execute, sql, params, many, context)
+
+
+def _install_wrapper(connection, **kwargs):
+    if _tracking_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_tracking_wrapper)
+
+
+connection_created.connect(_install_wrapper)
+
+
+def _route_label(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unresolved'
+    return '/' + match.route if match.route else match.view_name or 'unresolved'
+
+
+def _response_size(response):
+    if getattr(response, 'streaming', False):
+        return int(response.get('Content-Length') or 0)
+    return len(response.content)
+
+
+_SAFE_FILENAME = re.compile(r'[^A-Za-z0-9_.-]+')
+
+
+class RequestMetricsMiddleware:
+    """
+    Mide cada petición: tiempo total, tiempo en BD, número de consultas,
+    consultas repetidas (N+1) y tamaño de la respuesta. Opcionalmente
+    perfila con cProfile una fracción de las peticiones y guarda en disco
+    solo las que resultan lentas.
+
+    Funciona en modo sync y async; en async no se perfila (cProfile mide
+    el hilo del event loop, que comparten todas las peticiones).
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        self.config = get_config()
+        self.enabled = self.config['ENABLED']
+        profile_dir = self.config['PROFILE_DIR']
+        self.profile_dir = Path(profile_dir) if profile_dir else None
+        for conn in connections.all(initialized_only=True):
+            _install_wrapper(conn)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+
+        tracker = QueryTracker()
+        profiler = None
+        if self.profile_dir and self.config['PROFILE_SAMPLE_RATE'] > random.random():
+            profiler = cProfile.Profile()
+
+        started = time.perf_counter()
+        token = _current_tracker.set(tracker)
+        if profiler is not None:
+            profiler.enable()
+        try:
+            response = self.get_response(request)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            _current_tracker.reset(token)
+        return self._finish(request, response, tracker, time.perf_counter() - started, profiler)
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+
+        tracker = QueryTracker()
+        started = time.perf_counter()
+        token = _current_tracker.set(tracker)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current_tracker.reset(token)
+        return self._finish(request, response, tracker, time.perf_counter() - started, None)
+
+    def _finish(self, request, response, tracker, wall, profiler):
+        slow_ms = self.config['SLOW_REQUEST_MS']
+        is_slow = wall * 1000 >= slow_ms
+        route = _route_label(request)
+        duplicates = tracker.duplicates(self.config['DUPLICATE_QUERY_THRESHOLD'])
+        registry.record(
+            (route, request.method), wall, tracker.db_time, tracker.count,
+            sum(duplicates.values()), _response_size(response), response.status_code >= 500, is_slow,
+            self.config['RESERVOIR_SIZE'],
+        )
+
+        if duplicates:
+            logger.info(
+                "Posible N+1 en %s %s: %d consultas repetidas (%d distintas)",
+                request.method, route, sum(duplicates.values()), len(duplicates),
+            )
+        if is_slow:
+            logger.warning(
+                "Petición lenta %s %s: %.0fms (BD %.0fms, %d consultas)",
+                request.method, route, wall * 1000, tracker.db_time * 1000, tracker.count,
+            )
+            if profiler is not None:
+                self._dump_profile(profiler, request.method, route)
+
+        if self.config['SERVER_TIMING']:
+            response['Server-Timing'] = (
+                f"app;dur={wall * 1000:.1f}, db;dur={tracker.db_time * 1000:.1f};desc=\"{tracker.count} queries\""
+            )
+        return response
+
+    def _dump_profile(self, profiler, method, route):
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        name = _SAFE_FILENAME.sub('_', f"{method}{route}").strip('_')
+        path = self.profile_dir / f"{name}-{int(time.time() * 1000)}-{os.getpid()}.prof"
+        profiler.dump_stats(path)
+        logger.info("Perfil guardado en %s", path)
+
+
+# --- Exportación ---
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def render_prometheus(snapshot=None):
+    """ Formato de texto de Prometheus (exposition format 0.0.4). """
+    snapshot = registry.snapshot() if snapshot is None else snapshot
+    pid = os.getpid()
+    lines = []
+
+    def labels(route, method, **extra):
+        pairs = {'route': route, 'method': method, 'pid': pid, **extra}
+        return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in pairs.items()) + '}'
+
+    for metric, attr, help_text in (
+        ('smartsales_http_request_duration_seconds', 'wall', 'Tiempo total de la petición.'),
+        ('smartsales_http_db_duration_seconds', 'db', 'Tiempo en la base de datos por petición.'),
+    ):
+        lines += [f'# HELP {metric} {help_text}', f'# TYPE {metric} histogram']
+        for (route, method), stats in snapshot:
+            hist = getattr(stats, attr)
+            for bound, running in hist.cumulative():
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{metric}_bucket{labels(route, method, le=le)} {running}')
+            lines.append(f'{metric}_sum{labels(route, method)} {hist.total:.6f}')
+            lines.append(f'{metric}_count{labels(route, method)} {hist.count}')
+
+    for metric, attr, help_text in (
+        ('smartsales_http_requests_total', 'requests', 'Peticiones atendidas.'),
+        ('smartsales_http_errors_total', 'errors', 'Respuestas 5xx.'),
+        ('smartsales_http_slow_requests_total', 'slow', 'Peticiones por encima del umbral de lentitud.'),
+        ('smartsales_http_db_queries_total', 'queries', 'Consultas SQL ejecutadas.'),
+        ('smartsales_http_duplicate_queries_total', 'duplicate_queries', 'Consultas repetidas (posible N+1).'),
+        ('smartsales_http_response_bytes_total', 'response_bytes', 'Bytes de respuesta.'),
+    ):
+        lines += [f'# HELP {metric} {help_text}', f'# TYPE {metric} counter']
+        for (route, method), stats in snapshot:
+            lines.append(f'{metric}{labels(route, method)} {getattr(stats, attr)}')
+
+    metric = 'smartsales_http_request_duration_recent_seconds'
+    lines += [f'# HELP {metric} Percentiles de las últimas peticiones.', f'# TYPE {metric} gauge']
+    for (route, method), stats in snapshot:
+        for q, value in stats.recent_quantiles().items():
+            lines.append(f'{metric}{labels(route, method, quantile=q)} {value:.6f}')
+
+    return '\n'.join(lines) + '\n'
+
+
+def slow_path_report(snapshot=None, limit=20):
+    """ Rutas ordenadas por p99 reciente, con su carga de BD. """
+    snapshot = registry.snapshot() if snapshot is None else snapshot
+    rows = []
+    for (route, method), stats in snapshot:
+        quantiles = stats.recent_quantiles()
+        rows.append({
+            'route': route,
+            'method': method,
+            'requests': stats.requests,
+            'p50_ms': round(quantiles.get(0.5, 0) * 1000, 2),
+            'p99_ms': round(quantiles.get(0.99, 0) * 1000, 2),
+            'avg_db_ms': round(stats.db.total / stats.db.count * 1000, 2) if stats.db.count else 0,
+            'avg_queries': round(stats.queries / stats.requests, 1) if stats.requests else 0,
+            'duplicate_queries': stats.duplicate_queries,
+            'slow': stats.slow,
+            'errors': stats.errors,
+        })
+    rows.sort(key=lambda row: row['p99_ms'], reverse=True)
+    return rows[:limit]
@@ -0,0 +1,42 @@
+# core/lazy.py
+"""
+Import diferido de módulos pesados (pandas, scipy, reportlab, SDKs): el
+módulo se importa en el primer acceso a un atributo, no al cargar el
+URLconf. ``python manage.py profile_startup`` muestra qué queda en el
+arranque.
+
+    services = lazy_module('apps.reports.services')
+    ...
+    return services.generate_sales_pdf(queryset)
+
+El warm-up del master de gunicorn (core/warmup.py) los importa antes del
+fork, así que en producción el primer request no paga el import.
+"""
+import importlib
+import threading
+
+
+class LazyModule:
+    __slots__ = ('_name', '_module', '_lock')
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        with self._lock:
+            if self._module is None:
+                self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._module or self._load(), attr)
+
+    def __repr__(self):
+        state = 'cargado' if self._module is not None else 'sin cargar'
+        return f"<LazyModule {self._name} ({state})>"
+
+
+def lazy_module(name):
+    return LazyModule(name)
@@ -0,0 +1,63 @@
+# core/management/commands/check_query_plans.py
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+
+from core.benchmarks.fixtures import seed_dataset
+from core.benchmarks.harness import BenchmarkContext
+from core.query_plans import HOT_QUERIES, explain, sequential_scans
+
+
+class Command(BaseCommand):
+    help = (
+        "Siembra una base de datos de prueba, ejecuta EXPLAIN sobre las consultas "
+        "calientes de la API y falla si alguna recorre completa una tabla grande."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=int, default=20_000, help="Ventas del dataset sembrado.")
+        parser.add_argument('--seed', type=int, default=1234, help="Semilla del dataset.")
+        parser.add_argument('--query', action='append', dest='queries',
+                            help="Solo las consultas cuyo nombre empiece así (repetible).")
+        parser.add_argument('--show-plans', action='store_true', help="Imprime el plan de cada consulta.")
+        parser.add_argument('--keepdb', action='store_true', help="Reutiliza la base de datos de prueba.")
+
+    def handle(self, *args, **options):
+        prefixes = tuple(options['queries'] or ())
+        queries = [q for q in HOT_QUERIES if not prefixes or q.name.startswith(prefixes)]
+        if not queries:
+            raise CommandError("Ninguna consulta coincide con --query.")
+
+        context = BenchmarkContext(options['scale'], 0, options['seed'], stdout=self.stdout)
+        failures = []
+
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False, keepdb=options['keepdb'])
+        try:
+            dataset = seed_dataset(context)
+            # Estadísticas actualizadas, como en producción
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+
+            for query in queries:
+                if query.vendors and connection.vendor not in query.vendors:
+                    self.stdout.write(f"  --    {query.name:<40} solo en {', '.join(query.vendors)}")
+                    continue
+                plan = explain(query.build(dataset))
+                scans = sequential_scans(plan, index_scans=query.index_scans)
+                if scans:
+                    failures.append(query.name)
+                    self.stdout.write(self.style.ERROR(f"  FALLA {query.name:<40} seq scan en {', '.join(scans)}"))
+                else:
+                    self.stdout.write(self.style.SUCCESS(f"  OK    {query.name:<40} {query.description}"))
+                if options['show_plans'] or scans:
+                    self.stdout.write('\n'.join(f"        {line}" for line in plan.splitlines()))
+        finally:
+            teardown_databases(old_config, verbosity=0, keepdb=options['keepdb'])
+            teardown_test_environment()
+
+        if connection.vendor not in ('postgresql', 'sqlite'):
+            self.stdout.write(self.style.WARNING(f"Motor '{connection.vendor}' no soportado: no se verificó nada."))
+        if failures:
+            raise CommandError(f"{len(failures)} consulta(s) sin índice: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS(f"{len(queries)} consultas usan índices."))
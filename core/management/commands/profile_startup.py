@@ -0,0 +1,73 @@
+# core/management/commands/profile_startup.py
+import statistics
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.importtime import find, parse, render, run_manage
+
+
+class Command(BaseCommand):
+    help = (
+        "Perfila el arranque del proyecto: corre 'manage.py check' (o --command) "
+        "con -X importtime en un proceso nuevo y muestra el árbol de imports "
+        "(ms acumulados y propios; * = módulo del proyecto). Con --budget falla "
+        "si el arranque de 'manage.py check' supera ese tiempo."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--command', default='check', help="Comando de manage.py a perfilar (con argumentos).")
+        parser.add_argument('--min-ms', type=float, default=20.0, help="Oculta imports más rápidos que esto.")
+        parser.add_argument('--depth', type=int, help="Profundidad máxima del árbol.")
+        parser.add_argument('--module', help="Solo el subárbol de este módulo.")
+        parser.add_argument('--why', action='append', default=[],
+                            help="Muestra la cadena de imports que trae este módulo (repetible).")
+        parser.add_argument('--top', type=int, default=15, help="Módulos con más tiempo propio.")
+        parser.add_argument('--budget', type=float, help="Segundos máximos de arranque de 'manage.py check'.")
+        parser.add_argument('--runs', type=int, default=3, help="Corridas para medir el arranque (mediana).")
+
+    def handle(self, *args, **options):
+        command = options['command'].split()
+        try:
+            _, stderr = run_manage(command, importtime=True)
+        except RuntimeError as e:
+            raise CommandError(str(e))
+        roots = parse(stderr)
+        nodes = [node for root in roots for node in root.walk()]
+        total_ms = sum(root.cumulative_ms for root in roots)
+        project = [root for root in roots if root.is_project]
+        self.stdout.write(
+            f"manage.py {' '.join(command)}: {len(nodes)} módulos importados en {total_ms:.0f} ms "
+            f"({sum(r.cumulative_ms for r in project):.0f} ms desde módulos del proyecto de primer nivel)"
+        )
+
+        self.stdout.write(f"\n{'acum ms':>9} {'propio':>8}   módulo")
+        for line in render(roots, min_ms=options['min_ms'], max_depth=options['depth'], only=options['module']):
+            self.stdout.write(line)
+
+        if options['top']:
+            self.stdout.write(f"\nMódulos con más tiempo propio:")
+            for node in sorted(nodes, key=lambda n: n.self_us, reverse=True)[:options['top']]:
+                self.stdout.write(f"{node.self_ms:9.1f}   {node.name}")
+
+        for name in options['why']:
+            chain = find(roots, name)
+            self.stdout.write(f"\n{name}: " + (' -> '.join(chain) if chain else "no se importa"))
+
+        if options['budget'] is not None:
+            self._check_budget(options['budget'], options['runs'], project)
+
+    def _check_budget(self, budget, runs, project):
+        try:
+            seconds = statistics.median(run_manage(['check'])[0] for _ in range(max(runs, 1)))
+        except RuntimeError as e:
+            raise CommandError(str(e))
+        if seconds > budget:
+            heaviest = sorted(project, key=lambda n: n.cumulative_us, reverse=True)[:5]
+            detail = ', '.join(f"{node.name} ({node.cumulative_ms:.0f} ms)" for node in heaviest)
+            raise CommandError(
+                f"'manage.py check' tardó {seconds:.2f}s (mediana de {runs}), más que el presupuesto de "
+                f"{budget:.2f}s. Imports más pesados del proyecto: {detail}"
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"\n'manage.py check': {seconds:.2f}s (mediana de {runs}), dentro del presupuesto de {budget:.2f}s."
+        ))
@@ -0,0 +1,62 @@
+# core/management/commands/run_benchmarks.py
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+
+from core.benchmarks import load_suites
+from core.benchmarks.harness import BenchmarkContext, build_report, compare_reports, save_report
+
+
+class Command(BaseCommand):
+    help = (
+        "Ejecuta las suites de benchmarks sobre una base de datos de prueba "
+        "sembrada de forma determinista y guarda los resultados en JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--suite', action='append', dest='suites',
+                            help="Suite a ejecutar (repetible). Por defecto: api.")
+        parser.add_argument('--list', action='store_true', help="Lista las suites disponibles.")
+        parser.add_argument('--scale', type=int, default=5_000, help="Ventas del dataset sembrado.")
+        parser.add_argument('--iterations', type=int, default=20, help="Repeticiones por escenario.")
+        parser.add_argument('--seed', type=int, default=1234, help="Semilla del dataset.")
+        parser.add_argument('--output', default='bench_results.json', help="Archivo JSON de salida.")
+        parser.add_argument('--compare', default=None, help="JSON previo contra el cual comparar.")
+        parser.add_argument('--keepdb', action='store_true', help="Reutiliza la base de datos de prueba.")
+
+    def handle(self, *args, **options):
+        suites = load_suites()
+        if options['list']:
+            for name in sorted(suites):
+                self.stdout.write(name)
+            return
+
+        selected = options['suites'] or ['api']
+        unknown = [name for name in selected if name not in suites]
+        if unknown:
+            raise CommandError(f"Suites desconocidas: {', '.join(unknown)}. Disponibles: {', '.join(sorted(suites))}")
+
+        context = BenchmarkContext(options['scale'], options['iterations'], options['seed'], stdout=self.stdout)
+
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False, keepdb=options['keepdb'])
+        try:
+            for name in selected:
+                self.stdout.write(self.style.MIGRATE_HEADING(f"Suite '{name}'"))
+                suites[name](context)
+        finally:
+            teardown_databases(old_config, verbosity=0, keepdb=options['keepdb'])
+            teardown_test_environment()
+
+        report = build_report(context, selected)
+        save_report(report, options['output'])
+        self.stdout.write(self.style.SUCCESS(f"Resultados guardados en {options['output']}"))
+
+        if options['compare']:
+            with open(options['compare'], encoding='utf-8') as fh:
+                baseline = json.load(fh)
+            for name, metric, before, after, delta in compare_reports(baseline, report):
+                line = f"{name:<45} {metric:<8} {before:>12} -> {after:<12} ({delta:+.1f}%)"
+                style = self.style.ERROR if delta > 10 else self.style.SUCCESS if delta < -10 else str
+                self.stdout.write(style(line))
@@ -0,0 +1,62 @@
+# core/management/commands/seed_load_data.py
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core import seeding
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera clientes, catálogo, ventas, detalles y garantías sintéticos "
+        "en lotes (bulk_create / COPY), en paralelo por rango de fechas."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sales', type=int, default=100_000, help="Cantidad de ventas a generar.")
+        parser.add_argument('--users', type=int, default=1000, help="Cantidad de clientes sintéticos.")
+        parser.add_argument('--products', type=int, default=500, help="Tamaño mínimo del catálogo.")
+        parser.add_argument('--days', type=int, default=1825, help="Días de historia (hacia atrás).")
+        parser.add_argument('--end-date', type=date.fromisoformat, default=None, help="Último día (YYYY-MM-DD).")
+        parser.add_argument('--workers', type=int, default=1, help="Procesos en paralelo.")
+        parser.add_argument('--batch-size', type=int, default=20_000, help="Ventas por lote/transacción.")
+        parser.add_argument('--copy', action='store_true', help="Usar COPY (solo PostgreSQL).")
+        parser.add_argument('--seed', type=int, default=42, help="Semilla (la salida es determinista).")
+        parser.add_argument('--seasonality', type=float, default=0.3, help="Amplitud estacional anual (0-1).")
+        parser.add_argument('--peak-month', type=int, default=12, help="Mes de mayor demanda (1-12).")
+        parser.add_argument('--weekend-boost', type=float, default=0.25, help="Incremento de fin de semana.")
+        parser.add_argument('--trend', type=float, default=0.10, help="Crecimiento anual de la demanda.")
+        parser.add_argument('--truncate', action='store_true', help="Borra las ventas existentes antes.")
+
+    def handle(self, *args, **options):
+        if options['sales'] < 0 or options['users'] < 1 or options['products'] < 1:
+            raise CommandError("--sales debe ser >= 0; --users y --products deben ser >= 1.")
+        if not 1 <= options['peak_month'] <= 12:
+            raise CommandError("--peak-month debe estar entre 1 y 12.")
+
+        config = seeding.SeedConfig(
+            users=options['users'],
+            products=options['products'],
+            sales=options['sales'],
+            days=options['days'],
+            end_date=options['end_date'],
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            workers=max(1, options['workers']),
+            use_copy=options['copy'],
+            seasonality=options['seasonality'],
+            peak_month=options['peak_month'],
+            weekend_boost=options['weekend_boost'],
+            trend=options['trend'],
+        )
+
+        if options['truncate']:
+            self.stdout.write("Borrando ventas existentes...")
+            seeding.truncate_sales()
+
+        report = seeding.run(config, log=self.stdout.write)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{report['sales']} ventas, {report['lines']} detalles y {report['warranties']} garantías "
+            f"en {report['seconds']:.1f}s ({report['sales_per_minute']:,.0f} ventas/min)."
+        ))
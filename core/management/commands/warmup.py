@@ -0,0 +1,72 @@
+# core/management/commands/warmup.py
+import gc
+import multiprocessing
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from core.warmup import format_report, freeze, memory_kb, warm_up
+
+
+def _private_kb():
+    """ Memoria propia del proceso (no compartida con el master ni con otros workers). """
+    clean, dirty = memory_kb('Private_Clean', 'smaps_rollup'), memory_kb('Private_Dirty', 'smaps_rollup')
+    return None if clean is None else clean + dirty
+
+
+def _worker(barrier, results):
+    barrier.wait()
+    before = _private_kb()
+    warm_up()  # con preload no hace nada: los recursos ya vienen del master
+    gc.collect()  # un worker real recolecta tarde o temprano
+    barrier.wait()
+    after = _private_kb()
+    barrier.wait()
+    results.put(after - before if before is not None else None)
+
+
+class Command(BaseCommand):
+    help = (
+        "Carga los recursos compartidos (modelo de ventas, estilos PDF, Gemini, "
+        "Supabase) como el master de gunicorn y muestra tiempo y RSS por recurso. "
+        "Con --workers N crea N procesos por fork y mide la memoria propia que "
+        "suma cada uno."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=0, help="Workers a simular con fork.")
+        parser.add_argument('--no-preload', action='store_true',
+                            help="Cada worker carga sus recursos (sin preload_app).")
+        parser.add_argument('--no-freeze', action='store_true', help="Preload sin gc.freeze().")
+
+    def handle(self, *args, **options):
+        gc.disable()  # como gunicorn.conf.py mientras se carga la app
+        if not options['no_preload']:
+            for line in format_report(warm_up()):
+                self.stdout.write(line)
+            connections.close_all()
+        if options['no_freeze'] or options['no_preload']:
+            gc.enable()
+        else:
+            self.stdout.write(f"gc.freeze(): {freeze()} objetos")
+
+        workers = options['workers']
+        if not workers:
+            return
+        context = multiprocessing.get_context('fork')
+        barrier = context.Barrier(workers)
+        results = context.Queue()
+        processes = [context.Process(target=_worker, args=(barrier, results)) for _ in range(workers)]
+        for process in processes:
+            process.start()
+        sizes = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+
+        mode = 'sin preload' if options['no_preload'] else ('preload' if options['no_freeze'] else 'preload + freeze')
+        if None in sizes:
+            self.stdout.write(self.style.WARNING("Memoria por worker: solo disponible en Linux."))
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f"{workers} workers ({mode}): {sum(sizes) / len(sizes) / 1024:.1f} MB propios por worker"
+        ))
@@ -0,0 +1,163 @@
+# core/query_plans.py
+"""
+Consultas "calientes" de la API y verificación de sus planes de ejecución.
+
+Cada consulta se construye igual que en su vista y se pasa por EXPLAIN. Si
+el plan recorre completa (seq scan) alguna de las tablas grandes, la
+consulta no está usando los índices de ``apps/sales/models.py``. En SQLite
+también cuenta como recorrido completo ``SCAN tabla USING INDEX``, salvo
+los índices que la consulta declara en ``index_scans``.
+"""
+import re
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+
+from django.db import connection
+from django.db.models import Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from apps.sales.filters import SaleFilter
+from apps.sales.models import ActivatedWarranty, Sale, SaleDetail
+
+# Tablas en las que un seq scan es una regresión
+WATCHED_TABLES = (Sale._meta.db_table, SaleDetail._meta.db_table, ActivatedWarranty._meta.db_table)
+
+PAGE_SIZE = 25
+
+
+@dataclass
+class HotQuery:
+    name: str
+    build: callable  # build(dataset) -> QuerySet
+    description: str = ''
+    # Motores donde se verifica; None = todos. Los agregados completos solo
+    # evitan la tabla con índices INCLUDE (PostgreSQL).
+    vendors: tuple = None
+    # Índices que se pueden recorrer completos en orden (ORDER BY ... LIMIT
+    # corta el recorrido en la primera página)
+    index_scans: tuple = ()
+
+
+def _sale_filter(params):
+    return lambda dataset: SaleFilter(params, queryset=Sale.objects.order_by('-created_at')).qs[:PAGE_SIZE]
+
+
+def _last_days(dataset, days):
+    end = timezone.make_aware(datetime.combine(dataset.end_date + timedelta(days=1), time.min))
+    return end - timedelta(days=days), end
+
+
+HOT_QUERIES = [
+    HotQuery(
+        'dashboard.monthly_completed',
+        lambda dataset: Sale.objects.filter(status=Sale.SaleStatus.COMPLETED)
+        .annotate(month=TruncMonth('created_at')).values('month')
+        .annotate(total=Sum('total_amount')).order_by('month'),
+        "HistoricalSalesView / dataset de IA",
+        vendors=('postgresql',),
+    ),
+    HotQuery(
+        'sales.my_purchases',
+        lambda dataset: Sale.objects.filter(user=dataset.customer, status=Sale.SaleStatus.COMPLETED)
+        .order_by('-created_at')[:PAGE_SIZE],
+        "MyPurchasesListView",
+    ),
+    HotQuery(
+        'sales.my_warranties',
+        lambda dataset: ActivatedWarranty.objects.filter(user=dataset.customer)
+        .order_by('expiration_date')[:PAGE_SIZE],
+        "MyWarrantiesListView",
+    ),
+    HotQuery(
+        'warranties.my_expiring',
+        lambda dataset: ActivatedWarranty.objects.filter(user=dataset.customer)
+        .expiring_within(30, today=dataset.end_date).order_by('expiration_date')[:PAGE_SIZE],
+        "MyExpiringWarrantiesView",
+    ),
+    HotQuery(
+        'warranties.expiring_global',
+        lambda dataset: ActivatedWarranty.objects.expiring_within(30, today=dataset.end_date)
+        .order_by('expiration_date', 'id')[:PAGE_SIZE],
+        "AdminExpiringWarrantiesView / recordatorios",
+    ),
+    HotQuery(
+        'admin_sales.recent',
+        lambda dataset: Sale.objects.order_by('-created_at')[:PAGE_SIZE],
+        "AdminSaleListView sin filtros",
+        index_scans=('sale_created_idx',),
+    ),
+    HotQuery(
+        'admin_sales.status',
+        _sale_filter({'status': 'COMPLETED'}),
+        "AdminSaleListView ?status=",
+    ),
+    HotQuery(
+        'admin_sales.month_year',
+        lambda dataset: _sale_filter({'month': dataset.end_date.month, 'year': dataset.end_date.year})(dataset),
+        "AdminSaleListView / DynamicReportView ?month=&year=",
+    ),
+    HotQuery(
+        'admin_sales.fecha_range',
+        lambda dataset: _sale_filter({
+            'fecha_inicio': dataset.end_date.replace(day=1), 'fecha_fin': dataset.end_date,
+        })(dataset),
+        "AdminSaleListView ?fecha_inicio=&fecha_fin=",
+    ),
+    HotQuery(
+        'admin_sales.product_search',
+        _sale_filter({'product_search': 'Televisores'}),
+        "AdminSaleListView ?product_search= (EXISTS, sin distinct)",
+    ),
+    HotQuery(
+        'admin_sales.client_search',
+        _sale_filter({'client_search': 'Cliente1 Carga'}),
+        "AdminSaleListView ?client_search= (IN de usuarios, sin JOIN)",
+    ),
+    HotQuery(
+        'admin_sales.completed_last_30_days',
+        lambda dataset: Sale.objects.filter(
+            status=Sale.SaleStatus.COMPLETED, created_at__range=_last_days(dataset, 30),
+        ).order_by('-created_at'),
+        "Reportes con estado y rango de fechas",
+    ),
+    HotQuery(
+        'sale_details.by_product',
+        lambda dataset: SaleDetail.objects.filter(product_id=dataset.product_ids[0])
+        .values('product_id').annotate(units=Sum('quantity')),
+        "Unidades vendidas de un producto",
+    ),
+]
+
+
+def explain(queryset):
+    """ Texto del plan. En PostgreSQL se desactiva el seq scan para que el
+    planificador elija un índice si existe alguno utilizable (con datasets
+    pequeños el seq scan suele ganar aunque el índice sea correcto). """
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SET enable_seqscan = off')
+        try:
+            return queryset.explain()
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute('RESET enable_seqscan')
+    return queryset.explain()
+
+
+def sequential_scans(plan, vendor=None, tables=WATCHED_TABLES, index_scans=()):
+    """ Tablas vigiladas que el plan recorre completas. """
+    vendor = vendor or connection.vendor
+    found = set()
+    for line in plan.splitlines():
+        for table in tables:
+            if vendor == 'postgresql':
+                if re.search(rf'\bSeq Scan on {table}\b', line):
+                    found.add(table)
+            elif vendor == 'sqlite':
+                # "SEARCH tabla USING ..." acota por índice; "SCAN tabla" la
+                # recorre completa, con o sin "USING [COVERING] INDEX"
+                match = re.search(rf'\bSCAN {table}\b(?: USING (?:COVERING )?INDEX (\w+))?', line)
+                if match and match.group(1) not in index_scans:
+                    found.add(table)
+    return sorted(found)
@@ -0,0 +1,562 @@
+# core/seeding.py
+"""
+Generador masivo de datos sintéticos para pruebas de carga.
+
+A diferencia de los scripts de ``apps/ai/data/0*_populate_*.py`` (que crean
+fila por fila), aquí todo se genera por lotes con NumPy y se inserta con
+``bulk_create`` o, en PostgreSQL, con ``COPY``. Las ventas se reparten en
+"shards" contiguos por fecha para poder generarlas en varios procesos.
+"""
+import csv
+import io
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connection, connections, transaction
+from django.db.models import Max
+
+from apps.products.models import Brand, Category, Product, Warranty, WarrantyProvider
+from apps.sales.models import ActivatedWarranty, Sale, SaleDetail
+
+User = get_user_model()
+
+SEED_EMAIL_DOMAIN = 'loadtest.smartsales365.local'
+SEED_PASSWORD = 'password'
+
+# Datos de referencia mínimos (los mismos que usa 01_populate_core.py)
+CATEGORY_TREE = {
+    'Electrodomésticos': ['Refrigeradores', 'Cocinas', 'Lavadoras'],
+    'Tecnología': ['Televisores', 'Audio y Video', 'Computacion'],
+    'Muebles': ['Sofas y Sillones', 'Dormitorio', 'Comedor'],
+    'Climatización': ['Aires Acondicionados', 'Ventiladores'],
+}
+BRAND_NAMES = ['Samsung', 'LG', 'Sony', 'Hisense', 'Mabe', 'Indurama', 'Oster']
+WARRANTY_TEMPLATES = [
+    ("Garantía Estándar (12 Meses)", 365),
+    ("Garantía Limitada (6 Meses)", 180),
+    ("Garantía Extendida Motor/Compresor (2 Años)", 730),
+    ("Garantía Básica (90 Días)", 90),
+]
+
+
+@dataclass
+class SeedConfig:
+    users: int = 1000
+    products: int = 500
+    sales: int = 100_000
+    days: int = 1825
+    end_date: date = None
+    seed: int = 42
+    batch_size: int = 20_000
+    workers: int = 1
+    use_copy: bool = False
+    max_lines: int = 4
+    # Estacionalidad: amplitud anual, mes pico, bonus de fin de semana y
+    # crecimiento anual (tendencia). Todo multiplicativo sobre la demanda base.
+    seasonality: float = 0.3
+    peak_month: int = 12
+    weekend_boost: float = 0.25
+    trend: float = 0.10
+    # Exponente Zipf para la popularidad de productos
+    popularity_skew: float = 1.1
+    warranty_ratio: float = 0.8
+
+
+@dataclass
+class CatalogArrays:
+    """ Vista columnar del catálogo, lo que necesita cada worker. """
+    product_ids: np.ndarray
+    price_cents: np.ndarray
+    warranty_ids: np.ndarray    # 0 = sin garantía
+    warranty_days: np.ndarray
+    popularity: np.ndarray
+    names: list                 # para Sale.line_summary
+
+
+@dataclass
+class ShardPlan:
+    index: int
+    start_day: date
+    day_counts: np.ndarray      # ventas por día dentro del shard
+    first_sale_id: int
+
+    @property
+    def sale_count(self):
+        return int(self.day_counts.sum())
+
+
+@dataclass
+class ShardResult:
+    index: int
+    sales: int
+    lines: int
+    warranties: int
+    seconds: float
+
+
+# --- Preparación: catálogo y usuarios ---
+
+def ensure_reference_data():
+    """ Crea categorías, marcas y plantillas de garantía si no existen. """
+    for parent_name, children in CATEGORY_TREE.items():
+        parent, _ = Category.objects.get_or_create(name=parent_name)
+        for child in children:
+            Category.objects.get_or_create(name=child, defaults={'parent': parent})
+
+    for name in BRAND_NAMES:
+        Brand.objects.get_or_create(name=name)
+
+    if not Warranty.objects.exists():
+        provider, _ = WarrantyProvider.objects.get_or_create(name='Servicio Técnico Autorizado S.A.')
+        Warranty.objects.bulk_create([
+            Warranty(provider=provider, title=title, terms=title, duration_days=days)
+            for title, days in WARRANTY_TEMPLATES
+        ])
+
+
+def ensure_catalog(config, rng):
+    """
+    Completa el catálogo hasta ``config.products`` productos y devuelve
+    sus columnas como arrays de NumPy.
+    """
+    ensure_reference_data()
+
+    missing = config.products - Product.objects.count()
+    if missing > 0:
+        categories = list(Category.objects.filter(parent__isnull=False).values_list('id', 'name'))
+        brands = list(Brand.objects.values_list('id', 'name'))
+        warranties = list(Warranty.objects.values_list('id', flat=True))
+
+        category_idx = rng.integers(0, len(categories), missing)
+        brand_idx = rng.integers(0, len(brands), missing)
+        warranty_idx = rng.integers(0, len(warranties), missing)
+        has_warranty = rng.random(missing) < config.warranty_ratio
+        # Precios log-normales entre ~Bs. 150 y ~Bs. 15.000
+        price_cents = np.clip(rng.lognormal(np.log(2500), 0.7, missing), 150, 15000) * 100
+
+        products = []
+        for i in range(missing):
+            category_id, category_name = categories[category_idx[i]]
+            brand_id, brand_name = brands[brand_idx[i]]
+            products.append(Product(
+                name=f"{category_name} {brand_name} #{i + 1}",
+                description=f"Producto sintético para pruebas de carga ({category_name}).",
+                price=Decimal(int(price_cents[i])).scaleb(-2),
+                stock=int(rng.integers(1_000, 100_000)),
+                category_id=category_id,
+                brand_id=brand_id,
+                warranty_id=warranties[warranty_idx[i]] if has_warranty[i] else None,
+            ))
+        Product.objects.bulk_create(products, batch_size=config.batch_size)
+
+    rows = list(
+        Product.objects.order_by('id').values_list('id', 'price', 'warranty_id', 'warranty__duration_days', 'name')
+    )
+    product_ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+    price_cents = np.fromiter((int(r[1] * 100) for r in rows), dtype=np.int64, count=len(rows))
+    warranty_ids = np.fromiter((r[2] or 0 for r in rows), dtype=np.int64, count=len(rows))
+    warranty_days = np.fromiter((r[3] or 0 for r in rows), dtype=np.int64, count=len(rows))
+
+    # Popularidad tipo Zipf sobre una permutación aleatoria del catálogo
+    ranks = rng.permutation(len(rows)) + 1
+    popularity = 1.0 / ranks ** config.popularity_skew
+    popularity /= popularity.sum()
+
+    names = [r[4] for r in rows]
+
+    return CatalogArrays(product_ids, price_cents, warranty_ids, warranty_days, popularity, names)
+
+
+def ensure_users(config):
+    """ Crea (una sola vez) los clientes sintéticos y devuelve sus ids. """
+    # El hash es caro (PBKDF2): se calcula una vez y se reutiliza.
+    password = make_password(SEED_PASSWORD)
+    users = [
+        User(
+            email=f"cliente{i + 1}@{SEED_EMAIL_DOMAIN}",
+            password=password,
+            first_name=f"Cliente{i + 1}",
+            last_name="Carga",
+            role=User.Role.CUSTOMER,
+        )
+        for i in range(config.users)
+    ]
+    User.objects.bulk_create(users, batch_size=config.batch_size, ignore_conflicts=True)
+
+    ids = User.objects.filter(email__endswith=f"@{SEED_EMAIL_DOMAIN}").order_by('id').values_list('id', flat=True)
+    return np.fromiter(ids, dtype=np.int64)
+
+
+# --- Planificación por fechas ---
+
+def daily_weights(config, start_day, n_days):
+    """ Peso relativo de cada día: tendencia x estacionalidad anual x semana. """
+    days = np.arange(n_days)
+    dates = np.datetime64(start_day, 'D') + days
+    day_of_year = (dates - dates.astype('datetime64[Y]')).astype(np.int64)
+    # Día del año aproximado del mes pico (mitad de mes)
+    peak_day = (config.peak_month - 1) * 30.4 + 15
+    yearly = 1 + config.seasonality * np.cos(2 * np.pi * (day_of_year - peak_day) / 365.25)
+    # 1970-01-01 fue jueves: (d + 3) % 7 -> 0 = lunes ... 5, 6 = fin de semana
+    weekday = (dates.astype(np.int64) + 3) % 7
+    weekly = np.where(weekday >= 5, 1 + config.weekend_boost, 1.0)
+    trend = (1 + config.trend) ** (days / 365.25)
+    weights = trend * yearly * weekly
+    return weights / weights.sum()
+
+
+def plan_shards(config, rng, first_sale_id):
+    """
+    Reparte ``config.sales`` entre días (multinomial sobre los pesos) y
+    agrupa días contiguos en shards de tamaño parecido.
+    """
+    end_day = config.end_date or date.today()
+    start_day = end_day - timedelta(days=config.days - 1)
+    counts = rng.multinomial(config.sales, daily_weights(config, start_day, config.days))
+
+    n_shards = max(1, min(config.days, config.workers * 4))
+    cumulative = np.cumsum(counts)
+    targets = np.linspace(0, config.sales, n_shards + 1)[1:-1]
+    cuts = np.unique(np.searchsorted(cumulative, targets, side='right'))
+    bounds = [0, *[int(c) for c in cuts if 0 < c < config.days], config.days]
+
+    plans = []
+    next_id = first_sale_id
+    for index, (lo, hi) in enumerate(zip(bounds[:-1], bounds[1:])):
+        day_counts = counts[lo:hi]
+        plans.append(ShardPlan(index, start_day + timedelta(days=lo), day_counts, next_id))
+        next_id += int(day_counts.sum())
+    return plans
+
+
+# --- Generación vectorizada ---
+
+def generate_shard(plan, catalog, user_ids, config, rng):
+    """
+    Genera las columnas de ventas, detalles y garantías de un shard.
+    Todo se calcula con operaciones vectorizadas; no se crea ningún modelo.
+    """
+    n = plan.sale_count
+    day_offsets = np.repeat(np.arange(len(plan.day_counts)), plan.day_counts)
+    # Horario comercial: 08:00 a 22:00 UTC
+    seconds = rng.integers(8 * 3600, 22 * 3600, n)
+    epoch_day = np.datetime64(plan.start_day, 'D').astype(np.int64)
+    created_ts = (epoch_day + day_offsets) * 86400 + seconds
+
+    sale_ids = np.arange(plan.first_sale_id, plan.first_sale_id + n, dtype=np.int64)
+    sale_users = user_ids[rng.integers(0, len(user_ids), n)]
+
+    lines_per_sale = rng.integers(1, config.max_lines + 1, n)
+    line_sale_idx = np.repeat(np.arange(n), lines_per_sale)
+    line_product_idx = rng.choice(len(catalog.product_ids), line_sale_idx.size, p=catalog.popularity)
+    line_quantity = rng.integers(1, 4, line_sale_idx.size)
+    line_price = catalog.price_cents[line_product_idx]
+    sale_total = np.bincount(line_sale_idx, weights=line_price * line_quantity, minlength=n).astype(np.int64)
+    sale_items = np.bincount(line_sale_idx, weights=line_quantity, minlength=n).astype(np.int64)
+    # line_summary: etiquetas por línea unidas por venta (las líneas son contiguas)
+    labels = [
+        f"{catalog.names[p]} ({q}x)" for p, q in zip(line_product_idx.tolist(), line_quantity.tolist())
+    ]
+    line_ends = np.cumsum(lines_per_sale).tolist()
+    sale_summary = ['; '.join(labels[a:b]) for a, b in zip([0, *line_ends[:-1]], line_ends)]
+
+    warranty_mask = catalog.warranty_ids[line_product_idx] > 0
+    warranty_line_idx = np.flatnonzero(warranty_mask)
+    warranty_start_day = epoch_day + day_offsets[line_sale_idx[warranty_line_idx]]
+    warranty_exp_day = warranty_start_day + catalog.warranty_days[line_product_idx[warranty_line_idx]]
+
+    return {
+        'sale_ids': sale_ids,
+        'sale_users': sale_users,
+        'sale_total': sale_total,
+        'sale_items': sale_items,
+        'sale_summary': sale_summary,
+        'created_ts': created_ts,
+        'line_sale_id': sale_ids[line_sale_idx],
+        'line_product_id': catalog.product_ids[line_product_idx],
+        'line_quantity': line_quantity,
+        'line_price': line_price,
+        'warranty_user_id': sale_users[line_sale_idx[warranty_line_idx]],
+        'warranty_sale_id': sale_ids[line_sale_idx[warranty_line_idx]],
+        'warranty_product_id': catalog.product_ids[line_product_idx[warranty_line_idx]],
+        'warranty_template_id': catalog.warranty_ids[line_product_idx[warranty_line_idx]],
+        'warranty_start_day': warranty_start_day,
+        'warranty_exp_day': warranty_exp_day,
+    }
+
+
+def _cents_to_str(cents):
+    return [f"{c // 100}.{c % 100:02d}" for c in cents.tolist()]
+
+
+def _days_to_str(days):
+    return np.datetime_as_string(days.astype('datetime64[D]')).tolist()
+
+
+def _timestamps_to_str(ts):
+    return [f"{s}+00:00" for s in np.datetime_as_string(ts.astype('datetime64[s]')).tolist()]
+
+
+def _timestamps_to_datetimes(ts):
+    return [
+        d.replace(tzinfo=dt_timezone.utc)
+        for d in ts.astype('datetime64[s]').astype(object).tolist()
+    ]
+
+
+def _days_to_dates(days):
+    return days.astype('datetime64[D]').astype(object).tolist()
+
+
+# --- Escritura ---
+
+@contextmanager
+def preserve_timestamps():
+    """
+    ``bulk_create`` respeta ``auto_now_add`` y pisaría las fechas históricas;
+    lo desactivamos temporalmente en los campos afectados.
+    """
+    fields = [
+        Sale._meta.get_field('created_at'),
+        ActivatedWarranty._meta.get_field('start_date'),
+    ]
+    previous = [f.auto_now_add for f in fields]
+    for f in fields:
+        f.auto_now_add = False
+    try:
+        yield
+    finally:
+        for f, value in zip(fields, previous):
+            f.auto_now_add = value
+
+
+def _copy_rows(model, columns, rows):
+    """ Inserta filas con COPY ... FROM STDIN (solo PostgreSQL). """
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator='\n').writerows(rows)
+    buffer.seek(0)
+    column_sql = ', '.join(connection.ops.quote_name(c) for c in columns)
+    sql = f"COPY {connection.ops.quote_name(model._meta.db_table)} ({column_sql}) FROM STDIN WITH (FORMAT csv)"
+    with connection.cursor() as cursor:
+        if hasattr(cursor, 'copy_expert'):  # psycopg2
+            cursor.copy_expert(sql, buffer)
+        else:  # psycopg 3
+            with cursor.copy(sql) as copy:
+                copy.write(buffer.getvalue())
+
+
+def _write_batch_copy(data, lo, hi, line_lo, line_hi, w_lo, w_hi):
+    ids = data['sale_ids'][lo:hi].tolist()
+    _copy_rows(
+        Sale,
+        ['id', 'user_id', 'total_amount', 'status', 'stripe_payment_intent_id', 'created_at',
+         'item_count', 'line_summary'],
+        zip(
+            map(str, ids),
+            map(str, data['sale_users'][lo:hi].tolist()),
+            _cents_to_str(data['sale_total'][lo:hi]),
+            [Sale.SaleStatus.COMPLETED.value] * len(ids),
+            [f"seed_{i}" for i in ids],
+            _timestamps_to_str(data['created_ts'][lo:hi]),
+            map(str, data['sale_items'][lo:hi].tolist()),
+            data['sale_summary'][lo:hi],
+        ),
+    )
+    _copy_rows(
+        SaleDetail,
+        ['sale_id', 'product_id', 'quantity', 'price_at_purchase'],
+        zip(
+            map(str, data['line_sale_id'][line_lo:line_hi].tolist()),
+            map(str, data['line_product_id'][line_lo:line_hi].tolist()),
+            map(str, data['line_quantity'][line_lo:line_hi].tolist()),
+            _cents_to_str(data['line_price'][line_lo:line_hi]),
+        ),
+    )
+    _copy_rows(
+        ActivatedWarranty,
+        ['user_id', 'product_id', 'sale_id', 'warranty_template_id', 'start_date', 'expiration_date'],
+        zip(
+            map(str, data['warranty_user_id'][w_lo:w_hi].tolist()),
+            map(str, data['warranty_product_id'][w_lo:w_hi].tolist()),
+            map(str, data['warranty_sale_id'][w_lo:w_hi].tolist()),
+            map(str, data['warranty_template_id'][w_lo:w_hi].tolist()),
+            _days_to_str(data['warranty_start_day'][w_lo:w_hi]),
+            _days_to_str(data['warranty_exp_day'][w_lo:w_hi]),
+        ),
+    )
+
+
+def _write_batch_orm(data, lo, hi, line_lo, line_hi, w_lo, w_hi, batch_size):
+    ids = data['sale_ids'][lo:hi].tolist()
+    Sale.objects.bulk_create([
+        Sale(
+            id=sale_id,
+            user_id=user_id,
+            total_amount=Decimal(total).scaleb(-2),
+            status=Sale.SaleStatus.COMPLETED,
+            stripe_payment_intent_id=f"seed_{sale_id}",
+            created_at=created_at,
+            item_count=items,
+            line_summary=summary,
+        )
+        for sale_id, user_id, total, created_at, items, summary in zip(
+            ids,
+            data['sale_users'][lo:hi].tolist(),
+            data['sale_total'][lo:hi].tolist(),
+            _timestamps_to_datetimes(data['created_ts'][lo:hi]),
+            data['sale_items'][lo:hi].tolist(),
+            data['sale_summary'][lo:hi],
+        )
+    ], batch_size=batch_size)
+    SaleDetail.objects.bulk_create([
+        SaleDetail(sale_id=sale_id, product_id=product_id, quantity=quantity,
+                   price_at_purchase=Decimal(price).scaleb(-2))
+        for sale_id, product_id, quantity, price in zip(
+            data['line_sale_id'][line_lo:line_hi].tolist(),
+            data['line_product_id'][line_lo:line_hi].tolist(),
+            data['line_quantity'][line_lo:line_hi].tolist(),
+            data['line_price'][line_lo:line_hi].tolist(),
+        )
+    ], batch_size=batch_size)
+    ActivatedWarranty.objects.bulk_create([
+        ActivatedWarranty(user_id=user_id, product_id=product_id, sale_id=sale_id,
+                          warranty_template_id=template_id, start_date=start, expiration_date=end)
+        for user_id, product_id, sale_id, template_id, start, end in zip(
+            data['warranty_user_id'][w_lo:w_hi].tolist(),
+            data['warranty_product_id'][w_lo:w_hi].tolist(),
+            data['warranty_sale_id'][w_lo:w_hi].tolist(),
+            data['warranty_template_id'][w_lo:w_hi].tolist(),
+            _days_to_dates(data['warranty_start_day'][w_lo:w_hi]),
+            _days_to_dates(data['warranty_exp_day'][w_lo:w_hi]),
+        )
+    ], batch_size=batch_size)
+
+
+def write_shard(data, config):
+    """ Escribe un shard en lotes de ``config.batch_size`` ventas. """
+    use_copy = config.use_copy and connection.vendor == 'postgresql'
+    sale_ids = data['sale_ids']
+    # Los detalles y garantías están ordenados por venta: buscamos los cortes
+    line_bounds = np.searchsorted(data['line_sale_id'], sale_ids[::config.batch_size])
+    warranty_bounds = np.searchsorted(data['warranty_sale_id'], sale_ids[::config.batch_size])
+    line_bounds = [*line_bounds.tolist(), data['line_sale_id'].size]
+    warranty_bounds = [*warranty_bounds.tolist(), data['warranty_sale_id'].size]
+
+    with preserve_timestamps():
+        for batch, lo in enumerate(range(0, sale_ids.size, config.batch_size)):
+            hi = min(lo + config.batch_size, sale_ids.size)
+            bounds = (line_bounds[batch], line_bounds[batch + 1], warranty_bounds[batch], warranty_bounds[batch + 1])
+            with transaction.atomic():
+                if use_copy:
+                    _write_batch_copy(data, lo, hi, *bounds)
+                else:
+                    _write_batch_orm(data, lo, hi, *bounds, batch_size=config.batch_size)
+
+
+# --- Ejecución (en el proceso actual o en un pool) ---
+
+_WORKER_STATE = {}
+
+
+def _init_worker(catalog, user_ids, config):
+    import django
+    from django.apps import apps
+
+    if not apps.ready:  # Arranque "spawn" (Windows/macOS)
+        django.setup()
+    # Nunca compartir sockets de BD heredados del proceso padre
+    connections.close_all()
+    _WORKER_STATE.update(catalog=catalog, user_ids=user_ids, config=config)
+
+
+def seed_shard(plan):
+    started = time.perf_counter()
+    config = _WORKER_STATE['config']
+    rng = np.random.default_rng([config.seed, plan.index])
+    data = generate_shard(plan, _WORKER_STATE['catalog'], _WORKER_STATE['user_ids'], config, rng)
+    write_shard(data, config)
+    connections.close_all()
+    return ShardResult(
+        plan.index, plan.sale_count, int(data['line_sale_id'].size),
+        int(data['warranty_sale_id'].size), time.perf_counter() - started,
+    )
+
+
+def truncate_sales():
+    """ Borra ventas, detalles y garantías (TRUNCATE en PostgreSQL). """
+    if connection.vendor == 'postgresql':
+        tables = ', '.join(
+            connection.ops.quote_name(m._meta.db_table) for m in (ActivatedWarranty, SaleDetail, Sale)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(f"TRUNCATE {tables} RESTART IDENTITY CASCADE")
+    else:
+        Sale.objects.all().delete()
+
+
+def reset_sale_sequence():
+    """ Las ventas se insertan con id explícito: re-sincroniza la secuencia. """
+    statements = connection.ops.sequence_reset_sql(no_style(), [Sale])
+    if statements:
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+
+def run(config, log=print):
+    """
+    Punto de entrada: prepara catálogo y usuarios, planifica los shards
+    y los genera (en paralelo si ``config.workers > 1``).
+    """
+    rng = np.random.default_rng(config.seed)
+
+    started = time.perf_counter()
+    catalog = ensure_catalog(config, rng)
+    user_ids = ensure_users(config)
+    log(f"Catálogo: {catalog.product_ids.size} productos, {user_ids.size} clientes "
+        f"({time.perf_counter() - started:.1f}s)")
+
+    first_sale_id = (Sale.objects.aggregate(m=Max('id'))['m'] or 0) + 1
+    plans = plan_shards(config, rng, first_sale_id)
+
+    workers = config.workers
+    if connection.vendor == 'sqlite' and workers > 1:
+        log("SQLite no admite escritores concurrentes: usando 1 worker.")
+        workers = 1
+
+    results = []
+    started = time.perf_counter()
+    if workers == 1:
+        _init_worker(catalog, user_ids, config)
+        for plan in plans:
+            results.append(seed_shard(plan))
+            log(f"  shard {plan.index}: {plan.sale_count} ventas")
+    else:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        connections.close_all()
+        context = multiprocessing.get_context('fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn')
+        with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker,
+                                 initargs=(catalog, user_ids, config)) as pool:
+            for future in as_completed([pool.submit(seed_shard, plan) for plan in plans]):
+                result = future.result()
+                results.append(result)
+                log(f"  shard {result.index}: {result.sales} ventas en {result.seconds:.1f}s")
+
+    reset_sale_sequence()
+    elapsed = time.perf_counter() - started
+    return {
+        'sales': sum(r.sales for r in results),
+        'lines': sum(r.lines for r in results),
+        'warranties': sum(r.warranties for r in results),
+        'seconds': elapsed,
+        'sales_per_minute': sum(r.sales for r in results) / elapsed * 60 if elapsed else 0,
+    }
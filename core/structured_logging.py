@@ -0,0 +1,189 @@
+# core/structured_logging.py
+"""
+Logging estructurado y no bloqueante.
+
+- ``RequestIdMiddleware`` asigna un id a cada petición (o respeta el header
+  ``X-Request-ID``) y lo deja en un ``ContextVar``.
+- ``RequestIdFilter`` copia ese id a cada registro.
+- ``SamplingFilter`` descarta una fracción de los mensajes DEBUG/INFO de
+  módulos ruidosos.
+- ``AsyncQueueHandler`` resuelve el mensaje (``msg % args``) en el hilo que
+  loguea, así los argumentos no cambian ni consultan la BD después, y
+  encola el registro; el formato final (texto o JSON) y la escritura
+  ocurren en un hilo aparte.
+- ``JsonFormatter`` emite una línea JSON por registro.
+"""
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import random
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone as dt_timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.utils.module_loading import import_string
+
+request_id_var = ContextVar('request_id', default='-')
+
+REQUEST_ID_HEADER = 'HTTP_X_REQUEST_ID'
+
+# Atributos estándar de LogRecord (lo demás viene de ``extra=``)
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'request_id'}
+
+
+class RequestIdMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def _start(self, request):
+        request_id = request.META.get(REQUEST_ID_HEADER) or uuid.uuid4().hex
+        request.request_id = request_id[:64]
+        return request_id_var.set(request.request_id)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = self._start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            request_id_var.reset(token)
+        response['X-Request-ID'] = request.request_id
+        return response
+
+    async def __acall__(self, request):
+        token = self._start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            request_id_var.reset(token)
+        response['X-Request-ID'] = request.request_id
+        return response
+
+
+class RequestIdFilter(logging.Filter):
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Conserva solo una fracción de los registros por debajo de WARNING de
+    los loggers indicados, p. ej. ``{'apps.reports': 0.1}``. Se aplica la
+    regla del prefijo más largo.
+    """
+
+    def __init__(self, rates=None):
+        super().__init__()
+        self.rates = sorted((rates or {}).items(), key=lambda item: len(item[0]), reverse=True)
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        for prefix, rate in self.rates:
+            if record.name == prefix or record.name.startswith(prefix + '.'):
+                return rate >= 1 or random.random() < rate
+        return True
+
+
+def parse_sample_rates(value):
+    """ ``"apps.reports=0.1,apps.ai=0.5"`` -> ``{'apps.reports': 0.1, ...}`` """
+    rates = {}
+    for item in (value or '').split(','):
+        name, sep, rate = item.partition('=')
+        if sep and name.strip():
+            rates[name.strip()] = float(rate)
+    return rates
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        payload = {
+            'ts': datetime.fromtimestamp(record.created, dt_timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'request_id': getattr(record, 'request_id', '-'),
+            'pid': record.process,
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                payload[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload['exc'] = record.exc_text
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+class AsyncQueueHandler(QueueHandler):
+    """
+    Encola los registros y los entrega a ``target`` desde un hilo listener.
+    Si la cola está llena el registro se descarta (nunca bloquea la
+    petición) y se cuenta en ``dropped``.
+    """
+
+    def __init__(self, target='logging.StreamHandler', target_kwargs=None, json=False, maxsize=10_000):
+        super().__init__(queue.Queue(maxsize=maxsize))
+        self.target = import_string(target)(**(target_kwargs or {}))
+        self.target.setFormatter(
+            JsonFormatter() if json
+            else logging.Formatter('%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s')
+        )
+        self.dropped = 0
+        self.listener = None
+        self._start_listener()
+        # Los hilos no sobreviven a fork() (workers de gunicorn)
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork)
+        atexit.register(self._stop_listener)
+
+    def _start_listener(self):
+        self.listener = QueueListener(self.queue, self.target, respect_handler_level=True)
+        self.listener.start()
+
+    def _after_fork(self):
+        if self.listener is not None:
+            self.queue = queue.Queue(maxsize=self.queue.maxsize)
+            self._start_listener()
+
+    def _stop_listener(self):
+        if self.listener is not None and self.listener._thread is not None:
+            self.listener.stop()
+
+    def close(self):
+        # dictConfig cierra los handlers anteriores al reconfigurar
+        self._stop_listener()
+        self.listener = None
+        self.target.close()
+        super().close()
+
+    def prepare(self, record):
+        # Como QueueHandler, el mensaje se resuelve aquí: los argumentos
+        # pueden mutar después (o consultar la BD en su __str__). A diferencia
+        # de QueueHandler, el formato final queda para el listener.
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = self.target.formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
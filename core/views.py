@@ -0,0 +1,30 @@
+# core/views.py
+from django.http import HttpResponse
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .instrumentation import render_prometheus, slow_path_report
+
+MAX_LIMIT = 500
+
+
+class MetricsView(APIView):
+    """
+    (Solo Admin) Métricas de peticiones del proceso actual.
+    - Por defecto: formato de texto de Prometheus.
+    - ?format=json: reporte de rutas lentas ordenado por p99 (``&limit=``,
+      entre 1 y MAX_LIMIT).
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        if request.query_params.get('format') == 'json':
+            limit = request.query_params.get('limit', '20')
+            if not limit.isdigit() or not 1 <= int(limit) <= MAX_LIMIT:
+                return Response({"error": f"limit debe estar entre 1 y {MAX_LIMIT}."},
+                                status=status.HTTP_400_BAD_REQUEST)
+            limit = int(limit)
+            return Response(slow_path_report(limit=limit))
+        return HttpResponse(render_prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')
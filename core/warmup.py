@@ -0,0 +1,144 @@
+# core/warmup.py
+"""
+Warm-up de recursos compartidos de solo lectura.
+
+Cada recurso tiene un getter perezoso (se crea en el primer uso):
+
+- ``ai_model``: el modelo de ventas (``apps.ai.model_registry.get_model``).
+- ``pdf_styles``: la hoja de estilos de ReportLab de los reportes PDF.
+- ``gemini``: la configuración del SDK de Gemini.
+- ``supabase``: el cliente de supabase-py.
+
+Antes de los recursos se importan los módulos pesados que las vistas cargan
+con ``core.lazy.lazy_module`` (pandas, numpy/scipy, reportlab), así los
+workers no pagan ese import en su primera petición.
+
+Con gunicorn (``gunicorn.conf.py``, ``preload_app``) el master llama a
+``warm_up()`` antes de crear los workers y después ``freeze()``: los
+workers heredan los recursos ya construidos por fork y, con ``gc.freeze()``,
+el recolector no escribe en esas páginas, así que siguen compartidas
+(copy-on-write) en lugar de duplicarse en cada worker.
+
+Las listas se pueden cambiar con ``settings.WARMUP['MODULES']`` y
+``settings.WARMUP['ASSETS']`` ({nombre: ruta del getter}) o sumar recursos
+con ``register()``.
+"""
+import gc
+import importlib
+import logging
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODULES = [
+    'apps.ai.prediction_service',
+    'apps.ai.inference',
+    'apps.analytics.cohorts',
+    'apps.analytics.recommendations',
+    'apps.reports.services',
+]
+
+DEFAULT_ASSETS = {
+    'ai_model': 'apps.ai.model_registry.get_model',
+    'pdf_styles': 'apps.reports.services.get_styles',
+    'gemini': 'apps.reports.parser.configure_gemini',
+    'supabase': 'config.supabase_client.get_supabase',
+}
+
+_registered = {}
+
+
+def get_config():
+    return {'ENABLED': True, 'MODULES': DEFAULT_MODULES, 'ASSETS': DEFAULT_ASSETS, **getattr(settings, 'WARMUP', {})}
+
+
+def register(name, loader):
+    """ Suma un recurso: ``loader`` es un callable o la ruta a uno. """
+    _registered[name] = loader
+    return loader
+
+
+def _importer(module):
+    return lambda: importlib.import_module(module)
+
+
+def assets():
+    """ {nombre: loader}: primero los módulos (``import:<módulo>``), después los recursos. """
+    config = get_config()
+    modules = {f'import:{module}': _importer(module) for module in config['MODULES']}
+    return {**modules, **config['ASSETS'], **_registered}
+
+
+def memory_kb(field='VmRSS', path='status'):
+    """ Campo (en kB) de /proc/self/<path>; None fuera de Linux. """
+    try:
+        with open(f'/proc/self/{path}') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+@dataclass
+class AssetReport:
+    name: str
+    seconds: float
+    rss_kb: int = None
+    error: str = None
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+def warm_up(names=None):
+    """
+    Carga los recursos (todos, o ``names``) y devuelve un ``AssetReport``
+    por cada uno con el tiempo y el crecimiento del RSS (incluye importar el
+    módulo del getter). Un recurso que falla se informa y no frena a los demás.
+    """
+    reports = []
+    for name, loader in assets().items():
+        if names is not None and name not in names:
+            continue
+        rss_before = memory_kb()
+        started = time.perf_counter()
+        error = None
+        try:
+            (import_string(loader) if isinstance(loader, str) else loader)()
+        except Exception as e:  # noqa: BLE001 - se reporta y sigue con el resto
+            logger.warning("Warm-up de %s falló: %s", name, e)
+            error = f"{type(e).__name__}: {e}"
+        rss_after = memory_kb()
+        reports.append(AssetReport(
+            name=name,
+            seconds=time.perf_counter() - started,
+            rss_kb=rss_after - rss_before if rss_before is not None else None,
+            error=error,
+        ))
+    return reports
+
+
+def freeze():
+    """ Pasa todos los objetos vivos a la generación permanente del GC (antes del fork). """
+    gc.collect()
+    gc.freeze()
+    return gc.get_freeze_count()
+
+
+def format_report(reports):
+    width = max([len('recurso')] + [len(report.name) for report in reports])
+    lines = [f"{'recurso':<{width}} {'ms':>9} {'RSS MB':>8}"]
+    for report in reports:
+        rss = f"{report.rss_kb / 1024:8.1f}" if report.rss_kb is not None else f"{'-':>8}"
+        lines.append(f"{report.name:<{width}} {report.seconds * 1000:9.1f} {rss}"
+                     + (f"  ERROR {report.error}" if report.error else ""))
+    total_kb = sum(report.rss_kb or 0 for report in reports)
+    lines.append(f"{'total':<{width}} {sum(r.seconds for r in reports) * 1000:9.1f} {total_kb / 1024:8.1f}")
+    return lines
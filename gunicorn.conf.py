@@ -0,0 +1,43 @@
+# gunicorn.conf.py
+"""
+gunicorn -c gunicorn.conf.py config.wsgi:application
+
+Con ``preload_app`` la app (y los recursos de core/warmup.py: modelo de
+ventas, estilos PDF, Gemini, Supabase) se carga una sola vez en el master;
+los workers la heredan por fork y comparten esas páginas. Para ASGI:
+GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker con config.asgi:application.
+"""
+import gc
+import os
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.getenv('WEB_CONCURRENCY', '4'))
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'sync')
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '60'))
+preload_app = True
+
+# Sin recolecciones mientras se carga la app: con preload_app gunicorn la
+# importa apenas lee esta configuración (antes de on_starting). when_ready
+# recolecta, congela y vuelve a activar el GC antes de crear los workers.
+gc.disable()
+
+
+def when_ready(server):
+    from django.db import connections
+
+    from core.warmup import format_report, freeze, get_config, warm_up
+
+    if get_config()['ENABLED']:
+        for line in format_report(warm_up()):
+            server.log.info("warm-up %s", line)
+    # Los workers abren sus propias conexiones
+    connections.close_all()
+    # El GC ya no toca los objetos cargados: las páginas siguen compartidas tras el fork
+    server.log.info("gc.freeze(): %d objetos", freeze())
+    gc.enable()
+
+
+def on_reload(server):
+    # Con SIGHUP gunicorn vuelve a leer esta configuración (y su gc.disable())
+    # antes de crear los workers nuevos
+    when_ready(server)